@@ -1,18 +1,73 @@
 import logging
+import os
+import tempfile
 
-from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver
-from livekit import agents
-from livekit.agents import AgentSession, RoomInputOptions
-from livekit.plugins import (
+# Job processes report metrics to the worker's Prometheus endpoint through this
+# directory. It has to be set before prometheus_client is first imported.
+os.environ.setdefault(
+    "PROMETHEUS_MULTIPROC_DIR", tempfile.mkdtemp(prefix="hr-screen-metrics-")
+)
+# Job processes share one Gemini request budget through this directory
+os.environ.setdefault(
+    "GEMINI_GOVERNOR_DIR", tempfile.mkdtemp(prefix="hr-screen-governor-")
+)
+
+from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver  # noqa: E402
+from livekit import agents  # noqa: E402
+from livekit.agents import AgentSession, RoomInputOptions  # noqa: E402
+from livekit.plugins import (  # noqa: E402
     noise_cancellation,
 )
 
-from hr_screen_agent import create_hr_screen_agent
-from voice_agent import VoiceAgent
+from hr_screen_agent import create_hr_screen_agent  # noqa: E402
+from hr_screen_agent.configuration import Configuration  # noqa: E402
+from hr_screen_agent.post_call import SummaryQueue, enqueue_interview  # noqa: E402
+from hr_screen_agent.preparation import (  # noqa: E402
+    forget_preparation,
+    start_preparation,
+)
+from hr_screen_agent.telemetry import (  # noqa: E402
+    GraphEventLogger,
+    TraceLevel,
+    TracingCheckpointer,
+    get_usage_ledger,
+    start_metrics_server,
+)
+from voice_agent import TTSCache, VoiceAgent  # noqa: E402
+from voice_agent.agent import FILLER_PHRASES  # noqa: E402
+from voice_agent.load import LoopLagMonitor, WorkerLoadModel  # noqa: E402
 
 logger = logging.getLogger("vocalize-hr-screen-agent")
 logger.setLevel(logging.INFO)
 
+# Local Prometheus endpoint with the latency histograms of all sessions
+METRICS_PORT = int(os.getenv("METRICS_PORT", "9464"))
+# Directory for the per-session Chrome trace JSON files
+TRACE_DIR = os.getenv("TRACE_DIR", "traces")
+# Structured graph events: off, events (compact) or full (with node states)
+GRAPH_TRACE_LEVEL = TraceLevel(os.getenv("GRAPH_TRACE_LEVEL", "events"))
+# Share of sessions whose graph events include the full node states
+GRAPH_TRACE_SAMPLE_RATE = float(os.getenv("GRAPH_TRACE_SAMPLE_RATE", "0.01"))
+# Start replies on stable interim transcripts, before the turn is final
+SPECULATIVE_REPLIES = os.getenv("SPECULATIVE_REPLIES", "false").lower() == "true"
+# Directory of the cached audio for the filler phrases, empty to disable the cache
+TTS_CACHE_DIR = os.getenv("TTS_CACHE_DIR", "tts-cache")
+# Seconds a tool call may run before a filler phrase is played, 0 to disable
+FILLER_DELAY = float(os.getenv("FILLER_DELAY", "1.0"))
+# Generate and synthesize the greeting before the candidate joins
+PRERENDER_GREETING = os.getenv("PRERENDER_GREETING", "false").lower() == "true"
+# Directory for the per-session JSONL transcripts of what the candidate said,
+# empty (the default) to disable recording
+TRANSCRIPT_DIR = os.getenv("TRANSCRIPT_DIR", "")
+# Queue of finished interviews for the post-call summary workers
+POST_CALL_QUEUE = os.getenv("POST_CALL_QUEUE", "post_call.db")
+# The worker stops accepting interviews when one more would bring its load here
+WORKER_LOAD_THRESHOLD = float(os.getenv("WORKER_LOAD_THRESHOLD", "0.75"))
+# Memory available to the worker's sessions, empty for 80% of the machine's
+WORKER_MEMORY_LIMIT_MB = float(os.getenv("WORKER_MEMORY_LIMIT_MB") or 0) or None
+# Event-loop lag of a job process at which the worker counts as fully loaded
+WORKER_MAX_LOOP_LAG = float(os.getenv("WORKER_MAX_LOOP_LAG", "0.1"))
+
 
 async def entrypoint(ctx: agents.JobContext):
     await ctx.connect()
@@ -23,22 +78,63 @@ async def entrypoint(ctx: agents.JobContext):
     # Initialize the checkpointer outside the session context
     checkpointer = await sqlite_saver.__aenter__()
 
+    agent = create_hr_screen_agent(checkpointer=TracingCheckpointer(checkpointer))
+
+    session = AgentSession()
+
+    thread_id = f"{ctx.room.name}__{await ctx.room.sid}"
+    lag_monitor = LoopLagMonitor()
+    lag_monitor.start()
+    voice_agent = VoiceAgent(
+        agent,
+        thread_id,
+        speculative_replies=SPECULATIVE_REPLIES,
+        tts_cache=TTSCache(TTS_CACHE_DIR, FILLER_PHRASES) if TTS_CACHE_DIR else None,
+        filler_delay=FILLER_DELAY if FILLER_DELAY > 0 else None,
+        transcript_dir=TRANSCRIPT_DIR or None,
+        callbacks=[
+            GraphEventLogger(thread_id, GRAPH_TRACE_LEVEL, GRAPH_TRACE_SAMPLE_RATE)
+        ],
+    )
+    # A restarted job continues the interview checkpointed on its thread
+    resumed = await voice_agent.resume(ctx.room)
+    if resumed is None:
+        # Written while the candidate joins, and read by the first graph step
+        start_preparation(thread_id)
+        if PRERENDER_GREETING:
+            voice_agent.prerender_greeting(ctx.room)
+
     async def on_disconnect():
+        await lag_monitor.stop()
+        trace_path = voice_agent.tracer.dump(TRACE_DIR)
+        logger.info(f"Wrote session trace to {trace_path}")
+        usage = get_usage_ledger().usage(thread_id)
+        logger.info(
+            f"Interview used {usage['input_tokens']} input and "
+            f"{usage['output_tokens']} output tokens (~${usage['cost_usd']:.4f})"
+        )
+        get_usage_ledger().forget(thread_id)
+        forget_preparation(thread_id)
+
+        if Configuration.from_runnable_config().post_call_summary:
+            try:
+                async with SummaryQueue(POST_CALL_QUEUE) as queue:
+                    if await enqueue_interview(queue, agent, thread_id):
+                        logger.info(f"Queued interview summary for {thread_id}")
+            except Exception:
+                logger.exception("Failed to queue the interview summary")
+
         # Clean up the checkpointer when the session ends
         await sqlite_saver.__aexit__(None, None, None)
 
     ctx.add_shutdown_callback(on_disconnect)
-
-    agent = create_hr_screen_agent(checkpointer=checkpointer, debug=True)
-
-    session = AgentSession()
-
-    thread_id = f"{ctx.room.name}__{await ctx.room.sid}"
+    if voice_agent.recorder is not None:
+        ctx.add_shutdown_callback(voice_agent.recorder.close)
 
     # Start the session - this will run until disconnected
     await session.start(
         room=ctx.room,
-        agent=VoiceAgent(agent, thread_id),
+        agent=voice_agent,
         room_input_options=RoomInputOptions(
             audio_enabled=True,
             video_enabled=False,
@@ -49,4 +145,14 @@ async def entrypoint(ctx: agents.JobContext):
 
 
 if __name__ == "__main__":
-    agents.cli.run_app(agents.WorkerOptions(entrypoint_fnc=entrypoint))
+    start_metrics_server(METRICS_PORT)
+    agents.cli.run_app(
+        agents.WorkerOptions(
+            entrypoint_fnc=entrypoint,
+            load_fnc=WorkerLoadModel(
+                memory_limit_mb=WORKER_MEMORY_LIMIT_MB,
+                max_loop_lag=WORKER_MAX_LOOP_LAG,
+            ),
+            load_threshold=WORKER_LOAD_THRESHOLD,
+        )
+    )
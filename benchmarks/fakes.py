@@ -0,0 +1,412 @@
+"""Local stand-ins for the STT, TTS, chat-model and web search backends.
+
+Everything in here runs offline and only simulates the latency of the real
+services, so the benchmarks can exercise the real agent graph in CI.
+"""
+
+import asyncio
+import math
+import random
+import time
+import uuid
+from typing import Annotated, Any, Optional, Sequence
+
+from langchain_core.callbacks import (
+    AsyncCallbackManagerForLLMRun,
+    CallbackManagerForLLMRun,
+)
+from langchain_core.language_models import BaseChatModel, LanguageModelInput
+from langchain_core.messages import (
+    AIMessage,
+    BaseMessage,
+    HumanMessage,
+    SystemMessage,
+    ToolMessage,
+)
+from langchain_core.messages.utils import count_tokens_approximately
+from langchain_core.outputs import ChatGeneration, ChatResult
+from langchain_core.runnables import Runnable, RunnableConfig
+from langchain_core.tools import BaseTool, InjectedToolArg, tool
+from langchain_core.utils.function_calling import convert_to_openai_tool
+from pydantic import BaseModel, ConfigDict, Field, PrivateAttr
+
+from hr_screen_agent.llm import CachedPrefix
+from hr_screen_agent.profile import FIT_PROFILE_TOOL
+
+_INTERVIEWER_LINES = [
+    "Thanks for sharing that.",
+    "That sounds like a great experience. Could you tell me a bit more about the team you worked with?",
+    "Understood. What are your salary expectations for this role?",
+    "Great. When would you be available to start, and what is your notice period?",
+    "Could you walk me through a project from your resume that you are particularly proud of?",
+    "And what made you interested in applying to this company specifically?",
+]
+
+# Text fields of structured replies, about as long as a guardrail's reasoning
+STRUCTURED_TEXT = (
+    "The latest message is an ordinary answer about the candidate's work "
+    "experience. It is relevant to the role and does not try to change the "
+    "interviewer's instructions or reveal the evaluation criteria."
+)
+
+CANDIDATE_LINES = [
+    "Sure, I have been working as a backend engineer for about six years now.",
+    "Mostly Python and Go, with a lot of work on distributed systems and data pipelines.",
+    "I am looking for a role with more ownership and a product I really care about.",
+    "My notice period is one month, so I could start fairly soon.",
+    "I would be looking for something in the range we discussed in the job posting.",
+    "Yes, I am authorised to work in Germany, no sponsorship needed.",
+    "I led the migration of our billing system to an event driven architecture.",
+    "That's a good question, could you repeat it please?",
+]
+
+
+class LatencyDistribution(BaseModel):
+    """A latency distribution in seconds.
+
+    Parsed from specs such as `constant:0.2`, `uniform:0.1,0.4`,
+    `normal:0.8,0.2` or `lognormal:0.8,0.5` (median and sigma).
+    """
+
+    model_config = ConfigDict(frozen=True)
+
+    kind: str = "constant"
+    params: tuple[float, ...] = (0.0,)
+
+    @classmethod
+    def parse(cls, spec: str) -> "LatencyDistribution":
+        kind, _, raw_params = spec.partition(":")
+        params = tuple(float(p) for p in raw_params.split(",") if p)
+        expected = {"constant": 1, "uniform": 2, "normal": 2, "lognormal": 2}
+        if kind not in expected or len(params) != expected[kind]:
+            raise ValueError(f"Invalid latency distribution: {spec!r}")
+        return cls(kind=kind, params=params)
+
+    def sample(self, rng: random.Random) -> float:
+        if self.kind == "uniform":
+            value = rng.uniform(*self.params)
+        elif self.kind == "normal":
+            value = rng.gauss(*self.params)
+        elif self.kind == "lognormal":
+            median, sigma = self.params
+            value = rng.lognormvariate(math.log(median), sigma) if median > 0 else 0
+        else:
+            value = self.params[0]
+        return max(0.0, value)
+
+
+class FakeQuotaError(Exception):
+    """Stand-in for the HTTP 429 Gemini answers with when the quota is exhausted."""
+
+    code = 429
+
+
+class FakeContextCache:
+    """In-memory stand-in for Gemini's explicit context caches.
+
+    `FakeChatModel` reads the system instruction and tools of a cached
+    prefix from here, and fails like the API for unknown or expired caches.
+    """
+
+    def __init__(self) -> None:
+        self._prefixes: dict[str, tuple[str, list[dict], float]] = {}
+        self.created = 0
+        self.refreshed = 0
+        self.hits = 0
+
+    async def create(
+        self, model: str, system: str, tools: Sequence[dict], ttl: float
+    ) -> CachedPrefix:
+        self.created += 1
+        name = f"cachedContents/fake-{self.created}"
+        self._prefixes[name] = (system, list(tools), time.time() + ttl)
+        return CachedPrefix(name, time.time() + ttl)
+
+    async def refresh(self, name: str, ttl: float) -> CachedPrefix:
+        system, tools, _ = self.lookup(name)
+        self.refreshed += 1
+        self._prefixes[name] = (system, tools, time.time() + ttl)
+        return CachedPrefix(name, time.time() + ttl)
+
+    def lookup(self, name: str) -> tuple[str, list[dict], float]:
+        prefix = self._prefixes.get(name)
+        if prefix is None or prefix[2] <= time.time():
+            raise ValueError(f"403 PERMISSION_DENIED: CachedContent {name} not found")
+        return prefix
+
+    def read(self, name: str) -> tuple[str, list[dict]]:
+        """Read a cached prefix for a model call."""
+        system, tools, _ = self.lookup(name)
+        self.hits += 1
+        return system, tools
+
+
+class FakeChatModel(BaseChatModel):
+    """Chat model that replies with canned interviewer lines after a simulated delay.
+
+    It honours `bind_tools`: the first user turn triggers the preparation tools
+    (timer, documents, research), later turns call one of the bound tools with
+    probability `tool_call_rate`, and forced tool choices (as used by
+    `with_structured_output`) are answered with a permissive verdict, blocking
+    a share `block_rate` of them. A share `error_rate` of the calls fails with
+    a quota error. Replies take `token_latency` seconds per output token on
+    top of `latency`. When `think` is bound, a share `think_rate` of the
+    replies to tool results calls it first, as the think tool instructions
+    ask. With a `thinking_budget`, every agent reply first thinks for up to
+    that many tokens, reported as reasoning output tokens. Calls with a
+    `cached_content` take their system instruction and tools from
+    `context_cache`, and report them as cache reads.
+    """
+
+    latency: LatencyDistribution = Field(default_factory=LatencyDistribution)
+    tool_call_rate: float = 0.3
+    error_rate: float = 0.0
+    block_rate: float = 0.0
+    token_latency: float = 0.0
+    think_rate: float = 0.0
+    thinking_budget: int = 0
+    documents: tuple[str, ...] = ()
+    seed: int = 0
+    model_name: str = "fake-chat"
+    context_cache: Optional[FakeContextCache] = None
+
+    _rng: random.Random = PrivateAttr()
+
+    def model_post_init(self, context: Any) -> None:
+        super().model_post_init(context)
+        self._rng = random.Random(self.seed)
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-chat"
+
+    @property
+    def _identifying_params(self) -> dict[str, Any]:
+        return {"model_name": self.model_name}
+
+    def bind_tools(
+        self,
+        tools: Sequence[Any],
+        *,
+        tool_choice: Optional[str] = None,
+        **kwargs: Any,
+    ) -> Runnable[LanguageModelInput, BaseMessage]:
+        return self.bind(
+            tools=[convert_to_openai_tool(t) for t in tools],
+            tool_choice=tool_choice,
+            **kwargs,
+        )
+
+    def _generate(
+        self,
+        messages: list[BaseMessage],
+        stop: Optional[list[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        time.sleep(self.latency.sample(self._rng))
+        self._maybe_fail()
+        result = self._respond(messages, **kwargs)
+        time.sleep(self._generation_time(result))
+        return result
+
+    async def _agenerate(
+        self,
+        messages: list[BaseMessage],
+        stop: Optional[list[str]] = None,
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        await asyncio.sleep(self.latency.sample(self._rng))
+        self._maybe_fail()
+        result = self._respond(messages, **kwargs)
+        await asyncio.sleep(self._generation_time(result))
+        return result
+
+    def _generation_time(self, result: ChatResult) -> float:
+        usage = result.generations[0].message.usage_metadata or {}
+        return self.token_latency * usage.get("output_tokens", 0)
+
+    def _maybe_fail(self) -> None:
+        if self._rng.random() < self.error_rate:
+            raise FakeQuotaError("429 RESOURCE_EXHAUSTED (simulated)")
+
+    def _respond(
+        self,
+        messages: list[BaseMessage],
+        tools: Optional[list[dict]] = None,
+        tool_choice: Optional[str] = None,
+        cached_content: Optional[str] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        tools = tools or []
+        cached_tokens = 0
+        if cached_content is not None:
+            if self.context_cache is None:
+                raise ValueError(f"403 PERMISSION_DENIED: {cached_content} not found")
+            if tools or any(isinstance(m, SystemMessage) for m in messages):
+                raise ValueError(
+                    "400 INVALID_ARGUMENT: CachedContent can not be used with "
+                    "system_instruction, tools or tool_config"
+                )
+            system, tools = self.context_cache.read(cached_content)
+            messages = [SystemMessage(content=system), *messages]
+            cached_tokens = count_tokens_approximately([messages[0]]) + sum(
+                len(str(t)) // 4 for t in tools
+            )
+        if tool_choice and tools:
+            message = self._structured_reply(tools[0])
+        else:
+            message = self._agent_reply(
+                messages, {t["function"]["name"] for t in tools}
+            )
+
+        input_tokens = count_tokens_approximately(messages) + sum(
+            len(str(t)) // 4 for t in tools
+        )
+        output_tokens = count_tokens_approximately([message])
+        thinking_tokens = 0
+        if self.thinking_budget and not tool_choice:
+            thinking_tokens = self._rng.randint(0, self.thinking_budget)
+            output_tokens += thinking_tokens
+        message.usage_metadata = {
+            "input_tokens": input_tokens,
+            "output_tokens": output_tokens,
+            "total_tokens": input_tokens + output_tokens,
+            "input_token_details": {"cache_read": cached_tokens},
+            "output_token_details": {"reasoning": thinking_tokens},
+        }
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    def _structured_reply(self, schema: dict) -> AIMessage:
+        defaults = {
+            "boolean": not self.block_rate or self._rng.random() >= self.block_rate,
+            "string": STRUCTURED_TEXT,
+            "integer": 0,
+            "number": 0.0,
+            "array": [],
+        }
+        properties = schema["function"]["parameters"].get("properties", {})
+        args = {
+            name: defaults.get(prop.get("type"), None)
+            for name, prop in properties.items()
+        }
+        return AIMessage(
+            content="",
+            tool_calls=[
+                {
+                    "name": schema["function"]["name"],
+                    "args": args,
+                    "id": f"call_{uuid.uuid4().hex}",
+                }
+            ],
+        )
+
+    def _agent_reply(
+        self, messages: list[BaseMessage], tool_names: set[str]
+    ) -> AIMessage:
+        calls: list[tuple[str, dict]] = []
+        # The profile is added to the candidate's turn by the pre-model hook
+        turn = list(messages)
+        if isinstance(turn[-1], ToolMessage) and turn[-1].name == FIT_PROFILE_TOOL:
+            turn = turn[:-2]
+        last = turn[-1] if turn else None
+        if isinstance(last, ToolMessage):
+            calling = next(
+                (m for m in reversed(turn) if isinstance(m, AIMessage)), None
+            )
+            thought = calling is not None and any(
+                call["name"] == "think" for call in calling.tool_calls
+            )
+            if not thought and self.think_rate and self._rng.random() < self.think_rate:
+                calls = [("think", {"thought": "Check the tool results."})]
+        elif isinstance(last, HumanMessage):
+            tool_results = [m for m in messages if isinstance(m, ToolMessage)]
+            profiled = any(m.name == FIT_PROFILE_TOOL for m in tool_results)
+            planned = any(
+                isinstance(m, SystemMessage) and "<interview_plan>" in m.text()
+                for m in messages
+            )
+            if len(tool_results) == profiled:
+                calls = [("start_timer", {})]
+                if not profiled:
+                    calls += [("list_input_files", {})]
+                    calls += [
+                        ("read_input_file", {"filename": d}) for d in self.documents
+                    ]
+                if not planned:
+                    calls += [("web_search", {"query": "company overview"})]
+            elif self._rng.random() < self.tool_call_rate:
+                calls = [
+                    self._rng.choice(
+                        [
+                            ("check_time_remaining", {}),
+                            ("think", {"thought": "Verify the resume claims."}),
+                            ("web_search", {"query": "technology mentioned"}),
+                        ]
+                    )
+                ]
+
+        calls = [(name, args) for name, args in calls if name in tool_names]
+        if calls:
+            return AIMessage(
+                content="",
+                tool_calls=[
+                    {"name": name, "args": args, "id": f"call_{uuid.uuid4().hex}"}
+                    for name, args in calls
+                ],
+            )
+        return AIMessage(content=self._rng.choice(_INTERVIEWER_LINES))
+
+
+def create_fake_web_search(latency: LatencyDistribution, seed: int = 0) -> BaseTool:
+    """Create a local replacement for the `web_search` tool with the same schema."""
+    rng = random.Random(seed)
+
+    @tool(
+        "web_search",
+        description="Perform a web search using the native Google Search API",
+    )
+    async def web_search(
+        query: Annotated[str, "The search query to perform"],
+        config: Annotated[RunnableConfig, InjectedToolArg],
+    ) -> str:
+        """Return a canned search result after a simulated delay."""
+        await asyncio.sleep(latency.sample(rng))
+        return f"Search results for '{query}': the company is a growing home services marketplace."
+
+    return web_search
+
+
+class FakeSTT:
+    """Simulates the delay between the end of user speech and the final transcript."""
+
+    def __init__(self, latency: LatencyDistribution, seed: int = 0) -> None:
+        self._latency = latency
+        self._rng = random.Random(seed)
+
+    async def transcribe(self, text: str) -> str:
+        await asyncio.sleep(self._latency.sample(self._rng))
+        return text
+
+
+class FakeTTS:
+    """Simulates time to first audio and real-time playback of synthesized speech."""
+
+    def __init__(
+        self,
+        latency: LatencyDistribution,
+        chars_per_second: float = 15.0,
+        seed: int = 0,
+    ) -> None:
+        self._latency = latency
+        self._chars_per_second = chars_per_second
+        self._rng = random.Random(seed)
+
+    async def first_audio(self, text: str) -> None:
+        """Wait until the first audio frame for `text` would be available."""
+        await asyncio.sleep(self._latency.sample(self._rng))
+
+    async def playback(self, text: str, time_scale: float = 1.0) -> None:
+        """Wait for `text` to be played out to the candidate."""
+        await asyncio.sleep(len(text) / self._chars_per_second * time_scale)
@@ -0,0 +1,609 @@
+"""Multi-session load test for the voice pipeline.
+
+Drives N simulated interviews concurrently through `VoiceAgent`/`LLMAdapter`
+and the real `create_hr_screen_agent` graph, with local stand-ins for STT,
+TTS, the chat models and `web_search`. Runs fully offline.
+
+    just uv run -m benchmarks.load_test --sessions 20 --turns 8
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import tempfile
+import time
+from contextlib import asynccontextmanager
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, AsyncIterator, Optional
+
+os.environ.setdefault("CANDIDATE_NAME", "Jane Doe")
+os.environ.setdefault("COMPANY_NAME", "Tech Innovators Inc.")
+os.environ.setdefault("JOB_ROLE", "Software Engineer")
+
+import psutil  # noqa: E402
+from prometheus_client import REGISTRY  # noqa: E402
+from langgraph.checkpoint.memory import InMemorySaver  # noqa: E402
+from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver  # noqa: E402
+from langchain_core.messages import AIMessage  # noqa: E402
+from livekit.agents.llm import ChatContext  # noqa: E402
+
+from benchmarks.fakes import (  # noqa: E402
+    CANDIDATE_LINES,
+    FakeChatModel,
+    FakeSTT,
+    FakeTTS,
+    LatencyDistribution,
+    create_fake_web_search,
+)
+from benchmarks.stats import EventLoopMonitor, summarize  # noqa: E402
+from voice_agent.load import LoopLagMonitor, WorkerLoadModel  # noqa: E402
+
+
+def build_graph(args: argparse.Namespace, checkpointer: Any):
+    if args.hedge:
+        os.environ["HEDGE_REQUESTS"] = "true"
+        # Hedge every request so the p99 can be compared against a run without --hedge
+        os.environ["HEDGE_CONTROL_FRACTION"] = "0"
+    os.environ["GEMINI_REQUESTS_PER_MINUTE"] = str(args.gemini_rpm)
+    os.environ["GEMINI_MAX_CONCURRENCY"] = str(args.gemini_concurrency)
+    os.environ["PHASE_TOOLS"] = str(args.phase_tools).lower()
+    os.environ["FIT_PROFILE"] = str(args.fit_profile).lower()
+    os.environ["REASONING_MODE"] = args.reasoning_mode
+    if args.interview_plans and not os.environ.get("INTERVIEW_PLAN_CACHE"):
+        # A fresh plan cache, so the first session of the run writes the plan
+        os.environ["INTERVIEW_PLAN_CACHE"] = tempfile.mkdtemp(prefix="plans-")
+
+    from hr_screen_agent import create_hr_screen_agent
+    from hr_screen_agent.agent import DEFAULT_TOOLS
+
+    documents = tuple(sorted(p.name for p in Path("input").glob("*") if p.is_file()))
+    model = FakeChatModel(
+        latency=LatencyDistribution.parse(args.llm_latency),
+        token_latency=args.token_latency,
+        tool_call_rate=args.tool_call_rate,
+        think_rate=args.think_rate,
+        thinking_budget=args.thinking_budget if args.reasoning_mode == "native" else 0,
+        error_rate=args.error_rate,
+        documents=documents,
+        seed=args.seed,
+    )
+    guardrail_model = FakeChatModel(
+        latency=LatencyDistribution.parse(args.guardrail_latency),
+        error_rate=args.error_rate,
+        seed=args.seed + 1,
+        model_name="fake-guardrail",
+    )
+    fake_web_search = create_fake_web_search(
+        LatencyDistribution.parse(args.web_search_latency), seed=args.seed
+    )
+    tools = [fake_web_search if t.name == "web_search" else t for t in DEFAULT_TOOLS]
+    return create_hr_screen_agent(
+        checkpointer=checkpointer,
+        model=model,
+        guardrail_model=guardrail_model,
+        tools=tools,
+    )
+
+
+def prepare_session(args: argparse.Namespace, thread_id: str) -> None:
+    """Start the interview's preparation, as the worker does at dispatch."""
+    from hr_screen_agent.preparation import start_preparation
+
+    start_preparation(
+        thread_id,
+        profile_model=FakeChatModel(
+            latency=LatencyDistribution.parse(args.llm_latency),
+            error_rate=args.error_rate,
+            seed=args.seed + 2,
+            model_name="fake-profile",
+        ),
+        plan_model=FakeChatModel(
+            latency=LatencyDistribution.parse(args.llm_latency),
+            error_rate=args.error_rate,
+            seed=args.seed + 3,
+            model_name="fake-plan",
+        ),
+    )
+
+
+async def run_session(
+    index: int,
+    graph: Any,
+    args: argparse.Namespace,
+    turn_latencies: list[dict[str, float]],
+    cancel_latencies: list[float],
+    greeting_latencies: list[float],
+    agent_calls: list[dict[str, float]],
+) -> None:
+    from voice_agent import VoiceAgent
+    from voice_agent.agent import FILLER_PHRASES
+    from voice_agent.greeting import OPENING_INPUT
+
+    rng = random.Random(args.seed + index)
+    stt = FakeSTT(LatencyDistribution.parse(args.stt_latency), seed=args.seed + index)
+    tts = FakeTTS(LatencyDistribution.parse(args.tts_latency), seed=args.seed + index)
+    speaking = LatencyDistribution.parse(args.speaking_time)
+    endpointing = LatencyDistribution.parse(args.endpointing_delay)
+
+    thread_id = f"load-test__{index}"
+    prepare_session(args, thread_id)
+    agent = VoiceAgent(
+        graph,
+        thread_id,
+        stt=None,
+        tts=None,
+        vad=None,
+        filler_delay=args.filler_delay,
+    )
+    chat_ctx = ChatContext.empty()
+
+    prerendered: Optional[asyncio.Task[str]] = None
+    if args.prerender_greeting:
+        agent.prerender_greeting()
+        prerendered = asyncio.create_task(prerender_audio(agent, tts))
+
+    # Stagger session starts so they do not all hit the first turn together. This
+    # is also the time between the job being dispatched and the candidate joining.
+    await asyncio.sleep(rng.uniform(0, args.ramp_up))
+
+    if prerendered is not None:
+        joined = time.perf_counter()
+        greeting = await prerendered
+        greeting_latencies.append(time.perf_counter() - joined)
+        chat_ctx.add_message(role="assistant", content=greeting)
+        await tts.playback(greeting, time_scale=args.time_scale)
+
+    for turn in range(1 if prerendered else 0, args.turns):
+        if turn > 0:
+            await asyncio.sleep(speaking.sample(rng) * args.time_scale)
+
+        end_of_speech = time.perf_counter()
+        if turn == 0:
+            # The greeting is triggered when the candidate joins, nothing is transcribed
+            transcript = OPENING_INPUT
+        else:
+            transcript = await stt.transcribe(rng.choice(CANDIDATE_LINES))
+        if args.speculate and turn > 0:
+            # A stable interim transcript, sometimes missing the final words
+            interim = transcript
+            if rng.random() < args.interim_mismatch_rate:
+                interim = transcript.rsplit(" ", 2)[0]
+            agent.adapter.speculate(interim)
+        if turn > 0:
+            # The STT waits for the end-of-turn silence before finalizing the turn
+            await asyncio.sleep(endpointing.sample(rng))
+        chat_ctx.add_message(role="user", content=transcript)
+
+        llm_start = time.perf_counter()
+        first_token: Optional[float] = None
+        first_audio: Optional[float] = None
+        reply_parts: list[str] = []
+        # The candidate barges in while the agent is still thinking
+        barge_in = rng.uniform(0.1, 1.0) if rng.random() < args.barge_in_rate else None
+        stream = await agent.llm_node(chat_ctx, [], None)
+        try:
+            async with asyncio.timeout(barge_in):
+                async for chunk in stream:
+                    content = chunk.delta.content if chunk.delta else None
+                    if not content:
+                        continue
+                    if first_token is None:
+                        first_token = time.perf_counter()
+                    if first_audio is None:
+                        # Filler phrases are played from the TTS cache
+                        if content.strip() not in FILLER_PHRASES:
+                            await tts.first_audio(content)
+                        first_audio = time.perf_counter()
+                    reply_parts.append(content)
+        except TimeoutError:
+            # Like LiveKit, close the LLM node, which cancels the graph run
+            await stream.aclose()
+            cancel_latencies.append(time.perf_counter() - llm_start - barge_in)
+            continue
+        done = time.perf_counter()
+
+        reply = " ".join(reply_parts)
+        if turn == 0 and first_audio is not None:
+            greeting_latencies.append(first_audio - end_of_speech)
+        elif first_token is not None and first_audio is not None:
+            turn_latencies.append(
+                {
+                    "end_of_speech_to_first_audio": first_audio - end_of_speech,
+                    "llm_first_token": first_token - llm_start,
+                    "llm_total": done - llm_start,
+                }
+            )
+        chat_ctx.add_message(role="assistant", content=reply)
+        await tts.playback(reply, time_scale=args.time_scale)
+
+    # Input tokens and tool requests of every agent model call of the session
+    snapshot = await graph.aget_state(
+        {"configurable": {"thread_id": agent.tracer.thread_id}}
+    )
+    for message in snapshot.values.get("messages", []):
+        if isinstance(message, AIMessage) and message.name == "hr_screen_agent":
+            agent_calls.append(
+                {
+                    "input_tokens": (message.usage_metadata or {}).get(
+                        "input_tokens", 0
+                    ),
+                    "tool_round_trip": 1.0 if message.tool_calls else 0.0,
+                }
+            )
+
+    if args.trace_dir:
+        agent.tracer.dump(args.trace_dir)
+
+
+async def prerender_audio(agent: Any, tts: FakeTTS) -> str:
+    """Wait for the pre-rendered greeting, including its synthesized audio."""
+    text, _ = await agent.greeting.rendered()
+    await tts.first_audio(text)
+    return text
+
+
+async def run(args: argparse.Namespace) -> dict[str, Any]:
+    async with open_checkpointer(args.sqlite) as checkpointer:
+        graph = build_graph(args, checkpointer)
+        process = psutil.Process()
+        monitor = EventLoopMonitor(interval=0.05, process=process)
+        turn_latencies: list[dict[str, float]] = []
+        cancel_latencies: list[float] = []
+        greeting_latencies: list[float] = []
+        agent_calls: list[dict[str, float]] = []
+
+        # The worker's load model, calibrated on the simulated sessions
+        load_model = WorkerLoadModel()
+        worker = SimpleNamespace(active_jobs=[])
+        loads: list[float] = []
+        lag_monitor = LoopLagMonitor(window=0.5)
+
+        async def sample_load() -> None:
+            while True:
+                loads.append(await asyncio.to_thread(load_model, worker))
+                await asyncio.sleep(0.5)
+
+        async def session(i: int) -> None:
+            worker.active_jobs.append(i)
+            try:
+                await run_session(
+                    i,
+                    graph,
+                    args,
+                    turn_latencies,
+                    cancel_latencies,
+                    greeting_latencies,
+                    agent_calls,
+                )
+            finally:
+                worker.active_jobs.remove(i)
+
+        for _ in range(2):
+            load_model(worker)
+            await asyncio.sleep(0.5)
+        rss_before = process.memory_info().rss
+        cpu_before = process.cpu_times()
+        wall_start = time.perf_counter()
+        monitor.start()
+        lag_monitor.start()
+        sampler = asyncio.create_task(sample_load())
+        await asyncio.gather(*(session(i) for i in range(args.sessions)))
+        sampler.cancel()
+        await lag_monitor.stop()
+        await monitor.stop()
+        wall = time.perf_counter() - wall_start
+        cpu_after = process.cpu_times()
+
+    cpu_seconds = (cpu_after.user + cpu_after.system) - (
+        cpu_before.user + cpu_before.system
+    )
+    return {
+        "sessions": args.sessions,
+        "turns": len(turn_latencies),
+        "wall_seconds": wall,
+        "end_of_speech_to_first_audio": summarize(
+            [t["end_of_speech_to_first_audio"] for t in turn_latencies]
+        ),
+        "llm_first_token": summarize([t["llm_first_token"] for t in turn_latencies]),
+        "llm_total": summarize([t["llm_total"] for t in turn_latencies]),
+        "event_loop_lag": summarize(monitor.lags),
+        "barge_in_cancel": summarize(cancel_latencies),
+        "join_to_greeting": summarize(greeting_latencies),
+        "agent_input_tokens": summarize([c["input_tokens"] for c in agent_calls]),
+        "tool_round_trips_per_turn": sum(c["tool_round_trip"] for c in agent_calls)
+        / max(1, len(turn_latencies) + len(greeting_latencies)),
+        "cpu_seconds_per_session": cpu_seconds / args.sessions,
+        "cpu_utilization": cpu_seconds / wall if wall else 0.0,
+        "rss_mb_per_session": max(0, monitor.peak_rss - rss_before)
+        / args.sessions
+        / (1024 * 1024),
+        "peak_rss_mb": monitor.peak_rss / (1024 * 1024),
+        "load_model": {
+            "session_cpu": load_model.session_cpu,
+            "session_memory_mb": load_model.session_memory / (1024 * 1024),
+            "peak_load": max(loads, default=0.0),
+            "capacity": load_model.capacity(args.load_threshold),
+        },
+        "hedging": hedging_outcomes() if args.hedge else None,
+        "speculations": speculation_outcomes() if args.speculate else None,
+        "fillers_played": REGISTRY.get_sample_value("hr_screen_fillers_played_total")
+        or 0.0,
+        "gemini_queue_delay": gemini_queue_delays(),
+    }
+
+
+def hedging_outcomes() -> dict[str, float]:
+    """Read the hedging counters of this process from the Prometheus registry."""
+    outcomes = {
+        outcome: REGISTRY.get_sample_value(
+            "hr_screen_llm_hedge_requests_total", {"outcome": outcome}
+        )
+        or 0.0
+        for outcome in ["not_hedged", "primary_won", "hedge_won"]
+    }
+    requests = sum(outcomes.values())
+    hedges = outcomes["primary_won"] + outcomes["hedge_won"]
+    return {
+        **outcomes,
+        "extra_request_ratio": hedges / requests if requests else 0.0,
+        "extra_input_tokens": REGISTRY.get_sample_value(
+            "hr_screen_llm_hedge_extra_input_tokens_total"
+        )
+        or 0.0,
+    }
+
+
+def speculation_outcomes() -> dict[str, float]:
+    """Read the speculative run counters of this process from the Prometheus registry."""
+    return {
+        outcome: REGISTRY.get_sample_value(
+            "hr_screen_speculations_total", {"outcome": outcome}
+        )
+        or 0.0
+        for outcome in ["committed", "discarded", "stale"]
+    }
+
+
+def gemini_queue_delays() -> dict[str, dict[str, float]]:
+    """Read the mean rate limiter queue delay and the retries per caller."""
+    delays: dict[str, dict[str, float]] = {}
+    for family in REGISTRY.collect():
+        for sample in family.samples:
+            name, caller = sample.name, sample.labels.get("caller")
+            stats = delays.setdefault(
+                caller, {"calls": 0.0, "total": 0.0, "retries": 0.0}
+            )
+            if name == "hr_screen_gemini_queue_delay_seconds_count":
+                stats["calls"] += sample.value
+            elif name == "hr_screen_gemini_queue_delay_seconds_sum":
+                stats["total"] += sample.value
+            elif name == "hr_screen_gemini_retries_total":
+                stats["retries"] += sample.value
+    return {
+        caller: {
+            "calls": stats["calls"],
+            "mean": stats["total"] / stats["calls"],
+            "retries": stats["retries"],
+        }
+        for caller, stats in delays.items()
+        if stats["calls"]
+    }
+
+
+@asynccontextmanager
+async def open_checkpointer(sqlite: bool) -> AsyncIterator[Any]:
+    """Yield an in-memory checkpointer, or a throwaway SQLite one like `app.py` uses."""
+    if not sqlite:
+        yield InMemorySaver()
+        return
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        db_path = str(Path(tmpdir) / "checkpoints.db")
+        async with AsyncSqliteSaver.from_conn_string(db_path) as saver:
+            yield saver
+
+
+def print_report(report: dict[str, Any]) -> None:
+    print(
+        f"\n{report['sessions']} sessions, {report['turns']} turns "
+        f"in {report['wall_seconds']:.1f}s\n"
+    )
+    print(f"{'metric':<32}{'p50':>10}{'p95':>10}{'p99':>10}{'max':>10}")
+    for name in [
+        "end_of_speech_to_first_audio",
+        "llm_first_token",
+        "llm_total",
+        "event_loop_lag",
+        "barge_in_cancel",
+        "join_to_greeting",
+    ]:
+        stats = report[name]
+        print(
+            f"{name:<32}"
+            + "".join(
+                f"{stats[k] * 1000:>8.1f}ms" for k in ["p50", "p95", "p99", "max"]
+            )
+        )
+    tokens = report["agent_input_tokens"]
+    print(
+        f"{'agent_input_tokens':<32}"
+        + "".join(f"{tokens[k]:>10.0f}" for k in ["p50", "p95", "p99", "max"])
+    )
+    print()
+    print(f"Tool round trips:    {report['tool_round_trips_per_turn']:.2f} per turn")
+    print(f"CPU per session:     {report['cpu_seconds_per_session']:.3f}s")
+    print(f"CPU utilization:     {report['cpu_utilization'] * 100:.1f}%")
+    print(f"RSS per session:     {report['rss_mb_per_session']:.2f} MB")
+    print(f"Peak RSS:            {report['peak_rss_mb']:.1f} MB")
+    load = report["load_model"]
+    print(
+        f"Load model:          {load['session_cpu']:.3f} cores and "
+        f"{load['session_memory_mb']:.1f} MB per session, "
+        f"peak load {load['peak_load']:.2f}, "
+        f"capacity {load['capacity']} sessions"
+    )
+    for caller, delay in report["gemini_queue_delay"].items():
+        print(
+            f"Gemini queue delay:  {caller:<14} mean {delay['mean'] * 1000:.1f}ms"
+            f" over {delay['calls']:.0f} calls, {delay['retries']:.0f} retries"
+        )
+    if speculations := report["speculations"]:
+        print(
+            "Speculative replies: "
+            + ", ".join(f"{v:.0f} {k}" for k, v in speculations.items())
+        )
+    if report["fillers_played"]:
+        print(f"Fillers played:      {report['fillers_played']:.0f}")
+    if hedging := report["hedging"]:
+        print(
+            f"Hedged requests:     {hedging['primary_won'] + hedging['hedge_won']:.0f}"
+            f" ({hedging['extra_request_ratio'] * 100:.1f}% extra requests,"
+            f" {hedging['hedge_won']:.0f} won by the hedge,"
+            f" {hedging['extra_input_tokens']:.0f} extra input tokens)"
+        )
+
+
+def parse_args(argv: Optional[list[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=10)
+    parser.add_argument("--turns", type=int, default=6)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--ramp-up",
+        type=float,
+        default=2.0,
+        help="seconds over which to start sessions",
+    )
+    parser.add_argument(
+        "--time-scale",
+        type=float,
+        default=0.05,
+        help="scale applied to candidate speaking and playback time",
+    )
+    parser.add_argument("--llm-latency", default="lognormal:0.8,0.4")
+    parser.add_argument("--guardrail-latency", default="lognormal:0.3,0.3")
+    parser.add_argument("--web-search-latency", default="lognormal:1.5,0.4")
+    parser.add_argument("--stt-latency", default="lognormal:0.25,0.3")
+    parser.add_argument("--tts-latency", default="lognormal:0.2,0.3")
+    parser.add_argument("--speaking-time", default="uniform:5,20")
+    parser.add_argument(
+        "--endpointing-delay",
+        default="constant:0",
+        help="silence the STT waits for before finalizing a turn",
+    )
+    parser.add_argument(
+        "--speculate",
+        action="store_true",
+        help="start replies on the interim transcript (see SPECULATIVE_REPLIES)",
+    )
+    parser.add_argument(
+        "--interim-mismatch-rate",
+        type=float,
+        default=0.1,
+        help="share of turns where the final transcript differs from the interim one",
+    )
+    parser.add_argument("--tool-call-rate", type=float, default=0.3)
+    parser.add_argument(
+        "--token-latency",
+        type=float,
+        default=0.004,
+        help="seconds per output token of the fake agent model, thinking included",
+    )
+    parser.add_argument(
+        "--reasoning-mode",
+        choices=["think_tool", "native"],
+        default="think_tool",
+        help="see REASONING_MODE",
+    )
+    parser.add_argument(
+        "--thinking-budget", type=int, default=256, help="see THINKING_BUDGET"
+    )
+    parser.add_argument(
+        "--think-rate",
+        type=float,
+        default=0.5,
+        help="share of tool results the fake agent model calls `think` on",
+    )
+    parser.add_argument(
+        "--phase-tools",
+        action="store_true",
+        help="offer only the tools of the current interview phase (see PHASE_TOOLS)",
+    )
+    parser.add_argument(
+        "--fit-profile",
+        action="store_true",
+        help="write the candidate fit profile when the session starts (see FIT_PROFILE)",
+    )
+    parser.add_argument(
+        "--interview-plans",
+        action="store_true",
+        help="plan the role's interviews once, in a fresh cache (see INTERVIEW_PLAN_CACHE)",
+    )
+    parser.add_argument(
+        "--prerender-greeting",
+        action="store_true",
+        help="render the greeting before the candidate joins (see PRERENDER_GREETING)",
+    )
+    parser.add_argument(
+        "--filler-delay",
+        type=float,
+        help="play a cached filler phrase after tools ran this long (see FILLER_DELAY)",
+    )
+    parser.add_argument(
+        "--barge-in-rate",
+        type=float,
+        default=0.0,
+        help="share of turns where the candidate interrupts the agent",
+    )
+    parser.add_argument(
+        "--error-rate",
+        type=float,
+        default=0.0,
+        help="share of chat model calls failing with a quota error",
+    )
+    parser.add_argument(
+        "--gemini-rpm",
+        type=int,
+        default=1000,
+        help="requests per minute allowed by the Gemini governor",
+    )
+    parser.add_argument(
+        "--gemini-concurrency",
+        type=int,
+        default=32,
+        help="Gemini calls allowed in flight by the governor",
+    )
+    parser.add_argument(
+        "--sqlite", action="store_true", help="use a SQLite checkpointer like app.py"
+    )
+    parser.add_argument(
+        "--hedge",
+        action="store_true",
+        help="hedge slow agent model requests (see HEDGE_REQUESTS)",
+    )
+    parser.add_argument(
+        "--load-threshold",
+        type=float,
+        default=0.75,
+        help="load at which the worker is full (see WORKER_LOAD_THRESHOLD)",
+    )
+    parser.add_argument("--json", type=Path, help="write the report as JSON")
+    parser.add_argument(
+        "--trace-dir", type=Path, help="write each session's Chrome trace JSON here"
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    args = parse_args(argv)
+    report = asyncio.run(run(args))
+    print_report(report)
+    if args.json:
+        args.json.write_text(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
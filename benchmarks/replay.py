@@ -0,0 +1,428 @@
+"""Offline replay of recorded interview transcripts through the agent graph.
+
+Feeds the candidate turns of transcripts recorded by `VoiceAgent` (see
+TRANSCRIPT_DIR) through `create_hr_screen_agent`, with deterministic local
+models by default or the configured Gemini models with `--real-models`.
+Reports model calls, tool calls, prompt/completion tokens and wall time per
+turn, so prompt and graph changes can be compared without placing calls.
+
+    just bench-replay transcripts/ --concurrency 8 --repeat 4
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import tempfile
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, Optional
+from uuid import UUID
+
+os.environ.setdefault("CANDIDATE_NAME", "Jane Doe")
+os.environ.setdefault("COMPANY_NAME", "Tech Innovators Inc.")
+os.environ.setdefault("JOB_ROLE", "Software Engineer")
+# A fresh prompt cache, so the first session of the run writes it
+os.environ.setdefault("CONTEXT_CACHE_DIR", tempfile.mkdtemp(prefix="prefixes-"))
+
+from langchain_core.callbacks import AsyncCallbackHandler  # noqa: E402
+from langchain_core.messages import HumanMessage  # noqa: E402
+from langgraph.checkpoint.memory import InMemorySaver  # noqa: E402
+
+from benchmarks.fakes import (  # noqa: E402
+    FakeChatModel,
+    FakeContextCache,
+    LatencyDistribution,
+    create_fake_web_search,
+)
+from benchmarks.stats import summarize  # noqa: E402
+from hr_screen_agent.llm.base import DELEGATE_TAG  # noqa: E402
+from hr_screen_agent.telemetry.events import (  # noqa: E402
+    GraphEventLogger,
+    TraceLevel,
+)
+from hr_screen_agent.telemetry.usage import cached_tokens  # noqa: E402
+from voice_agent.transcript import read_transcript  # noqa: E402
+
+SAMPLE_TRANSCRIPTS = Path(__file__).parent / "transcripts"
+
+COUNTERS = [
+    "model_calls",
+    "tool_calls",
+    "input_tokens",
+    "cached_tokens",
+    "output_tokens",
+]
+
+# Shared by every replay, like Gemini's caches are by every session of a role
+CONTEXT_CACHE = FakeContextCache()
+
+
+class TurnUsage(AsyncCallbackHandler):
+    """Counts the model calls, tool calls and tokens of one graph run."""
+
+    def __init__(self) -> None:
+        self.model_calls = 0
+        self.tool_calls = 0
+        self.input_tokens = 0
+        self.cached_tokens = 0
+        self.output_tokens = 0
+        self._models: set[UUID] = set()
+
+    async def on_chat_model_start(
+        self,
+        serialized: dict[str, Any],
+        messages: list[list[Any]],
+        *,
+        run_id: UUID,
+        tags: Optional[list[str]] = None,
+        **kwargs: Any,
+    ) -> None:
+        # Calls made by a wrapper model are counted once, on the wrapper
+        if DELEGATE_TAG in (tags or []):
+            return
+        self._models.add(run_id)
+        self.model_calls += 1
+
+    async def on_llm_end(self, response: Any, *, run_id: UUID, **kwargs: Any) -> None:
+        if run_id not in self._models:
+            return
+        self._models.discard(run_id)
+        for generations in response.generations:
+            for generation in generations:
+                usage = getattr(generation.message, "usage_metadata", None) or {}
+                self.input_tokens += usage.get("input_tokens", 0)
+                self.cached_tokens += cached_tokens(generation.message)
+                self.output_tokens += usage.get("output_tokens", 0)
+
+    async def on_tool_start(
+        self, serialized: dict[str, Any], input_str: str, **kwargs: Any
+    ) -> None:
+        self.tool_calls += 1
+
+
+def find_transcripts(paths: list[Path]) -> list[Path]:
+    found: list[Path] = []
+    for path in paths:
+        found.extend(sorted(path.glob("*.jsonl")) if path.is_dir() else [path])
+    return found
+
+
+def user_turns(path: Path) -> list[str]:
+    return [r["content"] for r in read_transcript(path) if r.get("type") == "user"]
+
+
+def build_graph(args: argparse.Namespace, seed: int) -> Any:
+    os.environ["PHASE_TOOLS"] = str(args.phase_tools).lower()
+    os.environ["FIT_PROFILE"] = str(args.fit_profile).lower()
+    os.environ["MODEL_ROUTING"] = str(args.model_routing).lower()
+    os.environ["REASONING_MODE"] = args.reasoning_mode
+    os.environ["CONTEXT_CACHE"] = str(args.context_cache).lower()
+    if args.interview_plans and not os.environ.get("INTERVIEW_PLAN_CACHE"):
+        # A fresh plan cache, so the first session of the run writes the plan
+        os.environ["INTERVIEW_PLAN_CACHE"] = tempfile.mkdtemp(prefix="plans-")
+    for name, budget in [
+        ("SOFT_TOKEN_BUDGET", args.soft_token_budget),
+        ("HARD_TOKEN_BUDGET", args.hard_token_budget),
+    ]:
+        if budget:
+            os.environ[name] = str(budget)
+    from hr_screen_agent import create_hr_screen_agent
+    from hr_screen_agent.agent import DEFAULT_TOOLS
+
+    if args.real_models:
+        return create_hr_screen_agent(checkpointer=InMemorySaver())
+    # The local models have no quota to protect
+    os.environ.setdefault("GEMINI_REQUESTS_PER_MINUTE", "1000000")
+    os.environ.setdefault("GEMINI_MAX_CONCURRENCY", "1000")
+
+    # One set of seeded models per replay, so results do not depend on how
+    # the concurrent replays interleave
+    documents = tuple(sorted(p.name for p in Path("input").glob("*") if p.is_file()))
+    latency = LatencyDistribution.parse(args.llm_latency)
+    # How the agent models reason: think tool calls, or thinking tokens
+    reasoning = {
+        "think_rate": args.think_rate,
+        "thinking_budget": args.thinking_budget
+        if args.reasoning_mode == "native"
+        else 0,
+    }
+    model = FakeChatModel(
+        latency=latency,
+        tool_call_rate=args.tool_call_rate,
+        documents=documents,
+        seed=seed,
+        context_cache=CONTEXT_CACHE,
+        **reasoning,
+    )
+    guardrail_model = FakeChatModel(
+        latency=latency, seed=seed + 1, model_name="fake-guardrail"
+    )
+    economy_model = FakeChatModel(
+        latency=latency,
+        tool_call_rate=args.tool_call_rate,
+        documents=documents,
+        seed=seed + 2,
+        model_name="fake-economy",
+        **reasoning,
+    )
+    fast_model = FakeChatModel(
+        latency=LatencyDistribution.parse(args.fast_llm_latency),
+        tool_call_rate=args.tool_call_rate,
+        documents=documents,
+        seed=seed + 5,
+        model_name="fake-fast",
+        context_cache=CONTEXT_CACHE,
+        **reasoning,
+    )
+    fake_web_search = create_fake_web_search(latency, seed=seed)
+    return create_hr_screen_agent(
+        checkpointer=InMemorySaver(),
+        model=model,
+        guardrail_model=guardrail_model,
+        economy_model=economy_model,
+        fast_model=fast_model,
+        context_cache=CONTEXT_CACHE,
+        tools=[fake_web_search if t.name == "web_search" else t for t in DEFAULT_TOOLS],
+    )
+
+
+def prepare_session(args: argparse.Namespace, thread_id: str, seed: int) -> None:
+    """Start the interview's preparation, as the worker does at dispatch."""
+    from hr_screen_agent.preparation import start_preparation
+
+    if args.real_models:
+        start_preparation(thread_id)
+        return
+    latency = LatencyDistribution.parse(args.llm_latency)
+    start_preparation(
+        thread_id,
+        profile_model=FakeChatModel(
+            latency=latency, seed=seed + 3, model_name="fake-profile"
+        ),
+        plan_model=FakeChatModel(
+            latency=latency, seed=seed + 4, model_name="fake-plan"
+        ),
+    )
+
+
+async def replay(
+    index: int,
+    path: Path,
+    args: argparse.Namespace,
+    semaphore: asyncio.Semaphore,
+) -> list[dict[str, float]]:
+    """Replay one transcript on a fresh thread and return its per-turn stats."""
+    async with semaphore:
+        graph = build_graph(args, args.seed + index)
+        thread_id = f"replay__{path.stem}__{index}"
+        prepare_session(args, thread_id, args.seed + index)
+        events = GraphEventLogger(thread_id, args.graph_trace)
+        turns: list[dict[str, float]] = []
+        for content in user_turns(path)[: args.max_turns]:
+            usage = TurnUsage()
+            started = time.perf_counter()
+            async for _ in graph.astream(
+                {"messages": [HumanMessage(content=content)]},
+                {
+                    "configurable": {"thread_id": thread_id},
+                    "callbacks": [usage, events],
+                    "recursion_limit": 50,
+                },
+                stream_mode="updates",
+            ):
+                pass
+            turns.append(
+                {
+                    "wall_seconds": time.perf_counter() - started,
+                    "model_calls": usage.model_calls,
+                    "tool_calls": usage.tool_calls,
+                    "input_tokens": usage.input_tokens,
+                    "cached_tokens": usage.cached_tokens,
+                    "output_tokens": usage.output_tokens,
+                }
+            )
+        return turns
+
+
+async def run(args: argparse.Namespace) -> dict[str, Any]:
+    transcripts = find_transcripts(args.transcripts) * args.repeat
+    if not transcripts:
+        raise SystemExit("No transcripts to replay")
+
+    semaphore = asyncio.Semaphore(args.concurrency)
+    started = time.perf_counter()
+    replays = await asyncio.gather(
+        *(replay(i, path, args, semaphore) for i, path in enumerate(transcripts))
+    )
+    wall = time.perf_counter() - started
+
+    turns = [turn for turns in replays for turn in turns]
+    by_index: dict[int, list[dict[str, float]]] = defaultdict(list)
+    for turns_of_replay in replays:
+        for i, turn in enumerate(turns_of_replay):
+            by_index[i].append(turn)
+
+    def mean(values: list[float]) -> float:
+        return sum(values) / len(values) if values else 0.0
+
+    return {
+        "transcripts": len(transcripts),
+        "turns": len(turns),
+        "wall_seconds": wall,
+        "turns_per_second": len(turns) / wall if wall else 0.0,
+        "transcripts_per_second": len(transcripts) / wall if wall else 0.0,
+        "wall_seconds_per_turn": summarize([t["wall_seconds"] for t in turns]),
+        **{name: summarize([t[name] for t in turns]) for name in COUNTERS},
+        "totals": {name: sum(t[name] for t in turns) for name in COUNTERS},
+        "context_cache": {
+            "created": CONTEXT_CACHE.created,
+            "refreshed": CONTEXT_CACHE.refreshed,
+            "hits": CONTEXT_CACHE.hits,
+        },
+        "per_turn": [
+            {name: mean([t[name] for t in by_index[i]]) for name in turns[0]}
+            for i in sorted(by_index)
+        ],
+    }
+
+
+def print_report(report: dict[str, Any]) -> None:
+    print(
+        f"\n{report['transcripts']} transcripts, {report['turns']} turns "
+        f"in {report['wall_seconds']:.1f}s "
+        f"({report['turns_per_second']:.1f} turns/s, "
+        f"{report['transcripts_per_second']:.2f} transcripts/s)\n"
+    )
+    print(f"{'turn':<6}{'wall':>10}{'models':>8}{'tools':>8}{'in':>10}{'out':>8}")
+    for i, turn in enumerate(report["per_turn"]):
+        print(
+            f"{i:<6}{turn['wall_seconds'] * 1000:>8.1f}ms"
+            f"{turn['model_calls']:>8.1f}{turn['tool_calls']:>8.1f}"
+            f"{turn['input_tokens']:>10.0f}{turn['output_tokens']:>8.0f}"
+        )
+    print()
+    print(f"{'per turn':<16}{'p50':>10}{'p95':>10}{'p99':>10}{'max':>10}")
+    wall = report["wall_seconds_per_turn"]
+    print(
+        f"{'wall':<16}"
+        + "".join(f"{wall[k] * 1000:>8.1f}ms" for k in ["p50", "p95", "p99", "max"])
+    )
+    for name in COUNTERS:
+        stats = report[name]
+        print(
+            f"{name:<16}"
+            + "".join(f"{stats[k]:>10.0f}" for k in ["p50", "p95", "p99", "max"])
+        )
+    totals = report["totals"]
+    print(
+        f"\nTotal: {totals['model_calls']:.0f} model calls, "
+        f"{totals['tool_calls']:.0f} tool calls, "
+        f"{totals['input_tokens']:.0f} prompt "
+        f"({totals['cached_tokens']:.0f} cached) and "
+        f"{totals['output_tokens']:.0f} completion tokens"
+    )
+    cache = report["context_cache"]
+    print(
+        f"Context cache: {cache['created']} prefixes created, "
+        f"{cache['refreshed']} refreshed, {cache['hits']} calls read from cache"
+    )
+
+
+def parse_args(argv: Optional[list[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "transcripts",
+        nargs="*",
+        type=Path,
+        default=[SAMPLE_TRANSCRIPTS],
+        help="transcript files or directories (default: the bundled samples)",
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=1, help="replays of every transcript"
+    )
+    parser.add_argument(
+        "--concurrency", type=int, default=4, help="replays running at once"
+    )
+    parser.add_argument("--max-turns", type=int, help="replay only the first turns")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--real-models",
+        action="store_true",
+        help="call the configured Gemini models and web search instead of fakes",
+    )
+    parser.add_argument(
+        "--llm-latency",
+        default="constant:0",
+        help="latency of the fake models and web search",
+    )
+    parser.add_argument("--tool-call-rate", type=float, default=0.3)
+    parser.add_argument(
+        "--model-routing",
+        action="store_true",
+        help="route simple turns to the fast model (see MODEL_ROUTING)",
+    )
+    parser.add_argument(
+        "--fast-llm-latency",
+        default="constant:0",
+        help="latency of the fake fast model",
+    )
+    parser.add_argument(
+        "--reasoning-mode",
+        choices=["think_tool", "native"],
+        default="think_tool",
+        help="see REASONING_MODE",
+    )
+    parser.add_argument(
+        "--thinking-budget", type=int, default=256, help="see THINKING_BUDGET"
+    )
+    parser.add_argument(
+        "--think-rate",
+        type=float,
+        default=0.5,
+        help="share of tool results the fake agent model calls `think` on",
+    )
+    parser.add_argument(
+        "--phase-tools",
+        action="store_true",
+        help="offer only the tools of the current interview phase (see PHASE_TOOLS)",
+    )
+    parser.add_argument(
+        "--fit-profile",
+        action="store_true",
+        help="write the candidate fit profile when the session starts (see FIT_PROFILE)",
+    )
+    parser.add_argument(
+        "--interview-plans",
+        action="store_true",
+        help="plan the role's interviews once, in a fresh cache (see INTERVIEW_PLAN_CACHE)",
+    )
+    parser.add_argument(
+        "--context-cache",
+        action="store_true",
+        help="send the stable prompt prefix from the fake context cache (see CONTEXT_CACHE)",
+    )
+    parser.add_argument("--soft-token-budget", type=int, help="see SOFT_TOKEN_BUDGET")
+    parser.add_argument("--hard-token-budget", type=int, help="see HARD_TOKEN_BUDGET")
+    parser.add_argument(
+        "--graph-trace",
+        type=TraceLevel,
+        default=TraceLevel.OFF,
+        choices=list(TraceLevel),
+        help="log structured graph events to stdout (see GRAPH_TRACE_LEVEL)",
+    )
+    parser.add_argument("--json", type=Path, help="write the report as JSON")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    args = parse_args(argv)
+    report = asyncio.run(run(args))
+    print_report(report)
+    if args.json:
+        args.json.write_text(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,336 @@
+"""Offline evaluation of the model routing policy: latency saved versus quality.
+
+Replays recorded transcripts through the agent graph on the main model and
+records the input of every agent call. Each call is then answered again by
+the main and the fast model, timed, and a judge model decides whether the
+fast reply would have served as well as the main one. Reports, by routing
+decision, the latency of both models and the share of acceptable fast
+replies, so the policy (see MODEL_ROUTING) can be tuned before it is
+enabled. Calls the policy keeps on the main model are evaluated too, as a
+control. Uses deterministic local models by default, or the configured
+`chat_model`, `fast_chat_model` and, as judge, `chat_model` with
+`--real-models`.
+
+    just bench-routing
+    just bench-routing --real-models --max-words 8 --fast-phases wrap_up,introduction
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, Optional
+from uuid import UUID
+
+from langchain.chat_models import init_chat_model
+from langchain_core.callbacks import AsyncCallbackHandler
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import BaseMessage, HumanMessage, get_buffer_string
+from pydantic import BaseModel, Field
+
+from benchmarks.fakes import FakeChatModel, LatencyDistribution
+from benchmarks.replay import (
+    SAMPLE_TRANSCRIPTS,
+    build_graph,
+    find_transcripts,
+    user_turns,
+)
+from benchmarks.stats import summarize
+from hr_screen_agent.agent import DEFAULT_TOOLS
+from hr_screen_agent.configuration import Configuration
+from hr_screen_agent.llm import DELEGATE_TAG, PhasedChatModel, RoutingPolicy
+from hr_screen_agent.phases import PHASE_TOOLS
+
+JUDGE_INSTRUCTIONS = """
+You review the replies of Rachel, a voice AI interviewer running an HR screening call.
+Below are the end of the conversation and two replies to it: the reference reply of
+the main model, and a candidate reply of a faster model.
+
+Is the candidate reply acceptable in place of the reference? It is acceptable when it
+takes an equivalent next step (the same tool, or a question or answer to the same
+effect), is correct given the conversation, and sounds natural when spoken. Wording
+and length may differ.
+
+<conversation>
+{conversation}
+</conversation>
+
+<reference_reply>
+{reference}
+</reference_reply>
+
+<candidate_reply>
+{candidate}
+</candidate_reply>
+"""
+
+
+class RoutingJudgement(BaseModel):
+    """Whether the fast model's reply is an acceptable substitute."""
+
+    acceptable: bool = Field(
+        description="True if the candidate reply is as good as the reference for the interview."
+    )
+
+
+class AgentCalls(AsyncCallbackHandler):
+    """Records the input of every agent model call of a graph run."""
+
+    def __init__(self) -> None:
+        self.calls: list[list[BaseMessage]] = []
+
+    async def on_chat_model_start(
+        self,
+        serialized: dict[str, Any],
+        messages: list[list[BaseMessage]],
+        *,
+        run_id: UUID,
+        tags: Optional[list[str]] = None,
+        metadata: Optional[dict[str, Any]] = None,
+        **kwargs: Any,
+    ) -> None:
+        if DELEGATE_TAG in (tags or []):
+            return
+        if (metadata or {}).get("langgraph_node") == "agent":
+            self.calls.extend(messages)
+
+
+def describe(message: BaseMessage) -> str:
+    """Render a reply with its tool calls for the judge."""
+    calls = [
+        f"[calls {c['name']}({json.dumps(c['args'])})]"
+        for c in getattr(message, "tool_calls", [])
+    ]
+    return "\n".join([message.text(), *calls]).strip() or "[no reply]"
+
+
+async def record_calls(args: argparse.Namespace) -> list[list[BaseMessage]]:
+    """Replay the transcripts on the main model and return its inputs."""
+    replay_args = argparse.Namespace(**{**vars(args), "model_routing": False})
+    if not args.real_models:
+        replay_args.llm_latency = "constant:0"
+    recorder = AgentCalls()
+    for index, path in enumerate(find_transcripts(args.transcripts)):
+        graph = build_graph(replay_args, args.seed + index)
+        thread_id = f"routing__{path.stem}__{index}"
+        for content in user_turns(path)[: args.max_turns]:
+            await graph.ainvoke(
+                {"messages": [HumanMessage(content=content)]},
+                {
+                    "configurable": {"thread_id": thread_id},
+                    "callbacks": [recorder],
+                    "recursion_limit": 50,
+                },
+            )
+    return recorder.calls
+
+
+def build_models(
+    args: argparse.Namespace,
+) -> tuple[BaseChatModel, BaseChatModel, BaseChatModel]:
+    """Return the main, fast and judge models."""
+    if args.real_models:
+        configurable = Configuration.from_runnable_config()
+        main = init_chat_model(configurable.chat_model, temperature=0.5)
+        fast = init_chat_model(
+            configurable.fast_chat_model or configurable.guardrail_model,
+            temperature=0.5,
+        )
+        judge = init_chat_model(configurable.chat_model, temperature=0)
+        return main, fast, judge
+    documents = tuple(sorted(p.name for p in Path("input").glob("*") if p.is_file()))
+    main = FakeChatModel(
+        latency=LatencyDistribution.parse(args.llm_latency),
+        documents=documents,
+        seed=args.seed,
+    )
+    fast = FakeChatModel(
+        latency=LatencyDistribution.parse(args.fast_llm_latency),
+        documents=documents,
+        seed=args.seed + 1,
+        model_name="fake-fast",
+    )
+    judge = FakeChatModel(
+        block_rate=args.judge_reject_rate, seed=args.seed + 2, model_name="fake-judge"
+    )
+    return main, fast, judge
+
+
+async def evaluate(
+    messages: list[BaseMessage],
+    main: Any,
+    fast: Any,
+    judge: Any,
+    semaphore: asyncio.Semaphore,
+) -> dict[str, Any]:
+    """Answer one agent call with both models and judge the fast reply."""
+
+    async def timed(model: Any) -> tuple[BaseMessage, float]:
+        started = time.perf_counter()
+        reply = await model.ainvoke(messages)
+        return reply, time.perf_counter() - started
+
+    async with semaphore:
+        (reference, main_seconds), (candidate, fast_seconds) = await asyncio.gather(
+            timed(main), timed(fast)
+        )
+        judgement = await judge.ainvoke(
+            JUDGE_INSTRUCTIONS.format(
+                conversation=get_buffer_string(messages[-6:]),
+                reference=describe(reference),
+                candidate=describe(candidate),
+            )
+        )
+    return {
+        "main_seconds": main_seconds,
+        "fast_seconds": fast_seconds,
+        "acceptable": RoutingJudgement.model_validate(judgement).acceptable,
+    }
+
+
+async def run(args: argparse.Namespace) -> dict[str, Any]:
+    calls = await record_calls(args)
+    if not calls:
+        raise SystemExit("No agent calls to evaluate")
+    policy = RoutingPolicy(
+        max_words=args.max_words,
+        fast_phases=frozenset(
+            p.strip() for p in args.fast_phases.split(",") if p.strip()
+        ),
+    )
+    main, fast, judge = build_models(args)
+    tools_by_phase = {phase.value: names for phase, names in PHASE_TOOLS.items()}
+    main = PhasedChatModel(inner=main, tools_by_phase=tools_by_phase).bind_tools(
+        DEFAULT_TOOLS
+    )
+    fast = PhasedChatModel(inner=fast, tools_by_phase=tools_by_phase).bind_tools(
+        DEFAULT_TOOLS
+    )
+    judge = judge.with_structured_output(RoutingJudgement)
+
+    semaphore = asyncio.Semaphore(args.concurrency)
+    results = await asyncio.gather(
+        *(evaluate(messages, main, fast, judge, semaphore) for messages in calls)
+    )
+    by_route: dict[tuple[str, str], list[dict[str, Any]]] = defaultdict(list)
+    for messages, result in zip(calls, results, strict=True):
+        by_route[policy.route(messages)].append(result)
+
+    routed = [r for (tier, _), rs in by_route.items() if tier == "fast" for r in rs]
+    saved = sum(r["main_seconds"] - r["fast_seconds"] for r in routed)
+    return {
+        "calls": len(calls),
+        "routed_fast": len(routed),
+        "seconds_saved_per_call": saved / len(calls),
+        "fast_acceptable": (
+            sum(r["acceptable"] for r in routed) / len(routed) if routed else 0.0
+        ),
+        "routes": [
+            {
+                "tier": tier,
+                "reason": reason,
+                "calls": len(rs),
+                "main_seconds": summarize([r["main_seconds"] for r in rs]),
+                "fast_seconds": summarize([r["fast_seconds"] for r in rs]),
+                "acceptable": sum(r["acceptable"] for r in rs) / len(rs),
+            }
+            for (tier, reason), rs in sorted(by_route.items())
+        ],
+    }
+
+
+def print_report(report: dict[str, Any]) -> None:
+    print(f"\n{report['calls']} agent calls\n")
+    print(
+        f"{'tier':<6}{'reason':<13}{'calls':>6}"
+        f"{'main p50':>11}{'fast p50':>11}{'acceptable':>12}"
+    )
+    for route in report["routes"]:
+        print(
+            f"{route['tier']:<6}{route['reason']:<13}{route['calls']:>6}"
+            f"{route['main_seconds']['p50'] * 1000:>9.0f}ms"
+            f"{route['fast_seconds']['p50'] * 1000:>9.0f}ms"
+            f"{route['acceptable']:>12.0%}"
+        )
+    print(
+        f"\nRouted {report['routed_fast']} of {report['calls']} calls to the fast "
+        f"model, saving {report['seconds_saved_per_call'] * 1000:.0f}ms per call; "
+        f"{report['fast_acceptable']:.0%} of the routed replies were acceptable"
+    )
+
+
+def parse_args(argv: Optional[list[str]] = None) -> argparse.Namespace:
+    defaults = RoutingPolicy()
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "transcripts",
+        nargs="*",
+        type=Path,
+        default=[SAMPLE_TRANSCRIPTS],
+        help="transcript files or directories (default: the bundled samples)",
+    )
+    parser.add_argument("--max-turns", type=int, help="replay only the first turns")
+    parser.add_argument(
+        "--concurrency", type=int, default=4, help="calls evaluated at once"
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--real-models",
+        action="store_true",
+        help="call the configured Gemini models and web search instead of fakes",
+    )
+    parser.add_argument(
+        "--llm-latency",
+        default="lognormal:0.9,0.3",
+        help="latency of the fake main model",
+    )
+    parser.add_argument(
+        "--fast-llm-latency",
+        default="lognormal:0.45,0.3",
+        help="latency of the fake fast model",
+    )
+    parser.add_argument(
+        "--judge-reject-rate",
+        type=float,
+        default=0.05,
+        help="share of the fast replies the fake judge rejects",
+    )
+    parser.add_argument(
+        "--max-words",
+        type=int,
+        default=defaults.max_words,
+        help="see ROUTING_MAX_WORDS",
+    )
+    parser.add_argument(
+        "--fast-phases",
+        default=",".join(sorted(defaults.fast_phases)),
+        help="see ROUTING_FAST_PHASES",
+    )
+    parser.add_argument("--json", type=Path, help="write the report as JSON")
+    parser.set_defaults(
+        phase_tools=True,
+        fit_profile=False,
+        interview_plans=False,
+        context_cache=False,
+        tool_call_rate=0.3,
+        reasoning_mode="think_tool",
+        thinking_budget=256,
+        think_rate=0.5,
+        soft_token_budget=None,
+        hard_token_budget=None,
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    args = parse_args(argv)
+    report = asyncio.run(run(args))
+    print_report(report)
+    if args.json:
+        args.json.write_text(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+"""Cold-start benchmark: import time of the worker, per module.
+
+Imports the worker entrypoint (`app` by default) in fresh interpreters with
+`python -X importtime`, and reports the wall time of each cold start, the
+total import time, and where it goes: the self time of every top-level
+package, and the cumulative time of the slowest modules. Every module is
+imported once per process, so its cost is attributed to whichever module
+imports it first.
+
+    just bench-startup --repeat 5
+    just bench-startup --module hr_screen_agent --top 30
+"""
+
+import argparse
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, Optional
+
+from benchmarks.stats import summarize
+
+ROOT = Path(__file__).parent.parent
+
+# `python -X importtime` lines: "import time: <self us> | <cumulative us> | <name>"
+IMPORT_TIME = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \| (\s*)(\S+)$")
+
+# Interview settings the entrypoint reads when it is imported
+ENVIRONMENT = {
+    "CANDIDATE_NAME": "Jane Doe",
+    "COMPANY_NAME": "Tech Innovators Inc.",
+    "JOB_ROLE": "Software Engineer",
+}
+
+
+def import_once(module: str) -> dict[str, Any]:
+    """Import `module` in a fresh interpreter and parse its import times."""
+    env = {**ENVIRONMENT, **os.environ}
+    started = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    wall = time.perf_counter() - started
+    if result.returncode != 0:
+        raise RuntimeError(f"importing {module} failed:\n{result.stderr[-2000:]}")
+
+    modules: dict[str, tuple[float, float]] = {}
+    total = 0.0
+    for line in result.stderr.splitlines():
+        match = IMPORT_TIME.match(line)
+        if match is None:
+            continue
+        self_us, cumulative_us, indent, name = match.groups()
+        modules[name] = (int(self_us) / 1e6, int(cumulative_us) / 1e6)
+        # Top-level imports (of the interpreter and the `-c` script) add up
+        if not indent:
+            total += int(cumulative_us) / 1e6
+    return {"wall_seconds": wall, "import_seconds": total, "modules": modules}
+
+
+def run(args: argparse.Namespace) -> dict[str, Any]:
+    runs = [import_once(args.module) for _ in range(args.repeat)]
+
+    packages: dict[str, list[float]] = defaultdict(list)
+    cumulative: dict[str, list[float]] = defaultdict(list)
+    for result in runs:
+        by_package: dict[str, float] = defaultdict(float)
+        for name, (self_seconds, cumulative_seconds) in result["modules"].items():
+            by_package[name.split(".")[0]] += self_seconds
+            cumulative[name].append(cumulative_seconds)
+        for package, seconds in by_package.items():
+            packages[package].append(seconds)
+
+    def median(values: list[float]) -> float:
+        # Modules missing from some runs count as not imported there
+        return statistics.median(values + [0.0] * (len(runs) - len(values)))
+
+    return {
+        "module": args.module,
+        "runs": len(runs),
+        "wall_seconds": summarize([r["wall_seconds"] for r in runs]),
+        "import_seconds": summarize([r["import_seconds"] for r in runs]),
+        "packages": dict(
+            sorted(
+                ((name, median(v)) for name, v in packages.items()),
+                key=lambda item: item[1],
+                reverse=True,
+            )[: args.top]
+        ),
+        "modules": dict(
+            sorted(
+                ((name, median(v)) for name, v in cumulative.items()),
+                key=lambda item: item[1],
+                reverse=True,
+            )[: args.top]
+        ),
+    }
+
+
+def print_report(report: dict[str, Any]) -> None:
+    wall = report["wall_seconds"]
+    imports = report["import_seconds"]
+    print(f"\nimport {report['module']}: {report['runs']} cold starts\n")
+    print(f"{'':<16}{'p50':>10}{'p95':>10}{'max':>10}")
+    for name, stats in [("process wall", wall), ("imports", imports)]:
+        print(
+            f"{name:<16}"
+            + "".join(f"{stats[k] * 1000:>8.0f}ms" for k in ["p50", "p95", "max"])
+        )
+
+    print(f"\n{'package (self time)':<48}{'median':>10}")
+    for name, seconds in report["packages"].items():
+        print(f"{name:<48}{seconds * 1000:>8.1f}ms")
+    print(f"\n{'module (cumulative time)':<48}{'median':>10}")
+    for name, seconds in report["modules"].items():
+        print(f"{name:<48}{seconds * 1000:>8.1f}ms")
+
+
+def parse_args(argv: Optional[list[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--module", default="app", help="module to import (default: the worker)"
+    )
+    parser.add_argument("--repeat", type=int, default=5, help="cold starts to time")
+    parser.add_argument("--top", type=int, default=20, help="packages and modules")
+    parser.add_argument("--json", type=Path, help="write the report as JSON")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    args = parse_args(argv)
+    report = run(args)
+    print_report(report)
+    if args.json:
+        args.json.write_text(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""Latency statistics and process sampling shared by the benchmarks."""
+
+import asyncio
+import time
+from typing import Optional, Sequence
+
+import psutil
+
+from hr_screen_agent.utils import percentile
+
+
+def summarize(values: Sequence[float]) -> dict[str, float]:
+    """Summarize latencies (in seconds) as p50/p95/p99/max."""
+    return {
+        "count": len(values),
+        "p50": percentile(values, 50),
+        "p95": percentile(values, 95),
+        "p99": percentile(values, 99),
+        "max": max(values, default=0.0),
+    }
+
+
+class EventLoopMonitor:
+    """Measures event-loop lag and peak RSS while a benchmark is running.
+
+    Lag is how much later than requested a periodic `asyncio.sleep` wakes up,
+    i.e. how long ready callbacks had to wait for the loop.
+    """
+
+    def __init__(
+        self, interval: float = 0.05, process: Optional[psutil.Process] = None
+    ) -> None:
+        self.interval = interval
+        self.lags: list[float] = []
+        self.peak_rss = 0
+        self._process = process or psutil.Process()
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+    async def _run(self) -> None:
+        while True:
+            started = time.perf_counter()
+            await asyncio.sleep(self.interval)
+            self.lags.append(max(0.0, time.perf_counter() - started - self.interval))
+            self.peak_rss = max(self.peak_rss, self._process.memory_info().rss)
@@ -1,13 +1,37 @@
-from typing import Optional
+from typing import Callable, Optional, Sequence
 
 from langchain.chat_models import init_chat_model
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import BaseMessage, SystemMessage
+from langchain_core.tools import BaseTool
 from langgraph.prebuilt.chat_agent_executor import create_react_agent
 from langgraph.pregel.protocol import PregelProtocol
 from langgraph.types import Checkpointer
 
 from hr_screen_agent.configuration import Configuration
-from hr_screen_agent.hooks.pre_model_hook import pre_model_hook
-from hr_screen_agent.prompts import agent_instructions, think_tool_instructions
+from hr_screen_agent.hooks.pre_model_hook import create_pre_model_hook
+from hr_screen_agent.llm import (
+    BudgetedChatModel,
+    ContextCachedChatModel,
+    ContextCacheProvider,
+    ContextCacheRegistry,
+    GeminiContextCache,
+    HedgedChatModel,
+    PhasedChatModel,
+    Priority,
+    RoutedChatModel,
+    RoutingPolicy,
+    governed,
+)
+from hr_screen_agent.phases import PHASE_TOOLS, create_phase_prompt
+from hr_screen_agent.plans import with_interview_plan
+from hr_screen_agent.prompts import (
+    agent_instructions,
+    native_thinking_instructions,
+    post_call_summary_note,
+    session_instructions,
+    think_tool_instructions,
+)
 from hr_screen_agent.state import HrScreenAgentState
 from hr_screen_agent.tools import (
     check_time_remaining,
@@ -21,49 +45,239 @@ from hr_screen_agent.tools import (
     web_search,
     write_interview_summary,
 )
+from hr_screen_agent.tools.tool_node import (
+    ConcurrentToolNode,
+    get_tool_executor,
+    parse_tool_timeouts,
+)
 from hr_screen_agent.utils import current_time_context
 
+# Tools the `native` reasoning mode replaces with the model's own thinking
+THINK_TOOLS = frozenset({"think", "clear_thoughts"})
+
+DEFAULT_TOOLS: list[BaseTool] = [
+    think,
+    clear_thoughts,
+    web_search,
+    list_input_files,
+    read_input_file,
+    start_timer,
+    check_time_remaining,
+    write_interview_summary,
+    get_interview_summary,
+    end_call,
+]
+
 
 def create_hr_screen_agent(
-    checkpointer: Optional[Checkpointer] = None, debug: bool = False
+    checkpointer: Optional[Checkpointer] = None,
+    debug: bool = False,
+    *,
+    model: Optional[BaseChatModel] = None,
+    guardrail_model: Optional[BaseChatModel] = None,
+    fallback_model: Optional[BaseChatModel] = None,
+    economy_model: Optional[BaseChatModel] = None,
+    fast_model: Optional[BaseChatModel] = None,
+    context_cache: Optional[ContextCacheProvider] = None,
+    tools: Optional[Sequence[BaseTool]] = None,
 ) -> PregelProtocol:
+    """Create the HR screen agent graph.
+
+    Args:
+        checkpointer: Checkpointer used to persist the conversation state
+        debug: Whether to print every graph super-step, for local debugging
+            only; sessions log compact events with `GraphEventLogger`
+        model: Chat model to use instead of the configured `chat_model`
+        guardrail_model: Chat model to use instead of the configured `guardrail_model`
+        fallback_model: Chat model to use instead of the configured `fallback_chat_model`
+        economy_model: Chat model the agent switches to at the soft token budget,
+            instead of the configured `guardrail_model`
+        fast_model: Chat model simple turns are routed to with `model_routing`,
+            instead of the configured `fast_chat_model`
+        context_cache: Context cache provider to use instead of Gemini's. The
+            agent's prompt prefix is cached when `context_cache` is configured
+            and either this is set or the configured `chat_model` is Gemini,
+            and likewise the prefix of the fast model.
+        tools: Tools to bind instead of `DEFAULT_TOOLS`. With `post_call_summary`
+            the summary tools are left out of the default tools, and with the
+            `native` reasoning mode the `THINK_TOOLS` are left out.
+
+    Returns:
+        The compiled agent graph.
+    """
     configurable = Configuration.from_runnable_config()
-    llm = init_chat_model(
+    # Retries are left to the Gemini governor, which backs off for every session
+    native_thinking = configurable.reasoning_mode == "native"
+    agent_model = model or init_chat_model(
         model=configurable.chat_model,
         temperature=0.5,
-        max_retries=3,
+        max_retries=1,
+        **(
+            {"thinking_budget": configurable.thinking_budget}
+            if native_thinking and configurable.chat_model.startswith("google_genai:")
+            else {}
+        ),
+    )
+    registry = ContextCacheRegistry(
+        configurable.context_cache_dir, ttl=configurable.context_cache_ttl
+    )
+    if _uses_context_cache(configurable, configurable.chat_model, model, context_cache):
+        # The instructions and tools are the same for every candidate for a role
+        agent_model = ContextCachedChatModel(
+            inner=agent_model,
+            provider=context_cache or GeminiContextCache(),
+            registry=registry,
+        )
+    llm = governed(agent_model, Priority.AGENT, "agent")
+    if configurable.hedge_requests:
+        if fallback_model is None and configurable.fallback_chat_model:
+            fallback_model = init_chat_model(
+                model=configurable.fallback_chat_model,
+                temperature=0.5,
+                max_retries=1,
+            )
+        llm = HedgedChatModel(
+            primary=llm,
+            fallback=governed(fallback_model, Priority.AGENT, "agent")
+            if fallback_model is not None
+            else None,
+            hedge_percentile=configurable.hedge_percentile,
+            control_fraction=configurable.hedge_control_fraction,
+        )
+
+    if configurable.model_routing:
+        # Acknowledgements and short answers do not need the main model
+        fast_chat_model = configurable.fast_chat_model or configurable.guardrail_model
+        fast = fast_model or init_chat_model(
+            model=fast_chat_model,
+            temperature=0.5,
+            max_retries=1,
+        )
+        if _uses_context_cache(
+            configurable, fast_chat_model, fast_model, context_cache
+        ):
+            fast = ContextCachedChatModel(
+                inner=fast,
+                provider=context_cache or GeminiContextCache(),
+                registry=registry,
+            )
+        llm = RoutedChatModel(
+            inner=llm,
+            fast=governed(fast, Priority.AGENT, "agent_fast"),
+            policy=RoutingPolicy(
+                max_words=configurable.routing_max_words,
+                fast_phases=frozenset(
+                    p.strip()
+                    for p in configurable.routing_fast_phases.split(",")
+                    if p.strip()
+                ),
+            ),
+        )
+
+    if configurable.soft_token_budget:
+        # Past the soft budget, the agent answers with the cheaper guardrail tier
+        llm = BudgetedChatModel(
+            inner=llm,
+            economy=governed(
+                economy_model
+                or init_chat_model(
+                    model=configurable.guardrail_model,
+                    temperature=0.5,
+                    max_retries=1,
+                ),
+                Priority.AGENT,
+                "agent_economy",
+            ),
+            soft_budget=configurable.soft_token_budget,
+        )
+
+    # Stable instructions first, what differs between candidates last
+    prompt = agent_instructions.format(
+        think_tool_instructions=native_thinking_instructions
+        if native_thinking
+        else think_tool_instructions,
+        company_name=configurable.company_name,
+        job_role=configurable.job_role,
+        interview_duration_minutes=configurable.interview_duration_minutes,
     )
+    if tools is None:
+        tools = DEFAULT_TOOLS
+        if configurable.post_call_summary:
+            # The summary is written by the post-call workers, off the live turn
+            tools = [
+                t
+                for t in tools
+                if t not in (write_interview_summary, get_interview_summary)
+            ]
+            prompt = f"{prompt}\n\n{post_call_summary_note}"
+    if native_thinking:
+        # The model thinks within its budget instead of in extra tool round trips
+        tools = [t for t in tools if t.name not in THINK_TOOLS]
+    session = [
+        SystemMessage(
+            content=session_instructions.format(
+                candidate_name=configurable.candidate_name,
+                current_time_context=current_time_context(),
+            )
+        )
+    ]
+    if configurable.phase_tools:
+        # Only send the tool schemas the current interview phase needs
+        llm = PhasedChatModel(
+            inner=llm,
+            tools_by_phase={phase.value: names for phase, names in PHASE_TOOLS.items()},
+        )
+        prompt = create_phase_prompt(prompt, session)
+    else:
+        prompt = _create_prompt(prompt, session)
 
     return create_react_agent(
         name="hr_screen_agent",
         model=llm,
         state_schema=HrScreenAgentState,
-        pre_model_hook=pre_model_hook,
-        tools=[
-            think,
-            clear_thoughts,
-            web_search,
-            list_input_files,
-            read_input_file,
-            start_timer,
-            check_time_remaining,
-            write_interview_summary,
-            get_interview_summary,
-            end_call,
-        ],
-        prompt=agent_instructions.format(
-            current_time_context=current_time_context(),
-            think_tool_instructions=think_tool_instructions,
-            candidate_name=configurable.candidate_name,
-            company_name=configurable.company_name,
-            job_role=configurable.job_role,
-            interview_duration_minutes=configurable.interview_duration_minutes,
+        pre_model_hook=create_pre_model_hook(guardrail_model),
+        # Tool calls of a step run concurrently, each within its own timeout
+        tools=ConcurrentToolNode(
+            list(tools),
+            timeouts=parse_tool_timeouts(configurable.tool_timeouts),
+            default_timeout=configurable.tool_timeout,
+            executor=get_tool_executor(configurable.tool_max_workers),
         ),
+        prompt=prompt,
         checkpointer=checkpointer,
         debug=debug,
     )
 
 
+def _uses_context_cache(
+    configurable: Configuration,
+    model_name: str,
+    model: Optional[BaseChatModel],
+    context_cache: Optional[ContextCacheProvider],
+) -> bool:
+    """Whether the prompt prefix of a model is sent from the context cache.
+
+    Either a provider is given, or the configured model `model_name` is used
+    and is a Gemini model.
+    """
+    return configurable.context_cache and (
+        context_cache is not None
+        or (model is None and model_name.startswith("google_genai:"))
+    )
+
+
+def _create_prompt(
+    instructions: str, session: Sequence[BaseMessage]
+) -> Callable[[HrScreenAgentState], list[BaseMessage]]:
+    system = SystemMessage(content=instructions)
+
+    def prompt(state: HrScreenAgentState) -> list[BaseMessage]:
+        plan = state.get("interview_plan")
+        return [with_interview_plan(system, plan), *session, *state["messages"]]
+
+    return prompt
+
+
 # just uv run -m hr_screen_agent.agent
 if __name__ == "__main__":
     import asyncio
@@ -93,7 +307,8 @@ if __name__ == "__main__":
             },
         ):
             updates = next(iter(output.values()))
-            if not updates:
+            # The pre-model hook may only update the interview phase
+            if not updates or "messages" not in updates:
                 continue
             last_message = updates["messages"][-1]
             last_message.pretty_print()
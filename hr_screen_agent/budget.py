@@ -0,0 +1,110 @@
+import copy
+from typing import Any, Optional, Sequence
+
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage, ToolMessage
+from langchain_core.messages.utils import count_tokens_approximately
+from langchain_core.runnables import RunnableConfig
+
+from hr_screen_agent.configuration import Configuration
+from hr_screen_agent.state import HrScreenAgentState
+from hr_screen_agent.telemetry.metrics import TOKEN_BUDGETS_REACHED
+from hr_screen_agent.telemetry.usage import get_usage_ledger
+
+# Smaller tool results are not worth compacting
+COMPACT_MIN_TOKENS = 200
+
+COMPACTED_TOOL_RESULT = (
+    "[Compacted to save tokens: {tokens} tokens of `{name}` output that was "
+    "already used earlier in the interview. Call the tool again if needed.]"
+)
+
+
+def soft_budget_reached(thread_id: Optional[str], configuration: Configuration) -> bool:
+    budget = configuration.soft_token_budget
+    return bool(budget) and get_usage_ledger().total_tokens(thread_id) >= budget
+
+
+def hard_budget_reached(thread_id: Optional[str], configuration: Configuration) -> bool:
+    budget = configuration.hard_token_budget
+    return bool(budget) and get_usage_ledger().total_tokens(thread_id) >= budget
+
+
+def track_usage(state: HrScreenAgentState, config: RunnableConfig) -> dict[str, Any]:
+    """Account the thread's token usage before a model call.
+
+    Restores the ledger from the checkpoint after a restart, records the
+    tokens the latest tool results add to the conversation, and applies the
+    soft budget: from then on, older tool results are compacted in the
+    messages sent to the model.
+
+    Returns:
+        The state update with the compacted `llm_input_messages` once the
+        soft budget is reached.
+    """
+    configuration = Configuration.from_runnable_config(config)
+    thread_id = (config.get("configurable") or {}).get("thread_id")
+    if thread_id is None:
+        return {}
+
+    ledger = get_usage_ledger()
+    ledger.restore(thread_id, state.get("token_usage"))
+    messages = state["messages"]
+    for message in reversed(messages):
+        if isinstance(message, AIMessage):
+            break
+        if isinstance(message, ToolMessage):
+            ledger.record_context(
+                thread_id,
+                message.name or "tool",
+                message.tool_call_id,
+                count_tokens_approximately([message]),
+            )
+
+    previous = state.get("token_usage") or {}
+    before = previous.get("input_tokens", 0) + previous.get("output_tokens", 0)
+    total = ledger.total_tokens(thread_id)
+    for budget, limit in [
+        ("soft", configuration.soft_token_budget),
+        ("hard", configuration.hard_token_budget),
+    ]:
+        if limit and before < limit <= total:
+            TOKEN_BUDGETS_REACHED.labels(budget=budget).inc()
+
+    if soft_budget_reached(thread_id, configuration):
+        return {"llm_input_messages": compact_messages(messages)}
+    return {}
+
+
+def usage_snapshot(config: RunnableConfig) -> dict[str, Any]:
+    """The state update that checkpoints the thread's token usage."""
+    thread_id = (config.get("configurable") or {}).get("thread_id")
+    if thread_id is None:
+        return {}
+    return {"token_usage": copy.deepcopy(get_usage_ledger().usage(thread_id))}
+
+
+def compact_messages(messages: Sequence[BaseMessage]) -> list[BaseMessage]:
+    """Replace the large tool results of earlier turns with a short note.
+
+    Documents, search results and think logs are re-sent with every model
+    call. The results of the current turn are kept, and the structure of the
+    conversation too, so every tool call still has its result.
+    """
+    current_turn = max(
+        (i for i, m in enumerate(messages) if isinstance(m, HumanMessage)),
+        default=0,
+    )
+    compacted: list[BaseMessage] = []
+    for i, message in enumerate(messages):
+        if isinstance(message, ToolMessage) and i < current_turn:
+            tokens = count_tokens_approximately([message])
+            if tokens >= COMPACT_MIN_TOKENS:
+                message = message.model_copy(
+                    update={
+                        "content": COMPACTED_TOOL_RESULT.format(
+                            tokens=tokens, name=message.name or "tool"
+                        )
+                    }
+                )
+        compacted.append(message)
+    return compacted
@@ -1,12 +1,17 @@
 import os
-from typing import Any, Optional
+from typing import Any, Literal, Optional, Self
 
 from langchain_core.runnables import RunnableConfig
 from pydantic import BaseModel, Field
 
 
-class Configuration(BaseModel):
-    """The configuration for the agent."""
+class WorkerConfiguration(BaseModel):
+    """The configuration shared by every interview of a worker.
+
+    Models, limits and features, without the candidate, company and role of
+    an interview, for processes that serve many interviews, such as the
+    post-call summary workers.
+    """
 
     chat_model: str = Field(
         default="google_genai:gemini-2.5-flash",
@@ -16,10 +21,138 @@ class Configuration(BaseModel):
         default="google_genai:gemini-2.5-flash-lite",
         description="The name of the language model to use for the guardrails.",
     )
+    guardrail_context_tokens: int = Field(
+        default=1000,
+        description="Tokens of the most recent conversation, speech only, the guardrails read on each candidate turn.",
+    )
+    guardrail_two_stage: bool = Field(
+        default=False,
+        description="Whether the guardrails return only their verdict, and write the response to the candidate only for blocked turns.",
+    )
+    fallback_chat_model: Optional[str] = Field(
+        default=None,
+        description="The name of the language model hedged requests are sent to. Defaults to `chat_model`.",
+    )
+    hedge_requests: bool = Field(
+        default=False,
+        description="Whether to send a duplicate agent model request when the first token is late.",
+    )
+    hedge_percentile: float = Field(
+        default=95.0,
+        description="Percentile of recent first-token latencies after which a request is hedged.",
+    )
+    hedge_control_fraction: float = Field(
+        default=0.05,
+        description="Share of agent model requests that are never hedged, as a latency baseline.",
+    )
+    model_routing: bool = Field(
+        default=False,
+        description="Whether simple agent turns, such as acknowledgements and short answers, are answered by `fast_chat_model`.",
+    )
+    fast_chat_model: Optional[str] = Field(
+        default=None,
+        description="The name of the language model simple turns are routed to. Defaults to `guardrail_model`.",
+    )
+    routing_max_words: int = Field(
+        default=12,
+        description="Candidate turns of at most this many words are routed to `fast_chat_model`.",
+    )
+    routing_fast_phases: str = Field(
+        default="wrap_up",
+        description="Comma-separated interview phases whose candidate turns are all routed to `fast_chat_model`.",
+    )
+    reasoning_mode: Literal["think_tool", "native"] = Field(
+        default="think_tool",
+        description="How the agent reasons: with the `think` and `clear_thoughts` tools, or with the model's built-in thinking (`native`).",
+    )
+    thinking_budget: int = Field(
+        default=256,
+        description="Tokens the agent model may think for on each call in the `native` reasoning mode.",
+    )
+    phase_tools: bool = Field(
+        default=False,
+        description="Whether to offer the model only the tools of the current interview phase.",
+    )
+    tool_timeout: float = Field(
+        default=10.0,
+        description="Seconds a tool call may run before it is answered with an error, unless set in `tool_timeouts`.",
+    )
+    tool_timeouts: str = Field(
+        default="web_search=15",
+        description="Timeouts of single tools in seconds, such as `web_search=15,read_input_file=10`.",
+    )
+    tool_max_workers: int = Field(
+        default=4,
+        description="Threads synchronous tools, such as reading documents, run in, shared by the sessions of a job process.",
+    )
+    post_call_summary: bool = Field(
+        default=False,
+        description="Whether the interview summary is written after the call by the post-call workers instead of by the live agent.",
+    )
+    summary_model: str = Field(
+        default="google_genai:gemini-2.5-flash",
+        description="The name of the language model the post-call workers write summaries with.",
+    )
+    summary_store: str = Field(
+        default="summaries.db",
+        description="The SQLite database interview summaries are stored in.",
+    )
+    fit_profile: bool = Field(
+        default=False,
+        description="Whether the candidate's documents are analysed against the job description once, before the interview, into a profile the agent uses instead of the documents.",
+    )
+    fit_profile_model: str = Field(
+        default="google_genai:gemini-2.5-flash",
+        description="The name of the language model the candidate fit profile is written with.",
+    )
+    interview_plan_cache: str = Field(
+        default="",
+        description="The folder interview plans are cached in, one per job description and role; plans are off when empty.",
+    )
+    interview_plan_model: str = Field(
+        default="google_genai:gemini-2.5-flash",
+        description="The name of the language model interview plans are written with.",
+    )
+    job_description_files: str = Field(
+        default="*.md",
+        description="Glob pattern of the job description documents in the input folder.",
+    )
+    context_cache: bool = Field(
+        default=False,
+        description="Whether the stable prompt prefix of the agent (instructions, phase, interview plan and tools) is sent from Gemini's context cache.",
+    )
+    context_cache_dir: str = Field(
+        default="context-caches",
+        description="The folder the names of the cached prompt prefixes are shared in by the job processes.",
+    )
+    context_cache_ttl: int = Field(
+        default=3600,
+        description="Seconds a cached prompt prefix is kept by Gemini; it is refreshed before it expires.",
+    )
     web_search_model: str = Field(
         default="gemini-2.0-flash",
         description="The name of the language model to use for web search.",
     )
+    gemini_requests_per_minute: int = Field(
+        default=1000,
+        description="Gemini requests per minute shared by every call of a worker.",
+    )
+    gemini_max_concurrency: int = Field(
+        default=32,
+        description="Maximum number of Gemini calls in flight in a worker.",
+    )
+    gemini_max_attempts: int = Field(
+        default=4,
+        description="Attempts per Gemini call on quota and server errors, including the first.",
+    )
+    soft_token_budget: Optional[int] = Field(
+        default=None,
+        description="Tokens per interview after which older tool results are compacted and the agent uses `guardrail_model`.",
+    )
+    hard_token_budget: Optional[int] = Field(
+        default=None,
+        description="Tokens per interview after which web search is disabled and the interview moves to its wrap-up.",
+    )
     interview_duration_minutes: int = Field(
         default=15,
         description="The total duration of the interview in minutes.",
@@ -28,20 +161,9 @@ class Configuration(BaseModel):
         default=5,
         description="Number of minutes before end to show warning.",
     )
-    candidate_name: str = Field(
-        ..., description="The name of the candidate being interviewed."
-    )
-    company_name: str = Field(
-        ..., description="The name of the company conducting the interview."
-    )
-    job_role: str = Field(
-        ..., description="The job role for which the candidate is being interviewed."
-    )
 
     @classmethod
-    def from_runnable_config(
-        cls, config: Optional[RunnableConfig] = None
-    ) -> "Configuration":
+    def from_runnable_config(cls, config: Optional[RunnableConfig] = None) -> Self:
         """Create a Configuration instance from a RunnableConfig."""
         configurable = (
             config["configurable"] if config and "configurable" in config else {}
@@ -57,3 +179,17 @@ class Configuration(BaseModel):
         values = {k: v for k, v in raw_values.items() if v is not None}
 
         return cls(**values)
+
+
+class Configuration(WorkerConfiguration):
+    """The configuration for the agent."""
+
+    candidate_name: str = Field(
+        ..., description="The name of the candidate being interviewed."
+    )
+    company_name: str = Field(
+        ..., description="The name of the company conducting the interview."
+    )
+    job_role: str = Field(
+        ..., description="The job role for which the candidate is being interviewed."
+    )
@@ -1,3 +1,3 @@
-from .pre_model_hook import pre_model_hook
+from .pre_model_hook import create_pre_model_hook, pre_model_hook
 
-__all__ = ["pre_model_hook"]
+__all__ = ["create_pre_model_hook", "pre_model_hook"]
@@ -1,39 +1,146 @@
-from typing import Sequence
+from typing import Any, Optional, Sequence, TypeVar
 
 from langchain_core.language_models import BaseChatModel
-from langchain_core.messages import BaseMessage, get_buffer_string
+from langchain_core.messages import (
+    AIMessage,
+    BaseMessage,
+    HumanMessage,
+    get_buffer_string,
+)
+from langchain_core.messages.utils import count_tokens_approximately
+from pydantic import BaseModel
 
+from hr_screen_agent.profile import FIT_PROFILE_TOOL
 from hr_screen_agent.prompts import (
+    guardrail_redirect_instructions,
     jailbreak_guardrail_instructions,
     relevance_guardrail_instructions,
 )
-from hr_screen_agent.tools_and_schemas import JailbreakOutput, RelevanceOutput
+from hr_screen_agent.telemetry.metrics import GUARDRAIL_DURATION
+from hr_screen_agent.tools_and_schemas import (
+    JailbreakOutput,
+    JailbreakVerdict,
+    RelevanceOutput,
+    RelevanceVerdict,
+)
+
+Verdict = TypeVar("Verdict", bound=BaseModel)
+
+
+def _speech(message: BaseMessage) -> Optional[str]:
+    """What the candidate or the agent said in `message`, as a transcript line."""
+    if isinstance(message, AIMessage):
+        # Guardrail verdicts and the fit profile are added as tool calls
+        if any(
+            call["name"].endswith("guardrail_check") or call["name"] == FIT_PROFILE_TOOL
+            for call in message.tool_calls
+        ):
+            return None
+        text = message.text()
+        return get_buffer_string([AIMessage(content=text)]) if text.strip() else None
+    if isinstance(message, HumanMessage):
+        text = message.text()
+        return get_buffer_string([HumanMessage(content=text)]) if text.strip() else None
+    return None
+
+
+def update_guardrail_transcript(
+    transcript: Optional[dict[str, Any]],
+    messages: Sequence[BaseMessage],
+    max_tokens: int,
+) -> dict[str, Any]:
+    """Bring the guardrails' view of the conversation up to date with `messages`.
+
+    The view only holds what the candidate and the agent said, without tool
+    calls and results such as documents, think logs and timer banners. Only
+    the messages appended since the last update are read, and the oldest
+    lines are dropped beyond `max_tokens`, so a guardrail prompt does not
+    grow with the interview. The latest line is always kept.
+
+    Returns:
+        The view to store in the state: the `lines`, their `tokens`, and the
+        number of messages `seen`.
+    """
+    transcript = transcript or {}
+    seen = transcript.get("seen", 0)
+    lines = list(transcript.get("lines", []))
+    tokens = list(transcript.get("tokens", []))
+    if seen > len(messages):
+        # The history was replaced, start over
+        seen, lines, tokens = 0, [], []
+
+    for message in messages[seen:]:
+        line = _speech(message)
+        if line is not None:
+            lines.append(line)
+            tokens.append(count_tokens_approximately([line]))
+    total = sum(tokens)
+    while len(lines) > 1 and total > max_tokens:
+        lines.pop(0)
+        total -= tokens.pop(0)
+    return {"seen": len(messages), "lines": lines, "tokens": tokens}
+
+
+async def _verdict(
+    llm: BaseChatModel, guardrail: str, schema: type[Verdict], prompt: str
+) -> Verdict:
+    """Ask `llm` for the `guardrail`'s verdict on the latest turn as `schema`."""
+    stage = "full" if "reasoning" in schema.model_fields else "verdict"
+    with GUARDRAIL_DURATION.labels(guardrail=guardrail, stage=stage).time():
+        result = (
+            await llm.with_structured_output(schema)
+            .with_config(
+                run_name=f"{guardrail}_guardrail",
+                metadata={"guardrail": guardrail, "stage": stage},
+            )
+            .ainvoke(prompt)
+        )
+    return schema.model_validate(result)
+
+
+async def _redirect(llm: BaseChatModel, guardrail: str, prompt: str) -> str:
+    """Write the response to a candidate turn the `guardrail` blocked."""
+    with GUARDRAIL_DURATION.labels(guardrail=guardrail, stage="redirect").time():
+        message = await llm.with_config(
+            run_name=f"{guardrail}_guardrail_redirect",
+            metadata={"guardrail": guardrail, "stage": "redirect"},
+        ).ainvoke(f"{prompt}\n\n{guardrail_redirect_instructions}")
+    return message.text().strip()
 
 
 async def relevance_guardrail(
-    llm: BaseChatModel, messages: Sequence[BaseMessage]
+    llm: BaseChatModel, chat_history: str, two_stage: bool = False
 ) -> RelevanceOutput:
-    """Guardrail to check if the action is relevant to the query."""
+    """Guardrail to check if the action is relevant to the query.
 
-    result = await llm.with_structured_output(RelevanceOutput).ainvoke(
-        relevance_guardrail_instructions.format(
-            chat_history=get_buffer_string(messages)
-        )
-    )
+    With `two_stage`, the model returns only the verdict, and the response
+    to the candidate is written in a second call for irrelevant turns only.
+    """
+    prompt = relevance_guardrail_instructions.format(chat_history=chat_history)
+    if not two_stage:
+        return await _verdict(llm, "relevance", RelevanceOutput, prompt)
 
-    return RelevanceOutput.model_validate(result)
+    verdict = await _verdict(llm, "relevance", RelevanceVerdict, prompt)
+    if verdict.is_relevant:
+        return RelevanceOutput(reasoning="", is_relevant=True)
+    reasoning = await _redirect(llm, "relevance", prompt)
+    return RelevanceOutput(reasoning=reasoning, is_relevant=False)
 
 
 async def jailbreak_guardrail(
-    llm: BaseChatModel, messages: Sequence[BaseMessage]
+    llm: BaseChatModel, chat_history: str, two_stage: bool = False
 ) -> JailbreakOutput:
-    """Guardrail to prevent jailbreak attempts."""
+    """Guardrail to prevent jailbreak attempts.
 
-    result = await llm.with_structured_output(JailbreakOutput).ainvoke(
-        jailbreak_guardrail_instructions.format(
-            chat_history=get_buffer_string(messages)
-        )
-    )
+    With `two_stage`, the model returns only the verdict, and the response
+    to the candidate is written in a second call for blocked turns only.
+    """
+    prompt = jailbreak_guardrail_instructions.format(chat_history=chat_history)
+    if not two_stage:
+        return await _verdict(llm, "jailbreak", JailbreakOutput, prompt)
 
-    # Ensure we return the correct type
-    return JailbreakOutput.model_validate(result)
+    verdict = await _verdict(llm, "jailbreak", JailbreakVerdict, prompt)
+    if verdict.is_safe:
+        return JailbreakOutput(reasoning="", is_safe=True)
+    reasoning = await _redirect(llm, "jailbreak", prompt)
+    return JailbreakOutput(reasoning=reasoning, is_safe=False)
@@ -1,61 +1,156 @@
+import asyncio
 import uuid
+from typing import Any, Awaitable, Callable, Optional
 
 from langchain.chat_models import init_chat_model
+from langchain_core.language_models import BaseChatModel
 from langchain_core.messages import AIMessage, BaseMessage, HumanMessage, ToolMessage
 from langchain_core.runnables import RunnableConfig
 from langgraph.types import Command
 
+from hr_screen_agent.budget import track_usage, usage_snapshot
 from hr_screen_agent.configuration import Configuration
 from hr_screen_agent.hooks.guardrail import (
     jailbreak_guardrail,
     relevance_guardrail,
+    update_guardrail_transcript,
 )
+from hr_screen_agent.llm import Priority, governed
+from hr_screen_agent.phases import InterviewPhase, advance_phase
+from hr_screen_agent.preparation import prepared
+from hr_screen_agent.profile import fit_profile_messages
 from hr_screen_agent.state import HrScreenAgentState
 
 
-async def pre_model_hook(
-    state: HrScreenAgentState,
-    config: RunnableConfig,
-) -> Command:
-    state = state.copy()
-    messages = state["messages"]
-
-    # skip guardrails if the last message is not a user message
-    if not isinstance(messages[-1], HumanMessage):
-        return Command(graph=None, goto="agent")
-
-    configure = Configuration.from_runnable_config(config)
-    llm = init_chat_model(configure.guardrail_model)
-    # send the last 3 messages to the guardrails
-    last_messages = messages[-15:] if len(messages) >= 15 else messages
-
-    # Check jailbreak guardrail
-    jailbreak_result = await jailbreak_guardrail(llm, last_messages)
-    if not jailbreak_result.is_safe:
-        return Command(
-            graph=None,
-            goto="agent",
-            update={
-                "messages": _generate_tool_call_messages(
-                    name="jailbreak guardrail_check", content=jailbreak_result.reasoning
-                )
-            },
+def create_pre_model_hook(
+    guardrail_model: Optional[BaseChatModel] = None,
+) -> Callable[[HrScreenAgentState, RunnableConfig], Awaitable[Command]]:
+    """Create the pre-model hook that runs the guardrails on each user turn.
+
+    On the first step of an interview it also adds the role's interview
+    plan and the candidate fit profile prepared at dispatch (see
+    `start_preparation`), so the agent starts with them instead of reading
+    the documents and researching the company.
+
+    Args:
+        guardrail_model: Chat model to use instead of the configured `guardrail_model`
+
+    Returns:
+        The pre-model hook to pass to the agent graph.
+    """
+
+    async def pre_model_hook(
+        state: HrScreenAgentState,
+        config: RunnableConfig,
+    ) -> Command:
+        state = state.copy()
+        messages = state["messages"]
+        # Usage first: the phase depends on the token budget
+        update = track_usage(state, config)
+        update.update(advance_phase(state, config))
+        configure = Configuration.from_runnable_config(config)
+        thread_id = (config.get("configurable") or {}).get("thread_id")
+
+        # The role's plan and the candidate's profile, prepared once per interview
+        preparation: dict[str, Awaitable[dict[str, Any]]] = {}
+        if _needs_interview_plan(state, update, configure):
+            preparation["interview_plan"] = prepared(thread_id, "interview_plan")
+        if _needs_fit_profile(state, update, configure):
+            preparation["fit_profile"] = prepared(thread_id, "fit_profile")
+        # Empty when they were not or could not be written, so they are not retried
+        update.update(
+            zip(preparation, await asyncio.gather(*preparation.values()), strict=True)
+        )
+        # The plan is part of the system prompt, the profile of the conversation
+        prepared_messages: list[BaseMessage] = []
+        if update.get("fit_profile") and "fit_profile" in preparation:
+            prepared_messages = fit_profile_messages(update["fit_profile"])
+
+        def route(new_messages: Optional[list[BaseMessage]] = None) -> Command:
+            new_messages = [*prepared_messages, *(new_messages or [])]
+            # Taken last, so the usage includes this step's guardrail calls
+            routed = {**update, **usage_snapshot(config)}
+            if new_messages:
+                routed["messages"] = new_messages
+                if "llm_input_messages" in routed:
+                    routed["llm_input_messages"] = [
+                        *routed["llm_input_messages"],
+                        *new_messages,
+                    ]
+            return Command(graph=None, goto="agent", update=routed)
+
+        # skip guardrails if the last message is not a user message
+        if not isinstance(messages[-1], HumanMessage):
+            return route()
+
+        llm = governed(
+            guardrail_model
+            or init_chat_model(configure.guardrail_model, max_retries=1),
+            Priority.GUARDRAIL,
+            "guardrail",
+        )
+        # The guardrails only read the recent speech, not documents or tool logs
+        transcript = update_guardrail_transcript(
+            state.get("guardrail_transcript"),
+            messages,
+            configure.guardrail_context_tokens,
         )
+        update["guardrail_transcript"] = transcript
+        chat_history = "\n".join(transcript["lines"])
 
-    # Check relevance guardrail
-    relevance_result = await relevance_guardrail(llm, last_messages)
-    if not relevance_result.is_relevant:
-        return Command(
-            graph=None,
-            goto="agent",
-            update={
-                "messages": _generate_tool_call_messages(
-                    name="relevance guardrail_check", content=relevance_result.reasoning
+        # Check jailbreak guardrail
+        jailbreak_result = await jailbreak_guardrail(
+            llm, chat_history, configure.guardrail_two_stage
+        )
+        if not jailbreak_result.is_safe:
+            return route(
+                _generate_tool_call_messages(
+                    name="jailbreak guardrail_check",
+                    content=jailbreak_result.reasoning,
                 )
-            },
+            )
+
+        # Check relevance guardrail
+        relevance_result = await relevance_guardrail(
+            llm, chat_history, configure.guardrail_two_stage
         )
+        if not relevance_result.is_relevant:
+            return route(
+                _generate_tool_call_messages(
+                    name="relevance guardrail_check",
+                    content=relevance_result.reasoning,
+                )
+            )
+
+        return route()
+
+    return pre_model_hook
+
+
+pre_model_hook = create_pre_model_hook()
+
+
+def _needs_interview_plan(
+    state: HrScreenAgentState, update: dict, configure: Configuration
+) -> bool:
+    """Whether the plan is still to be loaded, at the start of the interview."""
+    if not configure.interview_plan_cache or state.get("interview_plan") is not None:
+        return False
+    return update.get("phase") == InterviewPhase.PREPARATION.value
+
 
-    return Command(graph=None, goto="agent")
+def _needs_fit_profile(
+    state: HrScreenAgentState, update: dict, configure: Configuration
+) -> bool:
+    """Whether the profile is still to be added, before the documents are read."""
+    if not configure.fit_profile or state.get("fit_profile") is not None:
+        return False
+    if update.get("phase") != InterviewPhase.PREPARATION.value:
+        return False
+    return not any(
+        isinstance(m, ToolMessage) and m.name == "read_input_file"
+        for m in state["messages"]
+    )
 
 
 def _generate_tool_call_messages(name: str, content: str) -> list[BaseMessage]:
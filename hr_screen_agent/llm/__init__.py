@@ -0,0 +1,44 @@
+from .base import DELEGATE_TAG
+from .budgeted import BudgetedChatModel
+from .context_cache import (
+    CachedPrefix,
+    ContextCachedChatModel,
+    ContextCacheProvider,
+    ContextCacheRegistry,
+    GeminiContextCache,
+)
+from .governor import (
+    GeminiGovernor,
+    GovernedChatModel,
+    Priority,
+    SharedBudget,
+    TokenBucket,
+    get_governor,
+    governed,
+)
+from .hedging import HedgedChatModel
+from .phased import PhasedChatModel, message_phase, phase_message_id
+from .routed import RoutedChatModel, RoutingPolicy
+
+__all__ = [
+    "BudgetedChatModel",
+    "CachedPrefix",
+    "ContextCacheProvider",
+    "ContextCacheRegistry",
+    "ContextCachedChatModel",
+    "DELEGATE_TAG",
+    "GeminiContextCache",
+    "GeminiGovernor",
+    "GovernedChatModel",
+    "HedgedChatModel",
+    "PhasedChatModel",
+    "Priority",
+    "RoutedChatModel",
+    "RoutingPolicy",
+    "SharedBudget",
+    "TokenBucket",
+    "get_governor",
+    "governed",
+    "message_phase",
+    "phase_message_id",
+]
@@ -0,0 +1,45 @@
+from typing import Any, Optional
+
+from langchain_core.callbacks import (
+    AsyncCallbackManager,
+    AsyncCallbackManagerForLLMRun,
+    CallbackManager,
+    CallbackManagerForLLMRun,
+)
+from langchain_core.messages import AIMessageChunk, BaseMessage
+from langchain_core.runnables import RunnableConfig
+from langgraph.constants import TAG_NOSTREAM
+
+# Tag set on the runs of a wrapped model, so tracing only counts the outer call
+DELEGATE_TAG = "hr_screen:delegate"
+
+
+def delegate_config(
+    run_manager: Optional[CallbackManagerForLLMRun | AsyncCallbackManagerForLLMRun],
+    **metadata: Any,
+) -> RunnableConfig:
+    """Build the config for calling a wrapped model from inside a wrapper's run.
+
+    The wrapped call is a child run of the wrapper. It is tagged so tracing
+    skips it and LangGraph does not stream its tokens a second time.
+    """
+    if run_manager is None:
+        return {"metadata": metadata}
+    manager_cls = (
+        AsyncCallbackManager
+        if isinstance(run_manager, AsyncCallbackManagerForLLMRun)
+        else CallbackManager
+    )
+    manager = manager_cls(handlers=[], parent_run_id=run_manager.run_id)
+    manager.set_handlers(run_manager.inheritable_handlers)
+    manager.add_tags(run_manager.inheritable_tags)
+    manager.add_metadata(run_manager.inheritable_metadata)
+    manager.add_tags([DELEGATE_TAG, TAG_NOSTREAM], inherit=False)
+    return {"callbacks": manager, "metadata": metadata}
+
+
+def as_message_chunk(message: BaseMessage) -> AIMessageChunk:
+    """Convert a message returned by a wrapped model into a streamable chunk."""
+    if isinstance(message, AIMessageChunk):
+        return message
+    return AIMessageChunk(**message.model_dump(exclude={"type"}))
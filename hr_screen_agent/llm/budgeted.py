@@ -0,0 +1,85 @@
+from typing import Any, AsyncIterator, Optional, Sequence
+
+from langchain_core.callbacks import (
+    AsyncCallbackManagerForLLMRun,
+    CallbackManagerForLLMRun,
+)
+from langchain_core.language_models import BaseChatModel, LanguageModelInput
+from langchain_core.messages import BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+from langchain_core.runnables import Runnable
+
+from hr_screen_agent.llm.base import as_message_chunk, delegate_config
+from hr_screen_agent.telemetry.usage import get_usage_ledger
+
+
+class BudgetedChatModel(BaseChatModel):
+    """Chat model that moves a thread to a cheaper model at its soft token budget.
+
+    Calls use `inner` until the thread of the run (its `thread_id` metadata)
+    has used `soft_budget` tokens according to the usage ledger, and
+    `economy` from then on.
+    """
+
+    inner: Runnable[LanguageModelInput, BaseMessage]
+    economy: Runnable[LanguageModelInput, BaseMessage]
+    soft_budget: int
+
+    @property
+    def _llm_type(self) -> str:
+        return "budgeted"
+
+    def bind_tools(
+        self, tools: Sequence[Any], **kwargs: Any
+    ) -> Runnable[LanguageModelInput, BaseMessage]:
+        return self.model_copy(
+            update={
+                "inner": self.inner.bind_tools(tools, **kwargs),  # type: ignore[attr-defined]
+                "economy": self.economy.bind_tools(tools, **kwargs),  # type: ignore[attr-defined]
+            }
+        )
+
+    def _model_for(
+        self,
+        run_manager: Optional[CallbackManagerForLLMRun | AsyncCallbackManagerForLLMRun],
+    ) -> Runnable[LanguageModelInput, BaseMessage]:
+        thread_id = (run_manager.metadata if run_manager else {}).get("thread_id")
+        if get_usage_ledger().total_tokens(thread_id) >= self.soft_budget:
+            return self.economy
+        return self.inner
+
+    def _generate(
+        self,
+        messages: list[BaseMessage],
+        stop: Optional[list[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        message = self._model_for(run_manager).invoke(
+            messages, delegate_config(run_manager), stop=stop, **kwargs
+        )
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    async def _agenerate(
+        self,
+        messages: list[BaseMessage],
+        stop: Optional[list[str]] = None,
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        message = await self._model_for(run_manager).ainvoke(
+            messages, delegate_config(run_manager), stop=stop, **kwargs
+        )
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    async def _astream(
+        self,
+        messages: list[BaseMessage],
+        stop: Optional[list[str]] = None,
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> AsyncIterator[ChatGenerationChunk]:
+        async for chunk in self._model_for(run_manager).astream(
+            messages, delegate_config(run_manager), stop=stop, **kwargs
+        ):
+            yield ChatGenerationChunk(message=as_message_chunk(chunk))
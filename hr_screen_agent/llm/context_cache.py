@@ -0,0 +1,300 @@
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import time
+from collections import defaultdict
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, AsyncIterator, Optional, Protocol, Sequence
+
+from langchain_core.callbacks import (
+    AsyncCallbackManagerForLLMRun,
+    CallbackManagerForLLMRun,
+)
+from langchain_core.language_models import BaseChatModel, LanguageModelInput
+from langchain_core.messages import BaseMessage, HumanMessage, SystemMessage
+from langchain_core.messages.utils import count_tokens_approximately
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+from langchain_core.runnables import Runnable
+from langchain_core.utils.function_calling import convert_to_openai_tool
+from pydantic import Field
+
+from hr_screen_agent.llm.base import as_message_chunk, delegate_config
+from hr_screen_agent.telemetry.metrics import CONTEXT_CACHE_LOOKUPS
+
+logger = logging.getLogger("vocalize-hr-screen-agent")
+
+
+@dataclass
+class CachedPrefix:
+    """A prompt prefix registered with the provider, until `expires_at` (epoch seconds)."""
+
+    name: str
+    expires_at: float
+
+
+class ContextCacheProvider(Protocol):
+    """Explicit context caches of a model provider."""
+
+    async def create(
+        self,
+        model: str,
+        system: str,
+        tools: Sequence[dict[str, Any]],
+        ttl: float,
+    ) -> CachedPrefix: ...
+
+    async def refresh(self, name: str, ttl: float) -> CachedPrefix: ...
+
+
+class GeminiContextCache:
+    """Explicit context caches of the Gemini API.
+
+    A cache holds the system instruction and the tool declarations, which
+    Gemini does not accept next to `cached_content` in a request.
+    """
+
+    async def create(
+        self,
+        model: str,
+        system: str,
+        tools: Sequence[dict[str, Any]],
+        ttl: float,
+    ) -> CachedPrefix:
+        from google.genai import types
+
+        from hr_screen_agent.tools.web_search import get_genai_client
+
+        declarations = [
+            types.FunctionDeclaration(
+                name=tool["function"]["name"],
+                description=tool["function"].get("description"),
+                parameters_json_schema=tool["function"].get("parameters"),
+            )
+            for tool in tools
+        ]
+        cache = await get_genai_client().aio.caches.create(
+            model=model,
+            config=types.CreateCachedContentConfig(
+                display_name="hr-screen-agent",
+                system_instruction=system,
+                tools=[types.Tool(function_declarations=declarations)]
+                if declarations
+                else None,
+                ttl=f"{int(ttl)}s",
+            ),
+        )
+        return CachedPrefix(cache.name, cache.expire_time.timestamp())
+
+    async def refresh(self, name: str, ttl: float) -> CachedPrefix:
+        from google.genai import types
+
+        from hr_screen_agent.tools.web_search import get_genai_client
+
+        cache = await get_genai_client().aio.caches.update(
+            name=name, config=types.UpdateCachedContentConfig(ttl=f"{int(ttl)}s")
+        )
+        return CachedPrefix(cache.name, cache.expire_time.timestamp())
+
+
+class ContextCacheRegistry:
+    """The cached prefixes of this worker, shared by its job processes.
+
+    Each prefix is stored as a JSON file named by its key, with the name the
+    provider gave it and its expiry, so every job process uses the same
+    cache. A prefix that expires within `refresh_margin` seconds is extended
+    by another `ttl`, or created again once it has expired. When the provider
+    refuses a prefix, e.g. because it is below its minimum size, the calls
+    go uncached for `retry_after` seconds. The files are only read when the
+    entry in memory is missing or about to expire, and are read and written
+    off the event loop.
+    """
+
+    def __init__(
+        self,
+        directory: str | os.PathLike[str],
+        *,
+        ttl: float = 3600,
+        refresh_margin: float = 300,
+        retry_after: float = 600,
+    ) -> None:
+        self.directory = Path(directory)
+        self.ttl = ttl
+        self.refresh_margin = refresh_margin
+        self.retry_after = retry_after
+        self._entries: dict[str, CachedPrefix] = {}
+        self._failed: dict[str, float] = {}
+        self._locks: defaultdict[str, asyncio.Lock] = defaultdict(asyncio.Lock)
+
+    async def get(
+        self,
+        provider: ContextCacheProvider,
+        model: str,
+        system: str,
+        tools: Sequence[dict[str, Any]],
+    ) -> Optional[str]:
+        """Return the name of the cached prefix, registering it if needed."""
+        key = hashlib.sha256(
+            json.dumps(
+                {"model": model, "system": system, "tools": list(tools)},
+                sort_keys=True,
+                default=str,
+            ).encode()
+        ).hexdigest()
+        if self._failed.get(key, 0.0) > time.time():
+            return None
+
+        async with self._locks[key]:
+            now = time.time()
+            entry = self._entries.get(key)
+            if entry is None or entry.expires_at - now <= self.refresh_margin:
+                # Another job process may have registered or refreshed it
+                entry = await asyncio.to_thread(self._read, key) or entry
+            if entry is not None and entry.expires_at - now > self.refresh_margin:
+                self._entries[key] = entry
+                CONTEXT_CACHE_LOOKUPS.labels(result="hit").inc()
+                return entry.name
+
+            try:
+                if entry is not None and entry.expires_at > now:
+                    entry = await provider.refresh(entry.name, self.ttl)
+                    result = "refreshed"
+                else:
+                    entry = await provider.create(model, system, tools, self.ttl)
+                    result = "created"
+            except Exception:
+                logger.warning("Failed to cache the prompt prefix", exc_info=True)
+                self._failed[key] = now + self.retry_after
+                CONTEXT_CACHE_LOOKUPS.labels(result="error").inc()
+                return None
+            self._entries[key] = entry
+            await asyncio.to_thread(self._write, key, entry)
+            CONTEXT_CACHE_LOOKUPS.labels(result=result).inc()
+            return entry.name
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}.json"
+
+    def _read(self, key: str) -> Optional[CachedPrefix]:
+        try:
+            return CachedPrefix(**json.loads(self._path(key).read_text()))
+        except (FileNotFoundError, json.JSONDecodeError, TypeError):
+            return None
+
+    def _write(self, key: str, entry: CachedPrefix) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(asdict(entry), f)
+            os.replace(tmp, self._path(key))
+        except BaseException:
+            Path(tmp).unlink(missing_ok=True)
+            raise
+
+
+class ContextCachedChatModel(BaseChatModel):
+    """Chat model that sends its stable prompt prefix from the provider's cache.
+
+    The prefix is the leading system message, which holds the instructions,
+    the phase and the role's interview plan, together with the bound tools.
+    It is the same for every candidate for a role, and is registered once
+    with the provider through the `registry`. Calls then send only the rest
+    of the conversation with the name of the cache. System messages after
+    the prefix, such as the candidate's name and the current time, are sent
+    as the first user turn. Prefixes shorter than `min_tokens`, and calls
+    whose prefix cannot be cached, are sent in full.
+    """
+
+    inner: BaseChatModel
+    provider: Any
+    registry: Any
+    min_tokens: int = 1024
+    tools: list[dict[str, Any]] = Field(default_factory=list)
+    bound: Optional[Runnable[LanguageModelInput, BaseMessage]] = None
+
+    @property
+    def _llm_type(self) -> str:
+        return "context-cached"
+
+    def bind_tools(
+        self, tools: Sequence[Any], **kwargs: Any
+    ) -> Runnable[LanguageModelInput, BaseMessage]:
+        bound = self.inner.bind_tools(tools, **kwargs)
+        if kwargs:
+            # A tool choice can not be sent next to a cache, send it uncached
+            return bound
+        return self.model_copy(
+            update={
+                "tools": [convert_to_openai_tool(t) for t in tools],
+                "bound": bound,
+            }
+        )
+
+    async def _prepare(
+        self, messages: list[BaseMessage]
+    ) -> tuple[Runnable[LanguageModelInput, BaseMessage], list[BaseMessage], dict]:
+        uncached = (self.bound or self.inner, messages, {})
+        if not messages or not isinstance(messages[0], SystemMessage):
+            return uncached
+        system = messages[0].text()
+        if (
+            count_tokens_approximately([messages[0]])
+            + sum(len(json.dumps(t)) // 4 for t in self.tools)
+            < self.min_tokens
+        ):
+            return uncached
+
+        model = getattr(self.inner, "model", None) or getattr(
+            self.inner, "model_name", ""
+        )
+        name = await self.registry.get(self.provider, model, system, self.tools)
+        if name is None:
+            return uncached
+        rest = [
+            HumanMessage(content=m.content) if isinstance(m, SystemMessage) else m
+            for m in messages[1:]
+        ]
+        return self.inner, rest, {"cached_content": name}
+
+    def _generate(
+        self,
+        messages: list[BaseMessage],
+        stop: Optional[list[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        # Registering a prefix is async, synchronous calls are sent in full
+        message = (self.bound or self.inner).invoke(
+            messages, delegate_config(run_manager), stop=stop, **kwargs
+        )
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    async def _agenerate(
+        self,
+        messages: list[BaseMessage],
+        stop: Optional[list[str]] = None,
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        model, messages, cache = await self._prepare(messages)
+        message = await model.ainvoke(
+            messages, delegate_config(run_manager), stop=stop, **cache, **kwargs
+        )
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    async def _astream(
+        self,
+        messages: list[BaseMessage],
+        stop: Optional[list[str]] = None,
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> AsyncIterator[ChatGenerationChunk]:
+        model, messages, cache = await self._prepare(messages)
+        async for chunk in model.astream(
+            messages, delegate_config(run_manager), stop=stop, **cache, **kwargs
+        ):
+            yield ChatGenerationChunk(message=as_message_chunk(chunk))
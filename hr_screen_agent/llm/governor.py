@@ -0,0 +1,615 @@
+import asyncio
+import fcntl
+import functools
+import heapq
+import itertools
+import json
+import logging
+import os
+import random
+import time
+from contextlib import asynccontextmanager, contextmanager
+from dataclasses import dataclass
+from enum import IntEnum
+from pathlib import Path
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Iterator,
+    Optional,
+    Sequence,
+    TypeVar,
+)
+
+from langchain_core.callbacks import (
+    AsyncCallbackManagerForLLMRun,
+    CallbackManagerForLLMRun,
+)
+from langchain_core.language_models import BaseChatModel, LanguageModelInput
+from langchain_core.messages import BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+from langchain_core.runnables import Runnable
+
+from hr_screen_agent.configuration import WorkerConfiguration
+from hr_screen_agent.llm.base import as_message_chunk, delegate_config
+from hr_screen_agent.telemetry.metrics import (
+    GOVERNOR_INFLIGHT,
+    GOVERNOR_QUEUE_DELAY,
+    GOVERNOR_QUEUED,
+    GOVERNOR_RETRIES,
+)
+from hr_screen_agent.telemetry.usage import (
+    cached_tokens,
+    get_usage_ledger,
+    message_usage,
+)
+
+logger = logging.getLogger("vocalize-hr-screen-agent")
+
+T = TypeVar("T")
+
+# Directory shared by the job processes of a worker, so they draw from one budget
+GOVERNOR_DIR_ENV = "GEMINI_GOVERNOR_DIR"
+
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+
+# Seconds between looks at the state of the other job processes while waiting
+SHARED_POLL_INTERVAL = 0.05
+
+
+class Priority(IntEnum):
+    """Priority of a Gemini call, lower values are served first."""
+
+    AGENT = 0
+    TOOL = 1
+    GUARDRAIL = 2
+    BACKGROUND = 3
+
+
+# Share of the request budget and of the concurrency slots a priority must
+# leave free, so lower priorities can never starve the user-facing agent call.
+_RESERVE = {
+    Priority.AGENT: 0.0,
+    Priority.TOOL: 0.1,
+    Priority.GUARDRAIL: 0.2,
+    Priority.BACKGROUND: 0.5,
+}
+
+
+class TokenBucket:
+    """Request budget and concurrency limit for the Gemini calls of a process.
+
+    Every method runs on the event loop and never blocks. Without a `shared`
+    budget the bucket refills at `requests_per_minute`. With one, it only
+    holds the requests the governor reserved from the budget of every job
+    process of the worker (see `SharedBudget`), and counts the calls other
+    processes had in flight at the last reservation.
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: float,
+        max_concurrency: int,
+        shared: Optional["SharedBudget"] = None,
+    ) -> None:
+        self.rate = requests_per_minute / 60
+        self.capacity = max(1.0, self.rate)  # allow bursts of up to a second
+        self.max_concurrency = max_concurrency
+        self.shared = shared
+        self.tokens = 0.0 if shared is not None else self.capacity
+        self.updated = time.time()
+        self.cooldown_until = 0.0
+        self.inflight = 0
+        self.remote_inflight = 0
+
+    def try_acquire(self, priority: Priority) -> float:
+        """Take a request slot, or return how many seconds to wait before retrying."""
+        reserve = _RESERVE[priority]
+        now = time.time()
+        if self.shared is None:
+            self.tokens = min(
+                self.capacity, self.tokens + max(0.0, now - self.updated) * self.rate
+            )
+            self.updated = now
+        if now < self.cooldown_until:
+            return self.cooldown_until - now
+
+        inflight = self.inflight + self.remote_inflight
+        if inflight >= self.max_concurrency * (1 - reserve):
+            # Freed by a release in this process, polled for other processes
+            return SHARED_POLL_INTERVAL
+
+        # The shared budget keeps the reserve when requests are reserved
+        needed = 1 + (reserve * self.capacity if self.shared is None else 0)
+        if self.tokens < needed:
+            if self.shared is not None:
+                return SHARED_POLL_INTERVAL
+            return (needed - self.tokens) / self.rate
+
+        self.tokens -= 1
+        self.inflight += 1
+        return 0.0
+
+    def release(self) -> None:
+        self.inflight = max(0, self.inflight - 1)
+
+    def cool_down(self, seconds: float) -> None:
+        """Pause all calls, e.g. after Gemini answered with a quota error."""
+        self.cooldown_until = max(self.cooldown_until, time.time() + seconds)
+
+
+@dataclass
+class Reservation:
+    """Requests granted from a `SharedBudget`, with the state of the other processes."""
+
+    granted: int
+    # Seconds until the budget can grant another request
+    retry_in: float
+    remote_inflight: int
+    cooldown_until: float
+
+
+class SharedBudget:
+    """Request budget shared by the job processes of a worker through a file.
+
+    Each call locks, reads and rewrites the file, so the governor only calls
+    it off the event loop, and reserves requests in batches.
+    """
+
+    def __init__(
+        self, state_file: Path, requests_per_minute: float, batch: int = 4
+    ) -> None:
+        self.state_file = state_file
+        self.rate = requests_per_minute / 60
+        self.capacity = max(1.0, self.rate)
+        self.batch = batch
+
+    def _initial_state(self) -> dict[str, Any]:
+        return {
+            "tokens": self.capacity,
+            "updated": time.time(),
+            "cooldown_until": 0.0,
+            "inflight": {},
+        }
+
+    @contextmanager
+    def _locked(self) -> Iterator[dict[str, Any]]:
+        self.state_file.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.state_file, "a+") as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                f.seek(0)
+                raw = f.read()
+                state = json.loads(raw) if raw else self._initial_state()
+                # Slots held by job processes that exited are freed
+                state["inflight"] = {
+                    pid: count
+                    for pid, count in state["inflight"].items()
+                    if count > 0 and _pid_alive(int(pid))
+                }
+                yield state
+                f.seek(0)
+                f.truncate()
+                f.write(json.dumps(state))
+                f.flush()  # before the lock is released
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+    def reserve(
+        self,
+        priority: Priority,
+        wanted: bool,
+        inflight: int,
+        cooldown_until: float,
+    ) -> Reservation:
+        """Reserve a batch of requests if `wanted`, and exchange the process state.
+
+        The calls this process has in flight and its cooldown, e.g. after a
+        quota error, are published to the other processes.
+        """
+        reserve = _RESERVE[priority]
+        now = time.time()
+        with self._locked() as state:
+            state["tokens"] = min(
+                self.capacity,
+                state["tokens"] + max(0.0, now - state["updated"]) * self.rate,
+            )
+            state["updated"] = now
+            state["cooldown_until"] = max(state["cooldown_until"], cooldown_until)
+            pid = str(os.getpid())
+            state["inflight"][pid] = inflight
+            remote_inflight = sum(
+                count for other, count in state["inflight"].items() if other != pid
+            )
+
+            granted = 0
+            # Lower priorities leave part of the budget for the agent
+            available = state["tokens"] - reserve * self.capacity
+            if wanted and now >= state["cooldown_until"]:
+                granted = max(0, min(self.batch, int(available)))
+                state["tokens"] -= granted
+            return Reservation(
+                granted=granted,
+                retry_in=max(0.0, (1 - available) / self.rate) if wanted else 0.0,
+                remote_inflight=remote_inflight,
+                cooldown_until=state["cooldown_until"],
+            )
+
+
+class GeminiGovernor:
+    """Process-wide scheduler for every Gemini call.
+
+    Calls wait in a priority queue for a slot from the `TokenBucket`,
+    and retryable errors (quota and server errors) are retried here with
+    jittered exponential backoff instead of inside each client. A quota error
+    pauses every caller, so concurrent sessions do not start a retry storm.
+    """
+
+    def __init__(
+        self,
+        bucket: TokenBucket,
+        max_attempts: int = 4,
+        base_backoff: float = 1.0,
+        max_backoff: float = 20.0,
+    ) -> None:
+        self.bucket = bucket
+        self.max_attempts = max_attempts
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self._waiters: list[tuple[Priority, int, asyncio.Future]] = []
+        self._seq = itertools.count()
+        self._timer: Optional[asyncio.TimerHandle] = None
+        # The event loop the timer, the exchange and the queued calls belong to
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        # Exchange with the shared budget running in a thread, and when the next may start
+        self._exchange: Optional[asyncio.Task] = None
+        self._next_exchange = 0.0
+        self._published_inflight = 0
+
+    @asynccontextmanager
+    async def slot(self, priority: Priority, caller: str) -> AsyncIterator[None]:
+        """Hold a request slot for the duration of the block."""
+        await self._acquire(priority, caller)
+        GOVERNOR_INFLIGHT.inc()
+        try:
+            yield
+        finally:
+            GOVERNOR_INFLIGHT.dec()
+            self._release()
+
+    async def call(
+        self,
+        priority: Priority,
+        caller: str,
+        fn: Callable[[], Awaitable[T]],
+    ) -> T:
+        """Run `fn` in a slot, retrying retryable errors."""
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                async with self.slot(priority, caller):
+                    return await fn()
+            except Exception as e:
+                await self._backoff(e, attempt, caller)
+
+    async def stream(
+        self,
+        priority: Priority,
+        caller: str,
+        fn: Callable[[], AsyncIterator[T]],
+    ) -> AsyncIterator[T]:
+        """Stream `fn` in a slot, retrying errors raised before the first chunk."""
+        attempt = 0
+        while True:
+            attempt += 1
+            started = False
+            try:
+                async with self.slot(priority, caller):
+                    async for item in fn():
+                        started = True
+                        yield item
+                return
+            except Exception as e:
+                if started:
+                    raise
+                await self._backoff(e, attempt, caller)
+
+    async def _backoff(self, error: Exception, attempt: int, caller: str) -> None:
+        code = _status_code(error)
+        if code not in RETRYABLE_STATUS_CODES or attempt >= self.max_attempts:
+            raise error
+        delay = random.uniform(
+            0, min(self.max_backoff, self.base_backoff * 2 ** (attempt - 1))
+        )
+        if code == 429:
+            self.bucket.cool_down(delay)
+            self._publish()
+        GOVERNOR_RETRIES.labels(caller=caller, status=str(code)).inc()
+        await asyncio.sleep(delay)
+
+    def _bind_loop(self) -> asyncio.AbstractEventLoop:
+        """Drop the timer, the exchange and the queued calls of a previous event loop.
+
+        The governor is shared by the whole process, but every `asyncio.run`,
+        as in the benchmarks and the tests, starts a new loop, and a timer of
+        a loop that has stopped never fires.
+        """
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            self._loop = loop
+            self._timer = None
+            self._exchange = None
+            self._next_exchange = 0.0
+            self._waiters = []
+        return loop
+
+    async def _acquire(self, priority: Priority, caller: str) -> None:
+        future = self._bind_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._seq), future))
+        GOVERNOR_QUEUED.inc()
+        enqueued = time.perf_counter()
+        try:
+            self._dispatch()
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                self._release()
+            raise
+        finally:
+            GOVERNOR_QUEUED.dec()
+        GOVERNOR_QUEUE_DELAY.labels(
+            caller=caller, priority=priority.name.lower()
+        ).observe(time.perf_counter() - enqueued)
+
+    def _release(self) -> None:
+        self.bucket.release()
+        self._publish()
+        self._dispatch()
+
+    def _dispatch(self) -> None:
+        while self._waiters:
+            priority, _, future = self._waiters[0]
+            if future.done():  # cancelled while queued
+                heapq.heappop(self._waiters)
+                continue
+            wait = self.bucket.try_acquire(priority)
+            if wait > 0:
+                if self.bucket.shared is not None:
+                    wait = self._reserve(priority, wait)
+                self._wake_in(wait)
+                return
+            heapq.heappop(self._waiters)
+            future.set_result(None)
+
+    def _reserve(self, priority: Priority, wait: float) -> float:
+        """Reserve requests from the shared budget, return when to dispatch again."""
+        loop = asyncio.get_running_loop()
+        if self._exchange is None and loop.time() >= self._next_exchange:
+            self._exchange = loop.create_task(self._exchange_state(priority))
+            return wait
+        return max(wait, self._next_exchange - loop.time())
+
+    def _publish(self) -> None:
+        """Publish the calls in flight and the cooldown of this process to the others."""
+        if (
+            self.bucket.shared is not None
+            and self._exchange is None
+            and self.bucket.inflight != self._published_inflight
+        ):
+            self._exchange = asyncio.get_running_loop().create_task(
+                self._exchange_state(None)
+            )
+
+    async def _exchange_state(self, priority: Optional[Priority]) -> None:
+        """Exchange state with the shared budget in a thread, off the event loop.
+
+        With a `priority`, a batch of requests is reserved for the waiting
+        calls when the bucket has none left.
+        """
+        bucket = self.bucket
+        assert bucket.shared is not None
+        loop = asyncio.get_running_loop()
+        inflight = bucket.inflight
+        try:
+            reservation = await asyncio.to_thread(
+                bucket.shared.reserve,
+                priority or Priority.AGENT,
+                priority is not None and bucket.tokens < 1,
+                inflight,
+                bucket.cooldown_until,
+            )
+            self._published_inflight = inflight
+            bucket.tokens += reservation.granted
+            bucket.remote_inflight = reservation.remote_inflight
+            bucket.cooldown_until = max(
+                bucket.cooldown_until, reservation.cooldown_until
+            )
+            retry_in = reservation.retry_in if not reservation.granted else 0.0
+            self._next_exchange = loop.time() + max(SHARED_POLL_INTERVAL, retry_in)
+        except Exception:
+            logger.exception("Failed to exchange state with the shared Gemini budget")
+            self._next_exchange = loop.time() + 1.0
+        finally:
+            self._exchange = None
+            self._publish()  # calls that finished during the exchange
+            self._dispatch()
+
+    def _wake_in(self, seconds: float) -> None:
+        loop = asyncio.get_running_loop()
+        when = loop.time() + seconds
+        if self._timer is not None:
+            if not self._timer.cancelled() and self._timer.when() <= when:
+                return
+            self._timer.cancel()
+        self._timer = loop.call_at(when, self._on_timer)
+
+    def _on_timer(self) -> None:
+        self._timer = None
+        self._dispatch()
+
+
+@functools.cache
+def get_governor() -> GeminiGovernor:
+    """Return the governor shared by every Gemini call of this process."""
+    configurable = WorkerConfiguration.from_runnable_config()
+    state_dir = os.environ.get(GOVERNOR_DIR_ENV)
+    bucket = TokenBucket(
+        requests_per_minute=configurable.gemini_requests_per_minute,
+        max_concurrency=configurable.gemini_max_concurrency,
+        shared=SharedBudget(
+            Path(state_dir) / "gemini.json", configurable.gemini_requests_per_minute
+        )
+        if state_dir
+        else None,
+    )
+    return GeminiGovernor(bucket, max_attempts=configurable.gemini_max_attempts)
+
+
+class GovernedChatModel(BaseChatModel):
+    """Chat model whose calls go through the process-wide `GeminiGovernor`.
+
+    The tokens of every call are recorded in the usage ledger, under the
+    caller and the interview thread and graph node the call ran in.
+    """
+
+    inner: Runnable[LanguageModelInput, BaseMessage]
+    priority: Priority = Priority.AGENT
+    caller: str = "agent"
+
+    @property
+    def _llm_type(self) -> str:
+        return "governed"
+
+    def bind_tools(
+        self, tools: Sequence[Any], **kwargs: Any
+    ) -> Runnable[LanguageModelInput, BaseMessage]:
+        return self.model_copy(
+            update={"inner": self.inner.bind_tools(tools, **kwargs)}  # type: ignore[attr-defined]
+        )
+
+    def _generate(
+        self,
+        messages: list[BaseMessage],
+        stop: Optional[list[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        # Synchronous calls cannot wait in the governor's queue on the event loop
+        message = self.inner.invoke(
+            messages, delegate_config(run_manager), stop=stop, **kwargs
+        )
+        self._record_usage(
+            run_manager, message, *message_usage(message), cached_tokens(message)
+        )
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    async def _agenerate(
+        self,
+        messages: list[BaseMessage],
+        stop: Optional[list[str]] = None,
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        message = await get_governor().call(
+            self.priority,
+            self.caller,
+            lambda: self.inner.ainvoke(
+                messages, delegate_config(run_manager), stop=stop, **kwargs
+            ),
+        )
+        self._record_usage(
+            run_manager, message, *message_usage(message), cached_tokens(message)
+        )
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    async def _astream(
+        self,
+        messages: list[BaseMessage],
+        stop: Optional[list[str]] = None,
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> AsyncIterator[ChatGenerationChunk]:
+        # Streamed usage is reported as deltas, usually on the last chunk
+        input_tokens = output_tokens = cached = 0
+        last: Optional[BaseMessage] = None
+        try:
+            async for chunk in get_governor().stream(
+                self.priority,
+                self.caller,
+                lambda: self.inner.astream(
+                    messages, delegate_config(run_manager), stop=stop, **kwargs
+                ),
+            ):
+                chunk_input, chunk_output = message_usage(chunk)
+                input_tokens += chunk_input
+                output_tokens += chunk_output
+                cached += cached_tokens(chunk)
+                last = chunk
+                yield ChatGenerationChunk(message=as_message_chunk(chunk))
+        finally:
+            if last is not None:
+                self._record_usage(
+                    run_manager, last, input_tokens, output_tokens, cached
+                )
+
+    def _record_usage(
+        self,
+        run_manager: Optional[CallbackManagerForLLMRun | AsyncCallbackManagerForLLMRun],
+        message: BaseMessage,
+        input_tokens: int,
+        output_tokens: int,
+        cached: int = 0,
+    ) -> None:
+        metadata = run_manager.metadata if run_manager is not None else {}
+        get_usage_ledger().record_call(
+            metadata.get("thread_id"),
+            self.caller,
+            node=metadata.get("langgraph_node"),
+            model=message.response_metadata.get("model_name")
+            or _model_name(self.inner),
+            input_tokens=input_tokens,
+            output_tokens=output_tokens,
+            cached_tokens=cached,
+        )
+
+
+def governed(
+    model: BaseChatModel, priority: Priority, caller: str
+) -> GovernedChatModel:
+    """Route every call of `model` through the process-wide governor."""
+    return GovernedChatModel(inner=model, priority=priority, caller=caller)
+
+
+def _model_name(model: Any) -> Optional[str]:
+    """Name of a chat model, looking through tool and config bindings."""
+    while model is not None:
+        name = getattr(model, "model", None) or getattr(model, "model_name", None)
+        if isinstance(name, str):
+            return name
+        model = getattr(model, "bound", None) or getattr(model, "inner", None)
+    return None
+
+
+def _status_code(error: BaseException) -> Optional[int]:
+    """Find the HTTP status of a Gemini error, looking through wrapped causes."""
+    seen: Optional[BaseException] = error
+    while seen is not None:
+        for attr in ("code", "status_code"):
+            code = getattr(seen, attr, None)
+            if isinstance(code, int):
+                return int(code)
+        seen = seen.__cause__ or seen.__context__
+    return None
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
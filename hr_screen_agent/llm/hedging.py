@@ -0,0 +1,218 @@
+import asyncio
+import random
+import time
+from collections import deque
+from typing import Any, AsyncIterator, Optional, Sequence
+
+from langchain_core.callbacks import (
+    AsyncCallbackManagerForLLMRun,
+    CallbackManagerForLLMRun,
+)
+from langchain_core.language_models import BaseChatModel, LanguageModelInput
+from langchain_core.language_models.chat_models import agenerate_from_stream
+from langchain_core.messages import BaseMessage
+from langchain_core.messages.utils import count_tokens_approximately
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+from langchain_core.runnables import Runnable
+from pydantic import PrivateAttr
+
+from hr_screen_agent.llm.base import as_message_chunk, delegate_config
+from hr_screen_agent.telemetry.metrics import (
+    HEDGE_EXTRA_INPUT_TOKENS,
+    HEDGE_REQUESTS,
+    LLM_FIRST_TOKEN,
+)
+from hr_screen_agent.utils import percentile
+
+
+class LatencyTracker:
+    """Sliding window of first-token latencies used to pick the hedge delay."""
+
+    def __init__(
+        self,
+        q: float,
+        initial_delay: float,
+        min_delay: float,
+        window: int = 200,
+        min_samples: int = 20,
+    ) -> None:
+        self.q = q
+        self.initial_delay = initial_delay
+        self.min_delay = min_delay
+        self.min_samples = min_samples
+        self._samples: deque[float] = deque(maxlen=window)
+
+    def record(self, seconds: float) -> None:
+        self._samples.append(seconds)
+
+    def hedge_delay(self) -> float:
+        """Return how long to wait for the first token before hedging."""
+        if len(self._samples) < self.min_samples:
+            return self.initial_delay
+        return max(self.min_delay, percentile(self._samples, self.q))
+
+
+class _Attempt:
+    """One streaming request, started eagerly and raced on its first chunk."""
+
+    def __init__(self, name: str, stream: AsyncIterator[BaseMessage]) -> None:
+        self.name = name
+        self.stream = stream
+        self.started = time.perf_counter()
+        self.first = asyncio.create_task(self._first_chunk())
+
+    async def _first_chunk(self) -> Optional[BaseMessage]:
+        try:
+            return await anext(self.stream)
+        except StopAsyncIteration:
+            return None
+
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started
+
+    async def cancel(self) -> None:
+        self.first.cancel()
+        await asyncio.wait({self.first})
+        if not self.first.cancelled():
+            self.first.exception()  # mark as retrieved
+        await self.stream.aclose()  # type: ignore[attr-defined]
+
+
+class HedgedChatModel(BaseChatModel):
+    """Chat model that hedges slow requests to cut tail latency.
+
+    The request goes to `primary`. If no token has arrived after the
+    `hedge_percentile` of recent first-token latencies, the same request is
+    sent again, to `fallback` when configured, and whichever request streams
+    first wins. The other one is cancelled.
+
+    A `control_fraction` of requests is never hedged, so the first-token
+    histogram can compare the tail latency with and without hedging.
+    """
+
+    primary: Runnable[LanguageModelInput, BaseMessage]
+    fallback: Optional[Runnable[LanguageModelInput, BaseMessage]] = None
+    hedge_percentile: float = 95.0
+    initial_delay: float = 2.0
+    min_delay: float = 0.2
+    control_fraction: float = 0.0
+
+    _tracker: LatencyTracker = PrivateAttr()
+
+    def model_post_init(self, context: Any) -> None:
+        super().model_post_init(context)
+        self._tracker = LatencyTracker(
+            q=self.hedge_percentile,
+            initial_delay=self.initial_delay,
+            min_delay=self.min_delay,
+        )
+
+    @property
+    def _llm_type(self) -> str:
+        return "hedged"
+
+    def bind_tools(
+        self, tools: Sequence[Any], **kwargs: Any
+    ) -> Runnable[LanguageModelInput, BaseMessage]:
+        # The copy shares the latency tracker, see `model_copy`
+        return self.model_copy(
+            update={
+                "primary": self.primary.bind_tools(tools, **kwargs),  # type: ignore[attr-defined]
+                "fallback": self.fallback.bind_tools(tools, **kwargs)  # type: ignore[attr-defined]
+                if self.fallback is not None
+                else None,
+            }
+        )
+
+    def _generate(
+        self,
+        messages: list[BaseMessage],
+        stop: Optional[list[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        # Synchronous calls cannot race two requests, so they go to the primary
+        message = self.primary.invoke(
+            messages, delegate_config(run_manager), stop=stop, **kwargs
+        )
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    async def _agenerate(
+        self,
+        messages: list[BaseMessage],
+        stop: Optional[list[str]] = None,
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        return await agenerate_from_stream(
+            self._astream(messages, stop=stop, run_manager=run_manager, **kwargs)
+        )
+
+    async def _astream(
+        self,
+        messages: list[BaseMessage],
+        stop: Optional[list[str]] = None,
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> AsyncIterator[ChatGenerationChunk]:
+        def start(name: str, model: Runnable) -> _Attempt:
+            config = delegate_config(run_manager, hedge_attempt=name)
+            return _Attempt(name, model.astream(messages, config, stop=stop, **kwargs))
+
+        hedge = random.random() >= self.control_fraction
+        attempts = [start("primary", self.primary)]
+        winner: Optional[_Attempt] = None
+        try:
+            if hedge:
+                done, _ = await asyncio.wait(
+                    {attempts[0].first}, timeout=self._tracker.hedge_delay()
+                )
+                if not done:
+                    attempts.append(start("hedge", self.fallback or self.primary))
+                    HEDGE_EXTRA_INPUT_TOKENS.inc(count_tokens_approximately(messages))
+            winner, first = await self._first_to_respond(attempts)
+            self._record(attempts, winner, hedge)
+        finally:
+            for attempt in attempts:
+                if attempt is not winner:
+                    await attempt.cancel()
+
+        if first is None:
+            return
+        try:
+            yield ChatGenerationChunk(message=as_message_chunk(first))
+            async for chunk in winner.stream:
+                yield ChatGenerationChunk(message=as_message_chunk(chunk))
+        finally:
+            await winner.stream.aclose()  # type: ignore[attr-defined]
+
+    @staticmethod
+    async def _first_to_respond(
+        attempts: list[_Attempt],
+    ) -> tuple[_Attempt, Optional[BaseMessage]]:
+        """Wait for the first attempt to stream a chunk; errors only count if all fail."""
+        pending = {attempt.first: attempt for attempt in attempts}
+        error: Optional[BaseException] = None
+        while pending:
+            done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                attempt = pending.pop(task)
+                if task.exception() is None:
+                    return attempt, task.result()
+                error = error or task.exception()
+        assert error is not None
+        raise error
+
+    def _record(self, attempts: list[_Attempt], winner: _Attempt, hedge: bool) -> None:
+        # Time since the request started; when the hedge won this is a lower
+        # bound of the primary's latency, which keeps the hedge delay honest
+        latency = attempts[0].elapsed()
+        self._tracker.record(latency)
+        LLM_FIRST_TOKEN.labels(group="hedged" if hedge else "control").observe(latency)
+        if not hedge:
+            outcome = "control"
+        elif len(attempts) == 1:
+            outcome = "not_hedged"
+        else:
+            outcome = f"{winner.name}_won"
+        HEDGE_REQUESTS.labels(outcome=outcome).inc()
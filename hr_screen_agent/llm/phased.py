@@ -0,0 +1,121 @@
+from typing import Any, AsyncIterator, Mapping, Optional, Sequence
+
+from langchain_core.callbacks import (
+    AsyncCallbackManagerForLLMRun,
+    CallbackManagerForLLMRun,
+)
+from langchain_core.language_models import BaseChatModel, LanguageModelInput
+from langchain_core.messages import BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+from langchain_core.runnables import Runnable
+from pydantic import Field
+
+from hr_screen_agent.llm.base import as_message_chunk, delegate_config
+
+# Id prefix of the system message that tells the model which phase it is in
+PHASE_MESSAGE_PREFIX = "phase:"
+
+
+def phase_message_id(phase: str) -> str:
+    return f"{PHASE_MESSAGE_PREFIX}{phase}"
+
+
+def message_phase(messages: Sequence[BaseMessage]) -> Optional[str]:
+    """Return the phase named by the phase system message, if there is one."""
+    for message in messages:
+        if message.id and message.id.startswith(PHASE_MESSAGE_PREFIX):
+            return message.id[len(PHASE_MESSAGE_PREFIX) :]
+    return None
+
+
+def _tool_name(tool: Any) -> Optional[str]:
+    if isinstance(tool, dict):
+        return tool.get("name") or tool.get("function", {}).get("name")
+    return getattr(tool, "name", None)
+
+
+class PhasedChatModel(BaseChatModel):
+    """Chat model that only offers the tools of the conversation's current phase.
+
+    `bind_tools` binds one subset of the tools per phase. Each call uses the
+    binding of the phase named by the phase system message in its input (see
+    `phase_message_id`), so the tool schemas of the other phases are not sent.
+    Tools that no phase lists are offered in every phase, and calls without a
+    phase get every tool.
+    """
+
+    inner: BaseChatModel
+    tools_by_phase: Mapping[str, frozenset[str]]
+    bound: dict[str, Runnable[LanguageModelInput, BaseMessage]] = Field(
+        default_factory=dict
+    )
+    bound_all: Optional[Runnable[LanguageModelInput, BaseMessage]] = None
+
+    @property
+    def _llm_type(self) -> str:
+        return "phased"
+
+    def bind_tools(
+        self, tools: Sequence[Any], **kwargs: Any
+    ) -> Runnable[LanguageModelInput, BaseMessage]:
+        known = frozenset().union(*self.tools_by_phase.values())
+        return self.model_copy(
+            update={
+                "bound": {
+                    phase: self.inner.bind_tools(
+                        [
+                            t
+                            for t in tools
+                            if _tool_name(t) in names or _tool_name(t) not in known
+                        ],
+                        **kwargs,
+                    )
+                    for phase, names in self.tools_by_phase.items()
+                },
+                "bound_all": self.inner.bind_tools(tools, **kwargs),
+            }
+        )
+
+    def _model_for(
+        self, messages: list[BaseMessage]
+    ) -> Runnable[LanguageModelInput, BaseMessage]:
+        phase = message_phase(messages)
+        if phase in self.bound:
+            return self.bound[phase]
+        return self.bound_all or self.inner
+
+    def _generate(
+        self,
+        messages: list[BaseMessage],
+        stop: Optional[list[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        message = self._model_for(messages).invoke(
+            messages, delegate_config(run_manager), stop=stop, **kwargs
+        )
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    async def _agenerate(
+        self,
+        messages: list[BaseMessage],
+        stop: Optional[list[str]] = None,
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        message = await self._model_for(messages).ainvoke(
+            messages, delegate_config(run_manager), stop=stop, **kwargs
+        )
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    async def _astream(
+        self,
+        messages: list[BaseMessage],
+        stop: Optional[list[str]] = None,
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> AsyncIterator[ChatGenerationChunk]:
+        async for chunk in self._model_for(messages).astream(
+            messages, delegate_config(run_manager), stop=stop, **kwargs
+        ):
+            yield ChatGenerationChunk(message=as_message_chunk(chunk))
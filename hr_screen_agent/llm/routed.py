@@ -0,0 +1,119 @@
+from typing import Any, AsyncIterator, Optional, Sequence
+
+from langchain_core.callbacks import (
+    AsyncCallbackManagerForLLMRun,
+    CallbackManagerForLLMRun,
+)
+from langchain_core.language_models import BaseChatModel, LanguageModelInput
+from langchain_core.messages import BaseMessage, HumanMessage, ToolMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+from langchain_core.runnables import Runnable
+from pydantic import BaseModel, ConfigDict
+
+from hr_screen_agent.llm.base import as_message_chunk, delegate_config
+from hr_screen_agent.llm.phased import message_phase
+from hr_screen_agent.telemetry.metrics import ROUTED_CALLS
+
+
+class RoutingPolicy(BaseModel):
+    """Which agent calls are simple enough for the fast model.
+
+    Calls in `main_phases`, such as reading the candidate's documents or
+    writing the summary, and calls that answer tool results stay on the main
+    model. Relaying a guardrail's redirect goes to the fast model, and so do
+    candidate turns in `fast_phases` or of at most `max_words` words, such
+    as acknowledgements, short answers and requests to repeat a question.
+    """
+
+    model_config = ConfigDict(frozen=True)
+
+    max_words: int = 12
+    fast_phases: frozenset[str] = frozenset({"wrap_up"})
+    main_phases: frozenset[str] = frozenset({"preparation", "summary"})
+
+    def route(self, messages: Sequence[BaseMessage]) -> tuple[str, str]:
+        """Return the tier of a call, `fast` or `main`, and the reason."""
+        phase = message_phase(messages)
+        if phase in self.main_phases:
+            return "main", "phase"
+        last = messages[-1] if messages else None
+        if isinstance(last, ToolMessage):
+            if "guardrail_check__" in last.tool_call_id:
+                return "fast", "guardrail"
+            return "main", "tool_result"
+        if not isinstance(last, HumanMessage):
+            return "main", "other"
+        if phase in self.fast_phases:
+            return "fast", "phase"
+        if len(last.text().split()) <= self.max_words:
+            return "fast", "short_turn"
+        return "main", "long_turn"
+
+
+class RoutedChatModel(BaseChatModel):
+    """Chat model that answers simple turns with a faster, cheaper model.
+
+    Each call goes to `fast` or `inner` as the `policy` decides from its
+    messages, the phase system message included (see `message_phase`).
+    """
+
+    inner: Runnable[LanguageModelInput, BaseMessage]
+    fast: Runnable[LanguageModelInput, BaseMessage]
+    policy: RoutingPolicy = RoutingPolicy()
+
+    @property
+    def _llm_type(self) -> str:
+        return "routed"
+
+    def bind_tools(
+        self, tools: Sequence[Any], **kwargs: Any
+    ) -> Runnable[LanguageModelInput, BaseMessage]:
+        return self.model_copy(
+            update={
+                "inner": self.inner.bind_tools(tools, **kwargs),  # type: ignore[attr-defined]
+                "fast": self.fast.bind_tools(tools, **kwargs),  # type: ignore[attr-defined]
+            }
+        )
+
+    def _model_for(
+        self, messages: list[BaseMessage]
+    ) -> Runnable[LanguageModelInput, BaseMessage]:
+        tier, reason = self.policy.route(messages)
+        ROUTED_CALLS.labels(tier=tier, reason=reason).inc()
+        return self.fast if tier == "fast" else self.inner
+
+    def _generate(
+        self,
+        messages: list[BaseMessage],
+        stop: Optional[list[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        message = self._model_for(messages).invoke(
+            messages, delegate_config(run_manager), stop=stop, **kwargs
+        )
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    async def _agenerate(
+        self,
+        messages: list[BaseMessage],
+        stop: Optional[list[str]] = None,
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        message = await self._model_for(messages).ainvoke(
+            messages, delegate_config(run_manager), stop=stop, **kwargs
+        )
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    async def _astream(
+        self,
+        messages: list[BaseMessage],
+        stop: Optional[list[str]] = None,
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> AsyncIterator[ChatGenerationChunk]:
+        async for chunk in self._model_for(messages).astream(
+            messages, delegate_config(run_manager), stop=stop, **kwargs
+        ):
+            yield ChatGenerationChunk(message=as_message_chunk(chunk))
@@ -0,0 +1,183 @@
+from datetime import datetime, timedelta, timezone
+from enum import Enum
+from typing import Any, Callable, Optional, Sequence
+
+from langchain_core.messages import (
+    BaseMessage,
+    HumanMessage,
+    SystemMessage,
+    ToolMessage,
+)
+from langchain_core.runnables import RunnableConfig
+
+from hr_screen_agent.budget import hard_budget_reached
+from hr_screen_agent.configuration import Configuration
+from hr_screen_agent.llm import phase_message_id
+from hr_screen_agent.plans import with_interview_plan
+from hr_screen_agent.prompts import phase_instructions
+from hr_screen_agent.state import HrScreenAgentState
+
+
+class InterviewPhase(str, Enum):
+    """Phases of the interview, in the order they are entered."""
+
+    PREPARATION = "preparation"
+    INTRODUCTION = "introduction"
+    QUESTIONING = "questioning"
+    WRAP_UP = "wrap_up"
+    SUMMARY = "summary"
+
+
+# Tools offered to the model in each phase. The summary and end_call tools stay
+# available from the introduction on, in case the candidate ends the call early.
+PHASE_TOOLS: dict[InterviewPhase, frozenset[str]] = {
+    InterviewPhase.PREPARATION: frozenset(
+        {"think", "start_timer", "list_input_files", "read_input_file", "web_search"}
+    ),
+    InterviewPhase.INTRODUCTION: frozenset(
+        {
+            "think",
+            "read_input_file",
+            "web_search",
+            "write_interview_summary",
+            "end_call",
+        }
+    ),
+    InterviewPhase.QUESTIONING: frozenset(
+        {
+            "think",
+            "clear_thoughts",
+            "web_search",
+            "check_time_remaining",
+            "write_interview_summary",
+            "end_call",
+        }
+    ),
+    InterviewPhase.WRAP_UP: frozenset(
+        {"think", "check_time_remaining", "write_interview_summary", "end_call"}
+    ),
+    InterviewPhase.SUMMARY: frozenset(
+        {"write_interview_summary", "get_interview_summary", "end_call"}
+    ),
+}
+
+# Candidate turns spent in the introduction: the answer to the introduction
+# itself and the candidate's self-introduction
+INTRODUCTION_TURNS = 2
+
+
+def advance_phase(state: HrScreenAgentState, config: RunnableConfig) -> dict[str, Any]:
+    """Work out the interview phase before a model call.
+
+    Phases only move forward. Transitions depend on the state alone (timer,
+    documents read, candidate turns, summary written), on the clock and on
+    the token budget, so no model call is spent on them.
+
+    Returns:
+        The state update with the current `phase`, and the candidate turn it
+        was entered at.
+    """
+    configuration = Configuration.from_runnable_config(config)
+    messages = state["messages"]
+    phase = InterviewPhase(state.get("phase") or InterviewPhase.PREPARATION)
+    phase_turn = state.get("phase_turn") or 0
+    turns = sum(isinstance(m, HumanMessage) for m in messages)
+    remaining = _remaining_time(state.get("start_time"), configuration)
+    out_of_budget = hard_budget_reached(
+        (config.get("configurable") or {}).get("thread_id"), configuration
+    )
+
+    while True:
+        following = _next_phase(
+            phase,
+            state,
+            messages,
+            turns - phase_turn,
+            remaining,
+            configuration,
+            out_of_budget,
+        )
+        if following is None:
+            break
+        phase, phase_turn = following, turns
+
+    return {"phase": phase.value, "phase_turn": phase_turn}
+
+
+def _next_phase(
+    phase: InterviewPhase,
+    state: HrScreenAgentState,
+    messages: list[BaseMessage],
+    turns_in_phase: int,
+    remaining: Optional[timedelta],
+    configuration: Configuration,
+    out_of_budget: bool = False,
+) -> Optional[InterviewPhase]:
+    if phase is not InterviewPhase.SUMMARY and state.get("interview_summary"):
+        return InterviewPhase.SUMMARY
+
+    if phase is InterviewPhase.PREPARATION:
+        documents_read = bool(state.get("fit_profile")) or any(
+            isinstance(m, ToolMessage) and m.name == "read_input_file" for m in messages
+        )
+        # Without documents, preparation ends once the candidate answers
+        if state.get("start_time") and (documents_read or turns_in_phase > 0):
+            return InterviewPhase.INTRODUCTION
+        return None
+
+    # The hard token budget ends the interview like running out of time
+    if out_of_budget and phase in (
+        InterviewPhase.INTRODUCTION,
+        InterviewPhase.QUESTIONING,
+    ):
+        return InterviewPhase.WRAP_UP
+
+    warning = timedelta(minutes=configuration.warning_threshold_minutes)
+    if phase is InterviewPhase.INTRODUCTION:
+        if turns_in_phase >= INTRODUCTION_TURNS or (
+            remaining is not None and remaining <= warning
+        ):
+            return InterviewPhase.QUESTIONING
+    elif phase is InterviewPhase.QUESTIONING:
+        if remaining is not None and remaining <= warning:
+            return InterviewPhase.WRAP_UP
+    elif phase is InterviewPhase.WRAP_UP:
+        if remaining is not None and remaining <= timedelta(0):
+            return InterviewPhase.SUMMARY
+    return None
+
+
+def _remaining_time(
+    start_time: Optional[datetime], configuration: Configuration
+) -> Optional[timedelta]:
+    if start_time is None:
+        return None
+    end_time = start_time + timedelta(minutes=configuration.interview_duration_minutes)
+    return end_time - datetime.now(timezone.utc)
+
+
+def create_phase_prompt(
+    instructions: str,
+    session: Sequence[BaseMessage] = (),
+) -> Callable[[HrScreenAgentState], list[BaseMessage]]:
+    """Create the agent prompt that adds the current phase to `instructions`.
+
+    The system message is tagged with the phase, so `PhasedChatModel` binds
+    the tools of that phase. It ends with the role's interview plan, and is
+    followed by the `session` messages, which hold what differs between
+    candidates.
+    """
+    prompts = {
+        phase: SystemMessage(
+            content=f"{instructions}\n\n{phase_instructions[phase.value]}",
+            id=phase_message_id(phase.value),
+        )
+        for phase in InterviewPhase
+    }
+
+    def prompt(state: HrScreenAgentState) -> list[BaseMessage]:
+        phase = InterviewPhase(state.get("phase") or InterviewPhase.PREPARATION)
+        system = with_interview_plan(prompts[phase], state.get("interview_plan"))
+        return [system, *session, *state["messages"]]
+
+    return prompt
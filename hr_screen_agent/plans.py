@@ -0,0 +1,176 @@
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import tempfile
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Mapping, Optional
+
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import SystemMessage
+
+from hr_screen_agent.configuration import Configuration
+from hr_screen_agent.profile import INPUT_DIR
+from hr_screen_agent.prompts import interview_plan_instructions, interview_plan_section
+from hr_screen_agent.telemetry.metrics import INTERVIEW_PLAN_LOOKUPS
+from hr_screen_agent.tools.document_loader import read_document
+from hr_screen_agent.tools_and_schemas import InterviewPlan
+
+logger = logging.getLogger("vocalize-hr-screen-agent")
+
+_SECTIONS = {
+    "qualification_questions": "Basic qualifications",
+    "motivation_questions": "Interest and motivation",
+    "logistics_questions": "Logistical fit",
+    "communication_signals": "Communication and professionalism",
+}
+
+
+class InterviewPlanCache:
+    """Interview plans on disk, shared by every candidate for a role.
+
+    A plan is stored as a JSON file named by a hash of the job description
+    and of everything else it is written from: the company, the role, the
+    interview duration, the model and the instructions. Editing any of them
+    writes a new plan, and the old one is simply never read again. Files are
+    replaced atomically, so job processes can share the folder; sessions that
+    miss the same plan at the same time each write it once.
+    """
+
+    def __init__(self, directory: str | os.PathLike[str]) -> None:
+        self.directory = Path(directory)
+
+    def key(self, configuration: Configuration, job_description: str) -> str:
+        key = json.dumps(
+            {
+                "job_description": job_description,
+                "company_name": configuration.company_name,
+                "job_role": configuration.job_role,
+                "interview_duration_minutes": configuration.interview_duration_minutes,
+                "model": configuration.interview_plan_model,
+                "instructions": interview_plan_instructions,
+            },
+            sort_keys=True,
+        )
+        return hashlib.sha256(key.encode()).hexdigest()
+
+    def path(self, key: str) -> Path:
+        return self.directory / f"{key}.json"
+
+    def get(self, key: str) -> Optional[dict[str, Any]]:
+        """Return the cached plan, or None if it was never written."""
+        try:
+            return json.loads(self.path(key).read_text())["plan"]
+        except (FileNotFoundError, json.JSONDecodeError, KeyError):
+            return None
+
+    def put(
+        self, key: str, plan: Mapping[str, Any], configuration: Configuration
+    ) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        entry = {
+            "company_name": configuration.company_name,
+            "job_role": configuration.job_role,
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "plan": dict(plan),
+        }
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(entry, f, indent=2)
+            os.replace(tmp, self.path(key))
+        except BaseException:
+            Path(tmp).unlink(missing_ok=True)
+            raise
+
+
+def read_job_description(
+    configuration: Configuration, input_dir: Path = INPUT_DIR
+) -> str:
+    """Read the job description documents of the input folder into one text."""
+    if not input_dir.exists():
+        return ""
+    parts = []
+    for file_path in sorted(input_dir.glob(configuration.job_description_files)):
+        if file_path.is_file():
+            content, _ = read_document(file_path)
+            parts.append(f"=== {file_path.name} ===\n{content}")
+    return "\n\n".join(parts)
+
+
+async def create_interview_plan(
+    llm: BaseChatModel, configuration: Configuration, job_description: str
+) -> InterviewPlan:
+    """Plan the screening interviews of a role from its job description."""
+    result = (
+        await llm.with_structured_output(InterviewPlan)
+        .with_config(run_name="interview_plan")
+        .ainvoke(
+            interview_plan_instructions.format(
+                company_name=configuration.company_name,
+                job_role=configuration.job_role,
+                interview_duration_minutes=configuration.interview_duration_minutes,
+                job_description=job_description,
+            )
+        )
+    )
+    return InterviewPlan.model_validate(result)
+
+
+async def prepare_interview_plan(
+    llm: BaseChatModel, configuration: Configuration
+) -> dict[str, Any]:
+    """Return the cached plan of the role, writing it on the first interview.
+
+    Returns:
+        The plan, or an empty dict when there is no job description or the
+        plan could not be written.
+    """
+    job_description = await asyncio.to_thread(read_job_description, configuration)
+    if not job_description:
+        return {}
+    cache = InterviewPlanCache(configuration.interview_plan_cache)
+    key = cache.key(configuration, job_description)
+    plan = await asyncio.to_thread(cache.get, key)
+    if plan is not None:
+        INTERVIEW_PLAN_LOOKUPS.labels(result="hit").inc()
+        return plan
+
+    try:
+        plan = (
+            await create_interview_plan(llm, configuration, job_description)
+        ).model_dump()
+        await asyncio.to_thread(cache.put, key, plan, configuration)
+    except Exception:
+        logger.exception("Failed to create the interview plan")
+        INTERVIEW_PLAN_LOOKUPS.labels(result="error").inc()
+        return {}
+    INTERVIEW_PLAN_LOOKUPS.labels(result="miss").inc()
+    return plan
+
+
+def format_interview_plan(plan: Mapping[str, Any]) -> str:
+    """Render an interview plan as compact Markdown for the agent."""
+    lines = [plan.get("company_overview") or ""]
+    for field, title in _SECTIONS.items():
+        items = plan.get(field) or []
+        if items:
+            lines.append(f"\n**{title}**")
+            lines.extend(f"- {item}" for item in items)
+    return "\n".join(lines).strip()
+
+
+def with_interview_plan(
+    system: SystemMessage, plan: Optional[Mapping[str, Any]]
+) -> SystemMessage:
+    """Append the role's plan to the agent's system message.
+
+    The plan is the same for every candidate for the role, so the system
+    message stays a stable prompt prefix (see `ContextCachedChatModel`).
+    """
+    if not plan:
+        return system
+    section = interview_plan_section.format(plan=format_interview_plan(plan))
+    return SystemMessage(content=f"{system.content}\n\n{section}", id=system.id)
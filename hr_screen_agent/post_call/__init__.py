@@ -0,0 +1,10 @@
+from .job_queue import SummaryJob, SummaryQueue, enqueue_interview
+from .worker import SummaryWorker, summarize_interview
+
+__all__ = [
+    "SummaryJob",
+    "SummaryQueue",
+    "SummaryWorker",
+    "enqueue_interview",
+    "summarize_interview",
+]
@@ -0,0 +1,59 @@
+"""Post-call summary workers.
+
+Generates the interview summaries of the calls queued by `app.py`. Run it
+next to the voice worker, or drain a backlog in bulk:
+
+    just post-call --concurrency 8 --drain
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+from pathlib import Path
+
+from hr_screen_agent.post_call.job_queue import SummaryQueue
+from hr_screen_agent.post_call.worker import SummaryWorker
+from hr_screen_agent.summaries import SummaryStore
+
+logger = logging.getLogger("vocalize-hr-screen-agent")
+
+
+async def main(args: argparse.Namespace) -> None:
+    async with SummaryQueue(args.queue) as queue, SummaryStore(args.store) as store:
+        worker = SummaryWorker(
+            queue,
+            store,
+            concurrency=args.concurrency,
+            poll_interval=args.poll_interval,
+        )
+        processed = await worker.run(drain=args.drain)
+        logger.info(f"Wrote {processed} summaries, queue: {await queue.counts()}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--queue",
+        type=Path,
+        default=Path(os.getenv("POST_CALL_QUEUE", "post_call.db")),
+        help="SQLite database of the queue (default: $POST_CALL_QUEUE)",
+    )
+    parser.add_argument(
+        "--store",
+        type=Path,
+        default=Path(os.getenv("SUMMARY_STORE", "summaries.db")),
+        help="SQLite database the summaries are stored in (default: $SUMMARY_STORE)",
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=int(os.getenv("POST_CALL_CONCURRENCY", "4")),
+        help="summaries generated at once (default: $POST_CALL_CONCURRENCY)",
+    )
+    parser.add_argument("--poll-interval", type=float, default=2.0)
+    parser.add_argument(
+        "--drain", action="store_true", help="exit once the queue is empty"
+    )
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,212 @@
+import json
+import os
+import time
+from pathlib import Path
+from typing import Any, Optional, Sequence
+
+import aiosqlite
+from langchain_core.messages import (
+    AIMessage,
+    BaseMessage,
+    messages_from_dict,
+    messages_to_dict,
+)
+from langgraph.pregel.protocol import PregelProtocol
+from pydantic import BaseModel
+
+from hr_screen_agent.configuration import Configuration
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS summary_jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    thread_id TEXT NOT NULL UNIQUE,
+    transcript TEXT NOT NULL,
+    metadata TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'queued',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    enqueued_at REAL NOT NULL,
+    lease_until REAL,
+    finished_at REAL,
+    error TEXT
+);
+CREATE INDEX IF NOT EXISTS summary_jobs_status ON summary_jobs (status, id);
+"""
+
+
+class SummaryJob(BaseModel):
+    """A finished interview waiting for its summary."""
+
+    id: int
+    thread_id: str
+    transcript: list[dict[str, Any]]
+    metadata: dict[str, Any]
+    attempts: int
+    enqueued_at: float
+
+    def messages(self) -> list[BaseMessage]:
+        return messages_from_dict(self.transcript)
+
+
+class SummaryQueue:
+    """Durable queue of post-call summary jobs in a local SQLite database.
+
+    Any number of worker processes can share the database. A claimed job is
+    leased for `lease_seconds`; if its worker dies, the job is handed out
+    again once the lease expires. Failed jobs are retried up to
+    `max_attempts` times.
+    """
+
+    def __init__(
+        self,
+        path: str | os.PathLike[str],
+        *,
+        lease_seconds: float = 300.0,
+        max_attempts: int = 3,
+    ) -> None:
+        self.path = Path(path)
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self._db: Optional[aiosqlite.Connection] = None
+
+    async def __aenter__(self) -> "SummaryQueue":
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._db = await aiosqlite.connect(self.path, isolation_level=None)
+        await self._db.execute("PRAGMA journal_mode=WAL")
+        await self._db.execute("PRAGMA busy_timeout=5000")
+        await self._db.executescript(_SCHEMA)
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        if self._db is not None:
+            await self._db.close()
+            self._db = None
+
+    @property
+    def db(self) -> aiosqlite.Connection:
+        if self._db is None:
+            raise RuntimeError("SummaryQueue must be used as an async context manager")
+        return self._db
+
+    async def enqueue(
+        self,
+        thread_id: str,
+        messages: Sequence[BaseMessage],
+        metadata: Optional[dict[str, Any]] = None,
+    ) -> None:
+        """Queue the transcript of a thread, replacing a job queued for it before."""
+        await self.db.execute(
+            """
+            INSERT INTO summary_jobs (thread_id, transcript, metadata, enqueued_at)
+            VALUES (?, ?, ?, ?)
+            ON CONFLICT (thread_id) DO UPDATE SET
+                transcript = excluded.transcript,
+                metadata = excluded.metadata,
+                enqueued_at = excluded.enqueued_at,
+                status = 'queued',
+                attempts = 0,
+                lease_until = NULL,
+                finished_at = NULL,
+                error = NULL
+            """,
+            (
+                thread_id,
+                json.dumps(messages_to_dict(list(messages)), default=str),
+                json.dumps(metadata or {}),
+                time.time(),
+            ),
+        )
+
+    async def claim(self) -> Optional[SummaryJob]:
+        """Lease the oldest queued job, or a job whose worker's lease expired."""
+        now = time.time()
+        async with self.db.execute(
+            """
+            UPDATE summary_jobs
+            SET status = 'running', attempts = attempts + 1, lease_until = ?
+            WHERE id = (
+                SELECT id FROM summary_jobs
+                WHERE status = 'queued' OR (status = 'running' AND lease_until < ?)
+                ORDER BY id
+                LIMIT 1
+            )
+            RETURNING id, thread_id, transcript, metadata, attempts, enqueued_at
+            """,
+            (now + self.lease_seconds, now),
+        ) as cursor:
+            row = await cursor.fetchone()
+        if row is None:
+            return None
+        return SummaryJob(
+            id=row[0],
+            thread_id=row[1],
+            transcript=json.loads(row[2]),
+            metadata=json.loads(row[3]),
+            attempts=row[4],
+            enqueued_at=row[5],
+        )
+
+    async def complete(self, job: SummaryJob) -> None:
+        await self.db.execute(
+            """
+            UPDATE summary_jobs
+            SET status = 'done', transcript = '[]', lease_until = NULL, finished_at = ?
+            WHERE id = ?
+            """,
+            (time.time(), job.id),
+        )
+
+    async def fail(self, job: SummaryJob, error: str) -> bool:
+        """Record a failed attempt.
+
+        Returns:
+            Whether the job will be retried
+        """
+        retry = job.attempts < self.max_attempts
+        await self.db.execute(
+            """
+            UPDATE summary_jobs
+            SET status = ?, lease_until = NULL, finished_at = ?, error = ?
+            WHERE id = ?
+            """,
+            (
+                "queued" if retry else "failed",
+                None if retry else time.time(),
+                error,
+                job.id,
+            ),
+        )
+        return retry
+
+    async def counts(self) -> dict[str, int]:
+        """Number of jobs by status: queued, running, done and failed."""
+        async with self.db.execute(
+            "SELECT status, COUNT(*) FROM summary_jobs GROUP BY status"
+        ) as cursor:
+            rows = await cursor.fetchall()
+        return {"queued": 0, "running": 0, "done": 0, "failed": 0, **dict(rows)}
+
+
+async def enqueue_interview(
+    queue: SummaryQueue, graph: PregelProtocol, thread_id: str
+) -> bool:
+    """Queue the finished interview of `thread_id` for its post-call summary.
+
+    Returns:
+        Whether the interview was queued; threads without any reply are skipped
+    """
+    snapshot = await graph.aget_state({"configurable": {"thread_id": thread_id}})
+    messages = snapshot.values.get("messages", [])
+    if not any(isinstance(m, AIMessage) and m.text() for m in messages):
+        return False
+
+    configurable = Configuration.from_runnable_config()
+    await queue.enqueue(
+        thread_id,
+        messages,
+        {
+            "candidate_name": configurable.candidate_name,
+            "company_name": configurable.company_name,
+            "job_role": configurable.job_role,
+        },
+    )
+    return True
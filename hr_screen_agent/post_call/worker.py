@@ -0,0 +1,112 @@
+import asyncio
+import logging
+import time
+from typing import Any, Optional, Sequence
+
+from langchain.chat_models import init_chat_model
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import BaseMessage, SystemMessage, get_buffer_string
+
+from hr_screen_agent.configuration import WorkerConfiguration
+from hr_screen_agent.llm import Priority, governed
+from hr_screen_agent.post_call.job_queue import SummaryJob, SummaryQueue
+from hr_screen_agent.prompts import post_call_summary_instructions
+from hr_screen_agent.summaries import SummaryStore
+from hr_screen_agent.telemetry.metrics import (
+    POST_CALL_DURATION,
+    POST_CALL_JOBS,
+    POST_CALL_QUEUE_DELAY,
+)
+
+logger = logging.getLogger("vocalize-hr-screen-agent")
+
+
+async def summarize_interview(
+    llm: BaseChatModel,
+    messages: Sequence[BaseMessage],
+    metadata: dict[str, Any],
+) -> str:
+    """Write the interview summary for a finished interview's transcript."""
+    transcript = [m for m in messages if not isinstance(m, SystemMessage)]
+    result = await llm.with_config(run_name="post_call_summary").ainvoke(
+        post_call_summary_instructions.format(
+            candidate_name=metadata.get("candidate_name", "the candidate"),
+            company_name=metadata.get("company_name", "the company"),
+            job_role=metadata.get("job_role", "unspecified"),
+            transcript=get_buffer_string(transcript),
+        )
+    )
+    return result.text()
+
+
+class SummaryWorker:
+    """Pool of tasks that turn queued transcripts into stored interview summaries.
+
+    At most `concurrency` summaries are generated at once by this worker.
+    Their Gemini calls run at background priority, so they never take
+    budget from live sessions sharing the same rate limiter.
+    """
+
+    def __init__(
+        self,
+        queue: SummaryQueue,
+        store: SummaryStore,
+        llm: Optional[BaseChatModel] = None,
+        *,
+        concurrency: int = 4,
+        poll_interval: float = 2.0,
+    ) -> None:
+        configurable = WorkerConfiguration.from_runnable_config()
+        self.queue = queue
+        self.store = store
+        self.llm = governed(
+            llm
+            or init_chat_model(
+                configurable.summary_model, temperature=0.2, max_retries=1
+            ),
+            Priority.BACKGROUND,
+            "post_call_summary",
+        )
+        self.concurrency = concurrency
+        self.poll_interval = poll_interval
+        self.processed = 0
+
+    async def run(self, drain: bool = False) -> int:
+        """Process jobs until cancelled, or with `drain` until the queue is empty.
+
+        Returns:
+            The number of summaries written
+        """
+        await asyncio.gather(*(self._loop(drain) for _ in range(self.concurrency)))
+        return self.processed
+
+    async def _loop(self, drain: bool) -> None:
+        while True:
+            job = await self.queue.claim()
+            if job is None:
+                if drain:
+                    return
+                await asyncio.sleep(self.poll_interval)
+                continue
+            await self.process(job)
+
+    async def process(self, job: SummaryJob) -> None:
+        started = time.time()
+        POST_CALL_QUEUE_DELAY.observe(max(0.0, started - job.enqueued_at))
+        try:
+            summary = await summarize_interview(self.llm, job.messages(), job.metadata)
+            record = await self.store.save(job.thread_id, summary, **job.metadata)
+        except Exception as e:
+            retry = await self.queue.fail(job, repr(e))
+            POST_CALL_JOBS.labels(outcome="retried" if retry else "failed").inc()
+            logger.exception(f"Failed to summarize interview {job.thread_id}")
+            return
+
+        await self.queue.complete(job)
+        self.processed += 1
+        POST_CALL_JOBS.labels(outcome="done").inc()
+        POST_CALL_DURATION.observe(time.time() - started)
+        logger.info(
+            f"Stored interview summary for {job.thread_id} "
+            f"({record.recommendation or 'no recommendation'})"
+        )
@@ -0,0 +1,86 @@
+import asyncio
+from typing import Any, Optional
+
+from langchain.chat_models import init_chat_model
+from langchain_core.language_models import BaseChatModel
+
+from hr_screen_agent.configuration import Configuration
+from hr_screen_agent.llm import Priority, governed
+from hr_screen_agent.plans import prepare_interview_plan
+from hr_screen_agent.profile import prepare_fit_profile
+
+# Thread id -> the preparation tasks of its interview, by state key
+_preparations: dict[str, dict[str, asyncio.Task[dict[str, Any]]]] = {}
+
+
+def start_preparation(
+    thread_id: str,
+    configuration: Optional[Configuration] = None,
+    *,
+    profile_model: Optional[BaseChatModel] = None,
+    plan_model: Optional[BaseChatModel] = None,
+) -> None:
+    """Start writing what an interview needs before its first step.
+
+    Call this as soon as the job is dispatched, next to the pre-rendered
+    greeting: the role's interview plan and the candidate fit profile are
+    then loaded and written while the candidate joins, and the pre-model hook
+    only reads them (see `prepared`).
+
+    Args:
+        thread_id: Thread of the interview
+        configuration: Configuration of the interview, read from the
+            environment by default
+        profile_model: Chat model to use instead of the configured `fit_profile_model`
+        plan_model: Chat model to use instead of the configured `interview_plan_model`
+    """
+    configuration = configuration or Configuration.from_runnable_config()
+    tasks: dict[str, asyncio.Task[dict[str, Any]]] = {}
+    if configuration.interview_plan_cache:
+        tasks["interview_plan"] = asyncio.create_task(
+            prepare_interview_plan(
+                governed(
+                    plan_model
+                    or init_chat_model(
+                        configuration.interview_plan_model, max_retries=1
+                    ),
+                    Priority.AGENT,
+                    "interview_plan",
+                ),
+                configuration,
+            )
+        )
+    if configuration.fit_profile:
+        tasks["fit_profile"] = asyncio.create_task(
+            prepare_fit_profile(
+                governed(
+                    profile_model
+                    or init_chat_model(configuration.fit_profile_model, max_retries=1),
+                    Priority.AGENT,
+                    "fit_profile",
+                ),
+                configuration,
+            )
+        )
+    forget_preparation(thread_id)
+    _preparations[thread_id] = tasks
+
+
+async def prepared(thread_id: Optional[str], key: str) -> dict[str, Any]:
+    """Wait for a result of `start_preparation` on the thread.
+
+    Returns:
+        The result, or an empty dict when it was not started for the thread
+        or could not be written.
+    """
+    task = _preparations.get(thread_id or "", {}).get(key)
+    if task is None:
+        return {}
+    # A cancelled graph run must not cancel the preparation of the next one
+    return await asyncio.shield(task)
+
+
+def forget_preparation(thread_id: str) -> None:
+    """Cancel and drop the preparation of an interview that ended."""
+    for task in _preparations.pop(thread_id, {}).values():
+        task.cancel()
@@ -0,0 +1,105 @@
+import asyncio
+import logging
+import uuid
+from pathlib import Path
+from typing import Any, Mapping
+
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage, ToolMessage
+
+from hr_screen_agent.configuration import Configuration
+from hr_screen_agent.prompts import fit_profile_instructions, fit_profile_note
+from hr_screen_agent.tools.document_loader import read_document
+from hr_screen_agent.tools_and_schemas import FitProfile
+
+logger = logging.getLogger("vocalize-hr-screen-agent")
+
+INPUT_DIR = Path("input")
+
+# Name of the tool call the profile is added to the conversation with
+FIT_PROFILE_TOOL = "candidate_fit_profile"
+
+_SECTIONS = {
+    "matched_skills": "Matched requirements",
+    "missing_skills": "Missing requirements",
+    "experience_claims": "Claims to verify",
+    "gaps": "Gaps to ask about",
+    "logistics_questions": "Logistics to clarify",
+}
+
+
+def read_input_documents(input_dir: Path = INPUT_DIR) -> str:
+    """Read every document of the input folder into one text."""
+    if not input_dir.exists():
+        return ""
+    parts = []
+    for file_path in sorted(p for p in input_dir.glob("*") if p.is_file()):
+        content, file_type = read_document(file_path)
+        parts.append(f"=== {file_path.name} ({file_type}) ===\n{content}")
+    return "\n\n".join(parts)
+
+
+async def create_fit_profile(
+    llm: BaseChatModel, configuration: Configuration, documents: str
+) -> FitProfile:
+    """Analyse the candidate's documents against the job description."""
+    result = (
+        await llm.with_structured_output(FitProfile)
+        .with_config(run_name="fit_profile")
+        .ainvoke(
+            fit_profile_instructions.format(
+                company_name=configuration.company_name,
+                candidate_name=configuration.candidate_name,
+                job_role=configuration.job_role,
+                documents=documents,
+            )
+        )
+    )
+    return FitProfile.model_validate(result)
+
+
+async def prepare_fit_profile(
+    llm: BaseChatModel, configuration: Configuration
+) -> dict[str, Any]:
+    """Create the fit profile of the documents in the input folder.
+
+    Returns:
+        The profile, or an empty dict when there are no documents or the
+        analysis failed, so the agent reads the documents itself.
+    """
+    documents = await asyncio.to_thread(read_input_documents)
+    if not documents:
+        return {}
+    try:
+        profile = await create_fit_profile(llm, configuration, documents)
+    except Exception:
+        logger.exception("Failed to create the candidate fit profile")
+        return {}
+    return profile.model_dump()
+
+
+def format_fit_profile(profile: Mapping[str, Any]) -> str:
+    """Render a fit profile as compact Markdown for the agent."""
+    lines = [profile.get("fit_summary") or ""]
+    for field, title in _SECTIONS.items():
+        items = profile.get(field) or []
+        if items:
+            lines.append(f"\n**{title}**")
+            lines.extend(f"- {item}" for item in items)
+    return "\n".join(lines).strip()
+
+
+def fit_profile_messages(profile: Mapping[str, Any]) -> list[BaseMessage]:
+    """The messages that add the profile to the conversation, as a tool result."""
+    call_id = f"{FIT_PROFILE_TOOL}__{uuid.uuid4()}"
+    return [
+        AIMessage(
+            content="",
+            tool_calls=[{"name": FIT_PROFILE_TOOL, "args": {}, "id": call_id}],
+        ),
+        ToolMessage(
+            content=f"{fit_profile_note}\n\n{format_fit_profile(profile)}",
+            name=FIT_PROFILE_TOOL,
+            tool_call_id=call_id,
+        ),
+    ]
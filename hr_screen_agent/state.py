@@ -1,5 +1,5 @@
 from datetime import datetime
-from typing import Annotated, Optional
+from typing import Annotated, Any, Optional
 
 from langgraph.prebuilt.chat_agent_executor import AgentState
 
@@ -10,3 +10,14 @@ class HrScreenAgentState(AgentState):
     thoughts: Annotated[list[str], override_reducer]
     start_time: Optional[datetime]
     interview_summary: Optional[str]
+    # Current `InterviewPhase`, and the candidate turn it was entered at
+    phase: Optional[str]
+    phase_turn: Optional[int]
+    # Candidate vs job description analysis, see `FitProfile`
+    fit_profile: Optional[dict[str, Any]]
+    # Interview plan of the role, see `InterviewPlan`
+    interview_plan: Optional[dict[str, Any]]
+    # What the candidate and the agent said, as the guardrails read it
+    guardrail_transcript: Optional[dict[str, Any]]
+    # Tokens and estimated cost of the interview so far, see `UsageLedger`
+    token_usage: Optional[dict[str, Any]]
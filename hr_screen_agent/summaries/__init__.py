@@ -0,0 +1,13 @@
+from .store import (
+    RECOMMENDATIONS,
+    SummaryRecord,
+    SummaryStore,
+    parse_recommendation,
+)
+
+__all__ = [
+    "RECOMMENDATIONS",
+    "SummaryRecord",
+    "SummaryStore",
+    "parse_recommendation",
+]
@@ -0,0 +1,96 @@
+"""Query the interview summary store.
+
+just summaries search --role "Software Engineer" --recommendation proceed
+just summaries search "kubernetes AND startup"
+just summaries show <thread_id>
+just summaries stats
+"""
+
+import argparse
+import asyncio
+import os
+from datetime import datetime, timezone
+from pathlib import Path
+
+import aiosqlite
+
+from hr_screen_agent.summaries.store import (
+    RECOMMENDATIONS,
+    SummaryRecord,
+    SummaryStore,
+)
+
+
+def _since(value: str) -> float:
+    return datetime.fromisoformat(value).replace(tzinfo=timezone.utc).timestamp()
+
+
+def _format(record: SummaryRecord) -> str:
+    created = datetime.fromtimestamp(record.created_at, timezone.utc)
+    line = (
+        f"{created:%Y-%m-%d %H:%M}  {record.recommendation or '-':<8} "
+        f"{record.candidate_name} ({record.job_role})  {record.thread_id}"
+    )
+    if record.snippet:
+        line += f"\n    {record.snippet}"
+    return line
+
+
+async def main(args: argparse.Namespace) -> int:
+    async with SummaryStore(args.store) as store:
+        if args.command == "show":
+            record = await store.get(args.thread_id)
+            if record is None:
+                print(f"No summary for {args.thread_id}")
+                return 1
+            print(record.summary)
+        elif args.command == "stats":
+            for recommendation, count in (await store.counts(args.role)).items():
+                print(f"{recommendation:<8} {count}")
+        else:
+            try:
+                records = await store.search(
+                    args.query,
+                    job_role=args.role,
+                    recommendation=args.recommendation,
+                    since=args.since,
+                    limit=args.limit,
+                )
+            except aiosqlite.OperationalError as e:
+                print(f"Invalid search query: {e}")
+                return 2
+            for record in records:
+                print(_format(record))
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--store",
+        type=Path,
+        default=Path(os.getenv("SUMMARY_STORE", "summaries.db")),
+        help="SQLite database of the summaries (default: $SUMMARY_STORE)",
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    search = commands.add_parser("search", help="list matching summaries")
+    search.add_argument(
+        "query", nargs="?", help="full-text query (FTS5 syntax) over the summaries"
+    )
+    search.add_argument("--role", help="job role, ignoring case")
+    search.add_argument(
+        "--recommendation", type=str.capitalize, choices=RECOMMENDATIONS
+    )
+    search.add_argument(
+        "--since", type=_since, help="only summaries written on or after (ISO date)"
+    )
+    search.add_argument("--limit", type=int, default=20)
+
+    show = commands.add_parser("show", help="print the summary of a thread")
+    show.add_argument("thread_id")
+
+    stats = commands.add_parser("stats", help="count summaries by recommendation")
+    stats.add_argument("--role", help="job role, ignoring case")
+
+    raise SystemExit(asyncio.run(main(parser.parse_args())))
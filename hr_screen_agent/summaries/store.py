@@ -0,0 +1,249 @@
+import os
+import re
+import time
+from pathlib import Path
+from typing import Any, Optional
+
+import aiosqlite
+from pydantic import BaseModel
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS summaries (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    thread_id TEXT NOT NULL UNIQUE,
+    candidate_name TEXT NOT NULL,
+    company_name TEXT NOT NULL,
+    job_role TEXT NOT NULL,
+    recommendation TEXT,
+    summary TEXT NOT NULL,
+    created_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS summaries_role
+    ON summaries (job_role COLLATE NOCASE, recommendation, created_at);
+CREATE INDEX IF NOT EXISTS summaries_recommendation
+    ON summaries (recommendation, created_at);
+CREATE INDEX IF NOT EXISTS summaries_created_at ON summaries (created_at);
+
+CREATE VIRTUAL TABLE IF NOT EXISTS summaries_fts USING fts5(
+    candidate_name, job_role, summary, content='summaries', content_rowid='id'
+);
+CREATE TRIGGER IF NOT EXISTS summaries_ai AFTER INSERT ON summaries BEGIN
+    INSERT INTO summaries_fts (rowid, candidate_name, job_role, summary)
+    VALUES (new.id, new.candidate_name, new.job_role, new.summary);
+END;
+CREATE TRIGGER IF NOT EXISTS summaries_ad AFTER DELETE ON summaries BEGIN
+    INSERT INTO summaries_fts (summaries_fts, rowid, candidate_name, job_role, summary)
+    VALUES ('delete', old.id, old.candidate_name, old.job_role, old.summary);
+END;
+CREATE TRIGGER IF NOT EXISTS summaries_au AFTER UPDATE ON summaries BEGIN
+    INSERT INTO summaries_fts (summaries_fts, rowid, candidate_name, job_role, summary)
+    VALUES ('delete', old.id, old.candidate_name, old.job_role, old.summary);
+    INSERT INTO summaries_fts (rowid, candidate_name, job_role, summary)
+    VALUES (new.id, new.candidate_name, new.job_role, new.summary);
+END;
+"""
+
+_COLUMNS = (
+    "thread_id, candidate_name, company_name, job_role, recommendation, summary, "
+    "created_at"
+)
+
+RECOMMENDATIONS = ("Proceed", "Hold", "Reject")
+
+_RECOMMENDATION = re.compile(r"(overall\s+)?recommendation", re.IGNORECASE)
+_VERDICT = re.compile(r"\b(proceed|hold|reject)", re.IGNORECASE)
+
+
+def parse_recommendation(summary: str) -> Optional[str]:
+    """Find the overall recommendation of a summary: Proceed, Hold or Reject.
+
+    The verdict is the first of the three words after the "Overall
+    Recommendation" heading or label asked for by the summary structure in the
+    prompts, or after the first "Recommendation" if there is none.
+    """
+    labels = list(_RECOMMENDATION.finditer(summary))
+    if not labels:
+        return None
+    label = next((m for m in labels if m.group(1)), labels[0])
+    verdict = _VERDICT.search(summary, label.end(), label.end() + 300)
+    return verdict.group(1).capitalize() if verdict else None
+
+
+class SummaryRecord(BaseModel):
+    """A stored interview summary."""
+
+    thread_id: str
+    candidate_name: str
+    company_name: str
+    job_role: str
+    recommendation: Optional[str]
+    summary: str
+    created_at: float
+    # Matching excerpt of the summary, for full-text searches
+    snippet: Optional[str] = None
+
+
+class SummaryStore:
+    """Interview summaries in a local SQLite database, with full-text search.
+
+    Summaries are keyed by thread id: writing the summary of a thread again
+    replaces it. Each write is a single upsert, so readers never see a
+    partial summary. Lookups by role, recommendation and date use indexes,
+    and the summary text is indexed with FTS5.
+    """
+
+    def __init__(self, path: str | os.PathLike[str]) -> None:
+        self.path = Path(path)
+        self._db: Optional[aiosqlite.Connection] = None
+
+    async def __aenter__(self) -> "SummaryStore":
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._db = await aiosqlite.connect(self.path, isolation_level=None)
+        await self._db.execute("PRAGMA journal_mode=WAL")
+        await self._db.execute("PRAGMA busy_timeout=5000")
+        await self._db.executescript(_SCHEMA)
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        if self._db is not None:
+            await self._db.close()
+            self._db = None
+
+    @property
+    def db(self) -> aiosqlite.Connection:
+        if self._db is None:
+            raise RuntimeError("SummaryStore must be used as an async context manager")
+        return self._db
+
+    async def save(
+        self,
+        thread_id: str,
+        summary: str,
+        *,
+        candidate_name: str = "",
+        company_name: str = "",
+        job_role: str = "",
+    ) -> SummaryRecord:
+        """Store the summary of a thread, replacing the one stored before."""
+        record = SummaryRecord(
+            thread_id=thread_id,
+            candidate_name=candidate_name,
+            company_name=company_name,
+            job_role=job_role,
+            recommendation=parse_recommendation(summary),
+            summary=summary,
+            created_at=time.time(),
+        )
+        await self.db.execute(
+            f"""
+            INSERT INTO summaries ({_COLUMNS})
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT (thread_id) DO UPDATE SET
+                candidate_name = excluded.candidate_name,
+                company_name = excluded.company_name,
+                job_role = excluded.job_role,
+                recommendation = excluded.recommendation,
+                summary = excluded.summary,
+                created_at = excluded.created_at
+            """,
+            (
+                record.thread_id,
+                record.candidate_name,
+                record.company_name,
+                record.job_role,
+                record.recommendation,
+                record.summary,
+                record.created_at,
+            ),
+        )
+        return record
+
+    async def get(self, thread_id: str) -> Optional[SummaryRecord]:
+        async with self.db.execute(
+            f"SELECT {_COLUMNS} FROM summaries WHERE thread_id = ?", (thread_id,)
+        ) as cursor:
+            row = await cursor.fetchone()
+        return _record(row) if row is not None else None
+
+    async def search(
+        self,
+        query: Optional[str] = None,
+        *,
+        job_role: Optional[str] = None,
+        recommendation: Optional[str] = None,
+        since: Optional[float] = None,
+        limit: int = 20,
+    ) -> list[SummaryRecord]:
+        """Find summaries, newest first or by relevance to `query`.
+
+        Args:
+            query: FTS5 query over the candidate name, role and summary text
+            job_role: Exact job role, ignoring case
+            recommendation: Proceed, Hold or Reject
+            since: Only summaries written after this Unix time
+            limit: Maximum number of summaries returned
+        """
+        conditions: list[str] = []
+        params: list[Any] = []
+        if query:
+            conditions.append("summaries_fts MATCH ?")
+            params.append(query)
+        if job_role:
+            conditions.append("s.job_role = ? COLLATE NOCASE")
+            params.append(job_role)
+        if recommendation:
+            conditions.append("s.recommendation = ?")
+            params.append(recommendation.capitalize())
+        if since is not None:
+            conditions.append("s.created_at >= ?")
+            params.append(since)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        columns = ", ".join(f"s.{c.strip()}" for c in _COLUMNS.split(","))
+
+        if query:
+            sql = f"""
+                SELECT {columns}, snippet(summaries_fts, 2, '[', ']', '...', 12)
+                FROM summaries_fts JOIN summaries s ON s.id = summaries_fts.rowid
+                {where}
+                ORDER BY summaries_fts.rank
+                LIMIT ?
+            """
+        else:
+            sql = f"""
+                SELECT {columns}, NULL FROM summaries s
+                {where}
+                ORDER BY s.created_at DESC
+                LIMIT ?
+            """
+        async with self.db.execute(sql, (*params, limit)) as cursor:
+            rows = await cursor.fetchall()
+        return [_record(row) for row in rows]
+
+    async def counts(self, job_role: Optional[str] = None) -> dict[str, int]:
+        """Number of summaries by recommendation, optionally for one role."""
+        where, params = "", ()
+        if job_role:
+            where, params = "WHERE job_role = ? COLLATE NOCASE", (job_role,)
+        async with self.db.execute(
+            f"""
+            SELECT COALESCE(recommendation, 'Unknown'), COUNT(*) FROM summaries
+            {where}
+            GROUP BY recommendation
+            """,
+            params,
+        ) as cursor:
+            rows = await cursor.fetchall()
+        return dict(rows)
+
+
+def _record(row: Any) -> SummaryRecord:
+    return SummaryRecord(
+        thread_id=row[0],
+        candidate_name=row[1],
+        company_name=row[2],
+        job_role=row[3],
+        recommendation=row[4],
+        summary=row[5],
+        created_at=row[6],
+        snippet=row[7] if len(row) > 7 else None,
+    )
@@ -0,0 +1,15 @@
+from .checkpointer import TracingCheckpointer
+from .events import GraphEventLogger, TraceLevel
+from .metrics import start_metrics_server
+from .tracing import SessionTracer
+from .usage import UsageLedger, get_usage_ledger
+
+__all__ = [
+    "GraphEventLogger",
+    "SessionTracer",
+    "TraceLevel",
+    "TracingCheckpointer",
+    "UsageLedger",
+    "get_usage_ledger",
+    "start_metrics_server",
+]
@@ -0,0 +1,136 @@
+from typing import Any, AsyncIterator, Iterator, Optional, Sequence
+
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import (
+    BaseCheckpointSaver,
+    ChannelVersions,
+    Checkpoint,
+    CheckpointMetadata,
+    CheckpointTuple,
+)
+
+from hr_screen_agent.telemetry.metrics import CHECKPOINT_DURATION
+from hr_screen_agent.telemetry.tracing import SessionTracer, now_us
+
+
+class TracingCheckpointer(BaseCheckpointSaver):
+    """Checkpointer wrapper that times every read and write of the wrapped saver.
+
+    Durations go to the checkpoint histogram and, when the thread has a live
+    `SessionTracer`, into that session's Chrome trace.
+    """
+
+    def __init__(self, saver: BaseCheckpointSaver) -> None:
+        super().__init__(serde=saver.serde)
+        self.saver = saver
+
+    @property
+    def config_specs(self) -> list:
+        return self.saver.config_specs
+
+    def _record(self, operation: str, config: RunnableConfig, start_us: int) -> None:
+        end_us = now_us()
+        CHECKPOINT_DURATION.labels(operation=operation).observe(
+            (end_us - start_us) / 1_000_000
+        )
+        thread_id = config.get("configurable", {}).get("thread_id")
+        if tracer := SessionTracer.for_thread(thread_id):
+            tracer.add_span(operation, "checkpoint", start_us, end_us)
+
+    def get_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        start_us = now_us()
+        try:
+            return self.saver.get_tuple(config)
+        finally:
+            self._record("get_tuple", config, start_us)
+
+    def list(
+        self,
+        config: Optional[RunnableConfig],
+        *,
+        filter: Optional[dict[str, Any]] = None,
+        before: Optional[RunnableConfig] = None,
+        limit: Optional[int] = None,
+    ) -> Iterator[CheckpointTuple]:
+        return self.saver.list(config, filter=filter, before=before, limit=limit)
+
+    def put(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        start_us = now_us()
+        try:
+            return self.saver.put(config, checkpoint, metadata, new_versions)
+        finally:
+            self._record("put", config, start_us)
+
+    def put_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        start_us = now_us()
+        try:
+            self.saver.put_writes(config, writes, task_id, task_path)
+        finally:
+            self._record("put_writes", config, start_us)
+
+    def delete_thread(self, thread_id: str) -> None:
+        self.saver.delete_thread(thread_id)
+
+    async def aget_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        start_us = now_us()
+        try:
+            return await self.saver.aget_tuple(config)
+        finally:
+            self._record("get_tuple", config, start_us)
+
+    async def alist(
+        self,
+        config: Optional[RunnableConfig],
+        *,
+        filter: Optional[dict[str, Any]] = None,
+        before: Optional[RunnableConfig] = None,
+        limit: Optional[int] = None,
+    ) -> AsyncIterator[CheckpointTuple]:
+        async for item in self.saver.alist(
+            config, filter=filter, before=before, limit=limit
+        ):
+            yield item
+
+    async def aput(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        start_us = now_us()
+        try:
+            return await self.saver.aput(config, checkpoint, metadata, new_versions)
+        finally:
+            self._record("put", config, start_us)
+
+    async def aput_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        start_us = now_us()
+        try:
+            await self.saver.aput_writes(config, writes, task_id, task_path)
+        finally:
+            self._record("put_writes", config, start_us)
+
+    async def adelete_thread(self, thread_id: str) -> None:
+        await self.saver.adelete_thread(thread_id)
+
+    def get_next_version(self, current: Any, channel: None) -> Any:
+        return self.saver.get_next_version(current, channel)
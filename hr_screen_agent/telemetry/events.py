@@ -0,0 +1,252 @@
+import atexit
+import functools
+import hashlib
+import json
+import logging
+import logging.handlers
+import queue
+import random
+import sys
+import time
+from enum import Enum
+from typing import Any, Optional
+from uuid import UUID
+
+from langchain_core.callbacks import AsyncCallbackHandler
+from langchain_core.messages import BaseMessage
+from langgraph.types import Command
+
+from hr_screen_agent.llm.base import DELEGATE_TAG
+from hr_screen_agent.telemetry.usage import message_usage
+
+# Structured graph events, one JSON object per line
+events_logger = logging.getLogger("vocalize-hr-screen-agent.events")
+
+
+class TraceLevel(str, Enum):
+    """How much of a session's graph runs is logged."""
+
+    OFF = "off"
+    # Compact events: node, duration, message and token counts, payload hashes
+    EVENTS = "events"
+    # Events plus the full state each node receives
+    FULL = "full"
+
+
+@functools.cache
+def _start_event_handler() -> None:
+    """Log events from a background thread, so sessions never wait on stdout."""
+    records: queue.SimpleQueue[logging.LogRecord] = queue.SimpleQueue()
+    stream = logging.StreamHandler(sys.stdout)
+    stream.setFormatter(logging.Formatter("%(message)s"))
+    listener = logging.handlers.QueueListener(records, stream)
+    listener.start()
+    atexit.register(listener.stop)
+    events_logger.addHandler(logging.handlers.QueueHandler(records))
+    events_logger.setLevel(logging.INFO)
+    events_logger.propagate = False
+
+
+def payload_digest(payload: Any) -> dict[str, Any]:
+    """Size and truncated SHA-256 of a payload, to correlate without logging it."""
+    data = str(payload).encode("utf-8", "replace")
+    return {"size": len(data), "sha": hashlib.sha256(data).hexdigest()[:12]}
+
+
+def _messages(payload: Any) -> list[BaseMessage]:
+    """Messages in a node's input or output (a dict, a Command or a list of them)."""
+    if isinstance(payload, list):
+        return [m for item in payload for m in _messages(item)]
+    update = payload.update if isinstance(payload, Command) else payload
+    if isinstance(update, dict):
+        messages = update.get("messages") or []
+        return [m for m in messages if isinstance(m, BaseMessage)]
+    return []
+
+
+class GraphEventLogger(AsyncCallbackHandler):
+    """Structured, sampled logging of a session's graph runs.
+
+    Replaces `debug=True`, which pretty-prints the whole state, documents
+    included, on every super-step. At `TraceLevel.EVENTS` every node, tool
+    and chat model call is logged as one compact JSON line. Sessions that are
+    sampled (`full_sample_rate`) or flagged, by `flag` or by an error, are
+    logged at `TraceLevel.FULL` and also include the state each node gets.
+    A node error or a tripped guardrail flags the session.
+    Records are written by a background thread.
+    """
+
+    def __init__(
+        self,
+        thread_id: str,
+        level: TraceLevel = TraceLevel.EVENTS,
+        full_sample_rate: float = 0.0,
+    ) -> None:
+        self.thread_id = thread_id
+        self.level = level
+        if level is not TraceLevel.OFF and random.random() < full_sample_rate:
+            self.level = TraceLevel.FULL
+        self._open: dict[UUID, tuple[str, str, float]] = {}
+        if self.level is not TraceLevel.OFF:
+            _start_event_handler()
+
+    def flag(self) -> None:
+        """Log the rest of the session in full."""
+        if self.level is not TraceLevel.OFF:
+            self.level = TraceLevel.FULL
+
+    def emit(self, event: str, **fields: Any) -> None:
+        if self.level is TraceLevel.OFF:
+            return
+        events_logger.info(
+            json.dumps(
+                {"event": event, "thread_id": self.thread_id, **fields},
+                default=str,
+            )
+        )
+
+    def _close(self, run_id: UUID) -> Optional[tuple[str, float]]:
+        opened = self._open.pop(run_id, None)
+        if opened is None:
+            return None
+        _, name, started = opened
+        return name, round((time.perf_counter() - started) * 1000, 2)
+
+    # Graph nodes
+
+    async def on_chain_start(
+        self,
+        serialized: dict[str, Any],
+        inputs: dict[str, Any],
+        *,
+        run_id: UUID,
+        metadata: Optional[dict[str, Any]] = None,
+        **kwargs: Any,
+    ) -> None:
+        node = (metadata or {}).get("langgraph_node")
+        # nested runnables inherit the node metadata, only log the node itself
+        if not node or kwargs.get("name") != node or self.level is TraceLevel.OFF:
+            return
+        self._open[run_id] = ("node", node, time.perf_counter())
+        if self.level is TraceLevel.FULL:
+            self.emit(
+                "state",
+                node=node,
+                step=(metadata or {}).get("langgraph_step"),
+                state=inputs,
+            )
+
+    async def on_chain_end(self, outputs: Any, *, run_id: UUID, **kwargs: Any) -> None:
+        closed = self._close(run_id)
+        if closed is None:
+            return
+        node, duration_ms = closed
+        messages = _messages(outputs)
+        if any(
+            call["name"].endswith("guardrail_check")
+            for m in messages
+            for call in getattr(m, "tool_calls", None) or []
+        ):
+            self.flag()
+        usage = [message_usage(m) for m in messages]
+        self.emit(
+            "node",
+            node=node,
+            duration_ms=duration_ms,
+            messages=len(messages),
+            input_tokens=sum(u[0] for u in usage),
+            output_tokens=sum(u[1] for u in usage),
+            payload=payload_digest(outputs),
+        )
+
+    async def on_chain_error(
+        self, error: BaseException, *, run_id: UUID, **kwargs: Any
+    ) -> None:
+        closed = self._close(run_id)
+        if closed is None:
+            return
+        node, duration_ms = closed
+        self.emit("node", node=node, duration_ms=duration_ms, error=repr(error))
+        # Log the rest of a session that failed in full
+        self.flag()
+
+    # Tools
+
+    async def on_tool_start(
+        self,
+        serialized: dict[str, Any],
+        input_str: str,
+        *,
+        run_id: UUID,
+        **kwargs: Any,
+    ) -> None:
+        if self.level is TraceLevel.OFF:
+            return
+        name = kwargs.get("name") or serialized.get("name") or "tool"
+        self._open[run_id] = ("tool", name, time.perf_counter())
+
+    async def on_tool_end(self, output: Any, *, run_id: UUID, **kwargs: Any) -> None:
+        closed = self._close(run_id)
+        if closed is not None:
+            tool, duration_ms = closed
+            self.emit(
+                "tool",
+                tool=tool,
+                duration_ms=duration_ms,
+                payload=payload_digest(output),
+            )
+
+    async def on_tool_error(
+        self, error: BaseException, *, run_id: UUID, **kwargs: Any
+    ) -> None:
+        closed = self._close(run_id)
+        if closed is not None:
+            tool, duration_ms = closed
+            self.emit("tool", tool=tool, duration_ms=duration_ms, error=repr(error))
+
+    # Chat models
+
+    async def on_chat_model_start(
+        self,
+        serialized: dict[str, Any],
+        messages: list[list[Any]],
+        *,
+        run_id: UUID,
+        tags: Optional[list[str]] = None,
+        metadata: Optional[dict[str, Any]] = None,
+        **kwargs: Any,
+    ) -> None:
+        # Calls made by a wrapper model are logged once, on the wrapper
+        if DELEGATE_TAG in (tags or []) or self.level is TraceLevel.OFF:
+            return
+        metadata = metadata or {}
+        if guardrail := metadata.get("guardrail"):
+            caller = f"{guardrail}_guardrail"
+        else:
+            caller = metadata.get("langgraph_node") or "model"
+        self._open[run_id] = ("model", caller, time.perf_counter())
+
+    async def on_llm_end(self, response: Any, *, run_id: UUID, **kwargs: Any) -> None:
+        closed = self._close(run_id)
+        if closed is None:
+            return
+        caller, duration_ms = closed
+        generations = [g for gs in response.generations for g in gs]
+        usage = [message_usage(getattr(g, "message", None)) for g in generations]
+        self.emit(
+            "model",
+            caller=caller,
+            duration_ms=duration_ms,
+            input_tokens=sum(u[0] for u in usage),
+            output_tokens=sum(u[1] for u in usage),
+        )
+
+    async def on_llm_error(
+        self, error: BaseException, *, run_id: UUID, **kwargs: Any
+    ) -> None:
+        closed = self._close(run_id)
+        if closed is not None:
+            caller, duration_ms = closed
+            self.emit(
+                "model", caller=caller, duration_ms=duration_ms, error=repr(error)
+            )
@@ -0,0 +1,228 @@
+import os
+
+from prometheus_client import (
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    multiprocess,
+    start_http_server,
+)
+
+# Buckets tuned for conversational latency, from a few milliseconds up to the
+# point where a candidate clearly notices the pause.
+LATENCY_BUCKETS = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    0.75,
+    1.0,
+    1.5,
+    2.0,
+    3.0,
+    4.0,
+    6.0,
+    8.0,
+    12.0,
+    20.0,
+)
+
+NODE_DURATION = Histogram(
+    "hr_screen_node_duration_seconds",
+    "Duration of each agent graph node.",
+    ["node"],
+    buckets=LATENCY_BUCKETS,
+)
+TOOL_DURATION = Histogram(
+    "hr_screen_tool_duration_seconds",
+    "Duration of each tool call.",
+    ["tool"],
+    buckets=LATENCY_BUCKETS,
+)
+MODEL_DURATION = Histogram(
+    "hr_screen_model_duration_seconds",
+    "Duration of each chat model call, by caller (agent or guardrail).",
+    ["caller"],
+    buckets=LATENCY_BUCKETS,
+)
+GUARDRAIL_DURATION = Histogram(
+    "hr_screen_guardrail_duration_seconds",
+    "Duration of each guardrail call, by guardrail and stage: verdict, redirect (blocked turns only) or full (verdict with reasoning).",
+    ["guardrail", "stage"],
+    buckets=LATENCY_BUCKETS,
+)
+ROUTED_CALLS = Counter(
+    "hr_screen_routed_calls_total",
+    "Agent model calls by the tier they were routed to (fast or main) and the reason.",
+    ["tier", "reason"],
+)
+CHECKPOINT_DURATION = Histogram(
+    "hr_screen_checkpoint_duration_seconds",
+    "Duration of checkpoint reads and writes.",
+    ["operation"],
+    buckets=LATENCY_BUCKETS,
+)
+TURN_LATENCY = Histogram(
+    "hr_screen_turn_latency_seconds",
+    "Voice turn latency stages: end of user speech to first token, first token to first audio, and end of user speech to first audio.",
+    ["stage"],
+    buckets=LATENCY_BUCKETS,
+)
+GRAPH_RUNS_CANCELLED = Counter(
+    "hr_screen_graph_runs_cancelled_total",
+    "Agent graph runs cancelled because the candidate interrupted.",
+)
+SPECULATIONS = Counter(
+    "hr_screen_speculations_total",
+    "Speculative graph runs by outcome: committed, discarded (transcript changed) or stale.",
+    ["outcome"],
+)
+SPECULATION_LEAD = Histogram(
+    "hr_screen_speculation_lead_seconds",
+    "How long a committed speculative run had been running when the turn was final.",
+    buckets=LATENCY_BUCKETS,
+)
+LLM_FIRST_TOKEN = Histogram(
+    "hr_screen_llm_first_token_seconds",
+    "Time to first token of the agent model, for hedged requests and for the "
+    "unhedged control group. The p99 difference between the two is the hedging gain.",
+    ["group"],
+    buckets=LATENCY_BUCKETS,
+)
+HEDGE_REQUESTS = Counter(
+    "hr_screen_llm_hedge_requests_total",
+    "Agent model requests by hedging outcome: control, not_hedged, primary_won or hedge_won.",
+    ["outcome"],
+)
+HEDGE_EXTRA_INPUT_TOKENS = Counter(
+    "hr_screen_llm_hedge_extra_input_tokens_total",
+    "Approximate input tokens sent in duplicate (hedge) requests.",
+)
+GOVERNOR_QUEUE_DELAY = Histogram(
+    "hr_screen_gemini_queue_delay_seconds",
+    "Time a Gemini call waited for the rate limiter, by caller and priority.",
+    ["caller", "priority"],
+    buckets=LATENCY_BUCKETS,
+)
+GOVERNOR_QUEUED = Gauge(
+    "hr_screen_gemini_queued_calls",
+    "Gemini calls waiting for the rate limiter.",
+    multiprocess_mode="livesum",
+)
+GOVERNOR_INFLIGHT = Gauge(
+    "hr_screen_gemini_inflight_calls",
+    "Gemini calls in flight.",
+    multiprocess_mode="livesum",
+)
+GOVERNOR_RETRIES = Counter(
+    "hr_screen_gemini_retries_total",
+    "Gemini calls retried by the rate limiter, by caller and HTTP status.",
+    ["caller", "status"],
+)
+
+TTS_CACHE_LOOKUPS = Counter(
+    "hr_screen_tts_cache_lookups_total",
+    "Utterances looked up in the local TTS audio cache, by result: hit or miss.",
+    ["result"],
+)
+FILLERS_PLAYED = Counter(
+    "hr_screen_fillers_played_total",
+    "Filler phrases played to mask a slow tool call.",
+)
+
+GREETING_DELAY = Histogram(
+    "hr_screen_greeting_delay_seconds",
+    "Time from the candidate's audio track being subscribed to the greeting "
+    "starting, for pre-rendered greetings, resumed interviews and the live fallback.",
+    ["source"],
+    buckets=LATENCY_BUCKETS,
+)
+
+POST_CALL_JOBS = Counter(
+    "hr_screen_post_call_jobs_total",
+    "Post-call summary jobs by outcome: done, retried or failed.",
+    ["outcome"],
+)
+POST_CALL_QUEUE_DELAY = Histogram(
+    "hr_screen_post_call_queue_delay_seconds",
+    "Time from the end of a call to a worker starting its summary.",
+    buckets=(1, 5, 15, 30, 60, 120, 300, 600, 1800, 3600),
+)
+POST_CALL_DURATION = Histogram(
+    "hr_screen_post_call_duration_seconds",
+    "Time a worker spent generating and saving a summary.",
+    buckets=LATENCY_BUCKETS + (30.0, 60.0, 120.0),
+)
+
+TOKENS_USED = Counter(
+    "hr_screen_tokens_total",
+    "Gemini tokens used, by caller (agent, guardrail, web_search, ...) and kind: input, output, or cached (input read from a context cache).",
+    ["caller", "kind"],
+)
+TOKEN_COST = Counter(
+    "hr_screen_token_cost_usd_total",
+    "Estimated Gemini cost in USD at list prices, by caller.",
+    ["caller"],
+)
+TOOL_TIMEOUTS = Counter(
+    "hr_screen_tool_timeouts_total",
+    "Tool calls answered with an error because they ran past their timeout, by tool.",
+    ["tool"],
+)
+TOOL_CONTEXT_TOKENS = Counter(
+    "hr_screen_tool_context_tokens_total",
+    "Approximate tokens tool results added to the conversation, by tool.",
+    ["tool"],
+)
+TOKEN_BUDGETS_REACHED = Counter(
+    "hr_screen_token_budgets_reached_total",
+    "Interviews that reached their soft or hard token budget.",
+    ["budget"],
+)
+CONTEXT_CACHE_LOOKUPS = Counter(
+    "hr_screen_context_cache_lookups_total",
+    "Prompt prefixes looked up in the context cache, by result: hit, created, refreshed or error.",
+    ["result"],
+)
+INTERVIEW_PLAN_LOOKUPS = Counter(
+    "hr_screen_interview_plan_lookups_total",
+    "Interview plans looked up in the per-role plan cache, by result: hit, miss or error.",
+    ["result"],
+)
+
+
+EVENT_LOOP_LAG = Gauge(
+    "hr_screen_event_loop_lag_seconds",
+    "Largest event-loop lag of a job process over the last few seconds.",
+    multiprocess_mode="livemax",
+)
+WORKER_LOAD = Gauge(
+    "hr_screen_worker_load",
+    "Load reported to LiveKit, by resource: cpu, memory, loop_lag or total.",
+    ["resource"],
+    multiprocess_mode="livemax",
+)
+SESSION_COST = Gauge(
+    "hr_screen_session_cost",
+    "Calibrated cost of one session, by resource: cpu (cores) or memory (bytes).",
+    ["resource"],
+    multiprocess_mode="livemax",
+)
+
+
+def start_metrics_server(port: int, addr: str = "127.0.0.1") -> None:
+    """Expose the metrics in Prometheus format on `http://{addr}:{port}/metrics`.
+
+    When `PROMETHEUS_MULTIPROC_DIR` is set, the metrics of all job processes
+    are aggregated, so the worker exposes a single endpoint for every session.
+    """
+    registry = REGISTRY
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    start_http_server(port, addr=addr, registry=registry)
@@ -0,0 +1,212 @@
+import json
+import os
+import time
+import weakref
+from pathlib import Path
+from typing import Any, Optional
+from uuid import UUID
+
+from langchain_core.callbacks import AsyncCallbackHandler
+
+from hr_screen_agent.llm.base import DELEGATE_TAG
+from hr_screen_agent.telemetry.metrics import (
+    MODEL_DURATION,
+    NODE_DURATION,
+    TOOL_DURATION,
+    TURN_LATENCY,
+)
+
+
+def now_us() -> int:
+    return time.perf_counter_ns() // 1000
+
+
+class SessionTracer(AsyncCallbackHandler):
+    """Per-session latency tracer.
+
+    Times every graph node, tool call, chat model call and checkpoint
+    operation through LangGraph callbacks, plus the voice turn stages (end of
+    user speech -> first token -> first audio). Each span is observed in the
+    Prometheus histograms and recorded as a Chrome trace event, so a single
+    interview can be inspected in `chrome://tracing` or Perfetto.
+    """
+
+    _by_thread: "weakref.WeakValueDictionary[str, SessionTracer]" = (
+        weakref.WeakValueDictionary()
+    )
+
+    def __init__(self, thread_id: str) -> None:
+        self.thread_id = thread_id
+        self.events: list[dict[str, Any]] = []
+        self._open: dict[UUID, tuple[str, str, int]] = {}
+        self._next_id = 0
+        self._end_of_speech: Optional[int] = None
+        self._first_token: Optional[int] = None
+        SessionTracer._by_thread[thread_id] = self
+
+    @classmethod
+    def for_thread(cls, thread_id: Optional[str]) -> Optional["SessionTracer"]:
+        """Return the live tracer of a thread, if any."""
+        return cls._by_thread.get(thread_id) if thread_id else None
+
+    def add_span(
+        self,
+        name: str,
+        category: str,
+        start_us: int,
+        end_us: int,
+        args: Optional[dict[str, Any]] = None,
+    ) -> None:
+        """Record a span as a pair of Chrome trace async events."""
+        self._next_id += 1
+        event = {"name": name, "cat": category, "id": self._next_id, "pid": 1}
+        self.events.append({**event, "ph": "b", "ts": start_us, "args": args or {}})
+        self.events.append({**event, "ph": "e", "ts": end_us})
+
+    def dump(self, directory: str | os.PathLike) -> Path:
+        """Write the session's Chrome trace JSON to `directory`."""
+        path = Path(directory) / f"{self.thread_id}.trace.json"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(
+            json.dumps(
+                {
+                    "traceEvents": self.events,
+                    "displayTimeUnit": "ms",
+                    "otherData": {"thread_id": self.thread_id},
+                }
+            )
+        )
+        return path
+
+    # Graph nodes
+
+    async def on_chain_start(
+        self,
+        serialized: dict[str, Any],
+        inputs: dict[str, Any],
+        *,
+        run_id: UUID,
+        metadata: Optional[dict[str, Any]] = None,
+        **kwargs: Any,
+    ) -> None:
+        node = (metadata or {}).get("langgraph_node")
+        # nested runnables inherit the node metadata, only time the node itself
+        if node and kwargs.get("name") == node:
+            self._open[run_id] = ("node", node, now_us())
+
+    async def on_chain_end(
+        self, outputs: dict[str, Any], *, run_id: UUID, **kwargs: Any
+    ) -> None:
+        self._close(run_id)
+
+    async def on_chain_error(
+        self, error: BaseException, *, run_id: UUID, **kwargs: Any
+    ) -> None:
+        self._close(run_id, error=error)
+
+    # Tools
+
+    async def on_tool_start(
+        self,
+        serialized: dict[str, Any],
+        input_str: str,
+        *,
+        run_id: UUID,
+        **kwargs: Any,
+    ) -> None:
+        name = kwargs.get("name") or serialized.get("name") or "tool"
+        self._open[run_id] = ("tool", name, now_us())
+
+    async def on_tool_end(self, output: Any, *, run_id: UUID, **kwargs: Any) -> None:
+        self._close(run_id)
+
+    async def on_tool_error(
+        self, error: BaseException, *, run_id: UUID, **kwargs: Any
+    ) -> None:
+        self._close(run_id, error=error)
+
+    # Chat models
+
+    async def on_chat_model_start(
+        self,
+        serialized: dict[str, Any],
+        messages: list[list[Any]],
+        *,
+        run_id: UUID,
+        tags: Optional[list[str]] = None,
+        metadata: Optional[dict[str, Any]] = None,
+        **kwargs: Any,
+    ) -> None:
+        # Calls made by a wrapper model (e.g. hedging) are timed by the wrapper
+        if DELEGATE_TAG in (tags or []):
+            return
+        metadata = metadata or {}
+        if guardrail := metadata.get("guardrail"):
+            caller = f"{guardrail}_guardrail"
+        else:
+            caller = metadata.get("langgraph_node") or "model"
+        self._open[run_id] = ("model", caller, now_us())
+
+    async def on_llm_end(self, response: Any, *, run_id: UUID, **kwargs: Any) -> None:
+        self._close(run_id)
+
+    async def on_llm_error(
+        self, error: BaseException, *, run_id: UUID, **kwargs: Any
+    ) -> None:
+        self._close(run_id, error=error)
+
+    def _close(self, run_id: UUID, error: Optional[BaseException] = None) -> None:
+        opened = self._open.pop(run_id, None)
+        if opened is None:
+            return
+        category, name, start_us = opened
+        end_us = now_us()
+        duration = (end_us - start_us) / 1_000_000
+        if category == "node":
+            NODE_DURATION.labels(node=name).observe(duration)
+        elif category == "tool":
+            TOOL_DURATION.labels(tool=name).observe(duration)
+        else:
+            MODEL_DURATION.labels(caller=name).observe(duration)
+        args = {"error": repr(error)} if error else None
+        self.add_span(name, category, start_us, end_us, args)
+
+    # Voice turn stages, driven by LiveKit session events
+
+    def mark_end_of_speech(self) -> None:
+        self._end_of_speech = now_us()
+        self._first_token = None
+
+    def mark_first_token(self) -> None:
+        if self._end_of_speech is None or self._first_token is not None:
+            return
+        self._first_token = now_us()
+        TURN_LATENCY.labels(stage="end_of_speech_to_first_token").observe(
+            (self._first_token - self._end_of_speech) / 1_000_000
+        )
+        self.add_span(
+            "end_of_speech_to_first_token",
+            "voice",
+            self._end_of_speech,
+            self._first_token,
+        )
+
+    def mark_first_audio(self) -> None:
+        if self._end_of_speech is None:
+            return
+        first_audio = now_us()
+        if self._first_token is not None:
+            TURN_LATENCY.labels(stage="first_token_to_first_audio").observe(
+                (first_audio - self._first_token) / 1_000_000
+            )
+            self.add_span(
+                "first_token_to_first_audio", "voice", self._first_token, first_audio
+            )
+        TURN_LATENCY.labels(stage="end_of_speech_to_first_audio").observe(
+            (first_audio - self._end_of_speech) / 1_000_000
+        )
+        self.add_span(
+            "end_of_speech_to_first_audio", "voice", self._end_of_speech, first_audio
+        )
+        self._end_of_speech = None
+        self._first_token = None
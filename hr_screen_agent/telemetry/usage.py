@@ -0,0 +1,162 @@
+import functools
+from collections import defaultdict
+from typing import Any, Mapping, Optional
+
+from hr_screen_agent.telemetry.metrics import (
+    TOKEN_COST,
+    TOKENS_USED,
+    TOOL_CONTEXT_TOKENS,
+)
+
+# Gemini list prices in USD per million input and output tokens, matched by the
+# most specific model name fragment. Unknown models are counted without a cost.
+MODEL_PRICES: dict[str, tuple[float, float]] = {
+    "gemini-2.5-flash-lite": (0.10, 0.40),
+    "gemini-2.5-flash": (0.30, 2.50),
+    "gemini-2.5-pro": (1.25, 10.00),
+    "gemini-2.0-flash-lite": (0.075, 0.30),
+    "gemini-2.0-flash": (0.10, 0.40),
+}
+# Input tokens read from a context cache are billed at a quarter of the price
+CACHED_INPUT_PRICE_RATIO = 0.25
+
+
+def token_cost(
+    model: Optional[str],
+    input_tokens: int,
+    output_tokens: int,
+    cached_tokens: int = 0,
+) -> float:
+    """Estimate the cost in USD of a call to `model`.
+
+    `cached_tokens` is the part of `input_tokens` read from a context cache.
+    """
+    if not model:
+        return 0.0
+    for name in sorted(MODEL_PRICES, key=len, reverse=True):
+        if name in model:
+            input_price, output_price = MODEL_PRICES[name]
+            input_cost = (
+                input_tokens - cached_tokens * (1 - CACHED_INPUT_PRICE_RATIO)
+            ) * input_price
+            return (input_cost + output_tokens * output_price) / 1e6
+    return 0.0
+
+
+def _empty_usage() -> dict[str, Any]:
+    return {
+        "calls": 0,
+        "input_tokens": 0,
+        "output_tokens": 0,
+        "cached_tokens": 0,
+        "cost_usd": 0.0,
+    }
+
+
+class UsageLedger:
+    """Token usage and estimated cost of every interview in this process.
+
+    Model calls are recorded per thread by the caller that made them (agent,
+    guardrail, web_search, ...) and by the graph node they ran in. Tool
+    results are recorded by the tokens they add to the conversation, since
+    documents and think logs are re-sent with every later model call.
+
+    The pre-model hook stores each thread's totals in the agent state, so
+    they are checkpointed with the conversation and restored on resume.
+    """
+
+    def __init__(self) -> None:
+        self._threads: dict[str, dict[str, Any]] = {}
+        self._counted: dict[str, set[str]] = defaultdict(set)
+
+    def usage(self, thread_id: str) -> dict[str, Any]:
+        """The totals of a thread, as stored in the agent state."""
+        return self._threads.setdefault(
+            thread_id,
+            {
+                **_empty_usage(),
+                "by_caller": {},
+                "by_node": {},
+                "context_by_tool": {},
+            },
+        )
+
+    def restore(self, thread_id: str, usage: Optional[Mapping[str, Any]]) -> None:
+        """Seed a thread's totals from its checkpoint, unless already tracked."""
+        if usage and thread_id not in self._threads:
+            self._threads[thread_id] = {
+                **usage,
+                "by_caller": {k: dict(v) for k, v in usage["by_caller"].items()},
+                "by_node": {k: dict(v) for k, v in usage["by_node"].items()},
+                "context_by_tool": dict(usage["context_by_tool"]),
+            }
+
+    def total_tokens(self, thread_id: Optional[str]) -> int:
+        if thread_id is None or thread_id not in self._threads:
+            return 0
+        usage = self._threads[thread_id]
+        return usage["input_tokens"] + usage["output_tokens"]
+
+    def record_call(
+        self,
+        thread_id: Optional[str],
+        caller: str,
+        *,
+        node: Optional[str] = None,
+        model: Optional[str] = None,
+        input_tokens: int = 0,
+        output_tokens: int = 0,
+        cached_tokens: int = 0,
+    ) -> None:
+        """Record the tokens of one model call."""
+        cost = token_cost(model, input_tokens, output_tokens, cached_tokens)
+        TOKENS_USED.labels(caller=caller, kind="input").inc(input_tokens)
+        TOKENS_USED.labels(caller=caller, kind="output").inc(output_tokens)
+        TOKENS_USED.labels(caller=caller, kind="cached").inc(cached_tokens)
+        TOKEN_COST.labels(caller=caller).inc(cost)
+        if thread_id is None:
+            return
+
+        usage = self.usage(thread_id)
+        entries = [usage, usage["by_caller"].setdefault(caller, _empty_usage())]
+        if node:
+            entries.append(usage["by_node"].setdefault(node, _empty_usage()))
+        for entry in entries:
+            entry["calls"] += 1
+            entry["input_tokens"] += input_tokens
+            entry["output_tokens"] += output_tokens
+            entry["cached_tokens"] = entry.get("cached_tokens", 0) + cached_tokens
+            entry["cost_usd"] += cost
+
+    def record_context(
+        self, thread_id: str, tool: str, message_id: str, tokens: int
+    ) -> None:
+        """Record the tokens a tool result adds to the conversation, once."""
+        if message_id in self._counted[thread_id]:
+            return
+        self._counted[thread_id].add(message_id)
+        TOOL_CONTEXT_TOKENS.labels(tool=tool).inc(tokens)
+        context = self.usage(thread_id)["context_by_tool"]
+        context[tool] = context.get(tool, 0) + tokens
+
+    def forget(self, thread_id: str) -> None:
+        self._threads.pop(thread_id, None)
+        self._counted.pop(thread_id, None)
+
+
+@functools.cache
+def get_usage_ledger() -> UsageLedger:
+    """Return the ledger shared by every interview of this process."""
+    return UsageLedger()
+
+
+def message_usage(message: Any) -> tuple[int, int]:
+    """Input and output tokens reported on a chat model response."""
+    usage = getattr(message, "usage_metadata", None) or {}
+    return usage.get("input_tokens", 0), usage.get("output_tokens", 0)
+
+
+def cached_tokens(message: Any) -> int:
+    """Input tokens of a chat model response that were read from a context cache."""
+    usage = getattr(message, "usage_metadata", None) or {}
+    return (usage.get("input_token_details") or {}).get("cache_read", 0)
@@ -1,7 +1,6 @@
 from pathlib import Path
 from typing import Annotated
 
-import pdfplumber
 from langchain_core.messages import ToolMessage
 from langchain_core.tools import InjectedToolCallId, tool
 from langgraph.types import Command
@@ -9,6 +8,9 @@ from langgraph.types import Command
 
 def _read_pdf_file(file_path: Path) -> str:
     """Helper function to read PDF files."""
+    # Imported on first use, so workers start without pdfplumber and pdfminer
+    import pdfplumber
+
     try:
         with pdfplumber.open(file_path) as pdf:
             text_parts = []
@@ -30,6 +32,24 @@ def _read_text_file(file_path: Path) -> str:
         return f"Error reading text file: {str(e)}"
 
 
+def read_document(file_path: Path) -> tuple[str, str]:
+    """Read a document of the input folder, by its file type.
+
+    Returns:
+        The content of the document and its file type.
+    """
+    suffix = file_path.suffix.lower()
+
+    if suffix == ".pdf":
+        return _read_pdf_file(file_path), "PDF"
+    elif suffix in [".md", ".markdown"]:
+        return _read_text_file(file_path), "Markdown"
+    elif suffix in [".txt", ".text"]:
+        return _read_text_file(file_path), "Text"
+    # Try to read as text file for other extensions
+    return _read_text_file(file_path), f"{suffix[1:].upper() if suffix else 'Unknown'}"
+
+
 @tool(
     "list_input_files",
     description="List all files in the input folder. Shows filename, file type, and size to help choose which files to read.",
@@ -169,22 +189,7 @@ def read_input_file(
             }
         )
 
-    # Determine file type and read accordingly
-    suffix = file_path.suffix.lower()
-
-    if suffix == ".pdf":
-        file_content = _read_pdf_file(file_path)
-        file_type = "PDF"
-    elif suffix in [".md", ".markdown"]:
-        file_content = _read_text_file(file_path)
-        file_type = "Markdown"
-    elif suffix in [".txt", ".text"]:
-        file_content = _read_text_file(file_path)
-        file_type = "Text"
-    else:
-        # Try to read as text file for other extensions
-        file_content = _read_text_file(file_path)
-        file_type = f"{suffix[1:].upper() if suffix else 'Unknown'}"
+    file_content, file_type = read_document(file_path)
 
     # Format the response
     content = f"=== {filename} ({file_type}) ===\n{file_content}"
@@ -1,23 +1,26 @@
-from datetime import datetime, timezone
-from pathlib import Path
 from typing import Annotated
 
 from langchain_core.messages import ToolMessage
-from langchain_core.tools import InjectedToolCallId, tool
+from langchain_core.runnables import RunnableConfig
+from langchain_core.tools import InjectedToolArg, InjectedToolCallId, tool
 from langgraph.prebuilt import InjectedState
 from langgraph.types import Command
 
+from hr_screen_agent.configuration import Configuration
+from hr_screen_agent.summaries import SummaryStore
+
 
 @tool(
     "write_interview_summary",
-    description="Write the interview summary to both the agent state and a markdown file in the output folder. This should be called when the interview is complete to generate the final evaluation report.",
+    description="Write the interview summary to both the agent state and the interview summary store. This should be called when the interview is complete to generate the final evaluation report.",
 )
-def write_interview_summary(
+async def write_interview_summary(
     summary: Annotated[str, "The complete interview summary"],
     state: Annotated[dict, InjectedState],
     tool_call_id: Annotated[str, InjectedToolCallId],
+    config: Annotated[RunnableConfig, InjectedToolArg],
 ) -> Command:
-    """Write the interview summary to both the agent state and a markdown file.
+    """Write the interview summary to both the agent state and the summary store.
 
     Args:
         summary: The complete interview summary
@@ -26,27 +29,23 @@ def write_interview_summary(
         Command updating the state and confirming the summary was written
     """
 
-    # Generate timestamp for filename
-    timestamp = datetime.now(timezone.utc).strftime("%Y%m%d_%H%M%S")
-
-    # Generate filename
-    filename = f"interview_summary_{timestamp}.md"
-
-    # Ensure output directory exists
-    output_dir = Path("output")
-    output_dir.mkdir(exist_ok=True)
-
-    # Write to file
-    file_path = output_dir / filename
+    configurable = Configuration.from_runnable_config(config)
+    thread_id = config.get("configurable", {}).get("thread_id", tool_call_id)
 
     try:
-        with open(file_path, "w", encoding="utf-8") as f:
-            f.write(summary)
+        async with SummaryStore(configurable.summary_store) as store:
+            await store.save(
+                thread_id,
+                summary,
+                candidate_name=configurable.candidate_name,
+                company_name=configurable.company_name,
+                job_role=configurable.job_role,
+            )
 
-        confirmation_message = f"Interview summary successfully written to {file_path} and stored in agent state."
+        confirmation_message = f"Interview summary successfully written to {configurable.summary_store} and stored in agent state."
 
     except Exception as e:
-        confirmation_message = f"Error writing interview summary to file: {str(e)}. Summary has been stored in agent state only."
+        confirmation_message = f"Error writing interview summary to the summary store: {str(e)}. Summary has been stored in agent state only."
 
     return Command(
         update={
@@ -0,0 +1,102 @@
+import asyncio
+import contextvars
+import functools
+import logging
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import Any, Literal, Mapping, Optional, Sequence
+
+from langchain_core.messages import ToolCall, ToolMessage
+from langchain_core.runnables import RunnableConfig
+from langchain_core.tools import BaseTool, StructuredTool
+from langgraph.prebuilt import ToolNode
+from langgraph.types import Command
+
+from hr_screen_agent.telemetry.metrics import TOOL_TIMEOUTS
+
+logger = logging.getLogger("vocalize-hr-screen-agent")
+
+
+@functools.cache
+def get_tool_executor(max_workers: int) -> ThreadPoolExecutor:
+    """Return the threads synchronous tools run in, shared by every session of this process."""
+    return ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="tool")
+
+
+def parse_tool_timeouts(spec: str) -> dict[str, float]:
+    """Parse per-tool timeouts such as `web_search=15,read_input_file=10`."""
+    timeouts: dict[str, float] = {}
+    for item in spec.split(","):
+        if not item.strip():
+            continue
+        name, sep, seconds = item.partition("=")
+        if not sep:
+            raise ValueError(f"Invalid tool timeout: {item!r}")
+        timeouts[name.strip()] = float(seconds)
+    return timeouts
+
+
+def _in_executor(tool: BaseTool, executor: Executor) -> BaseTool:
+    """Give a synchronous `tool` a coroutine that runs it in `executor`."""
+    if not isinstance(tool, StructuredTool) or tool.func is None or tool.coroutine:
+        return tool
+    func = tool.func
+
+    # Wrapped, so the tool still finds the `config` parameter of `func`
+    @functools.wraps(func)
+    async def coroutine(*args: Any, **kwargs: Any) -> Any:
+        context = contextvars.copy_context()
+        return await asyncio.get_running_loop().run_in_executor(
+            executor, functools.partial(context.run, func, *args, **kwargs)
+        )
+
+    return tool.model_copy(update={"coroutine": coroutine})
+
+
+class ConcurrentToolNode(ToolNode):
+    """Tool node that bounds each tool call of a step by its own timeout.
+
+    As in `ToolNode`, the tool calls of a step run concurrently and their
+    results are returned in the order of the calls. Synchronous tools, such
+    as reading a PDF, run in `executor` instead of the event loop's default
+    threads. A call still running after its timeout, from `timeouts` by tool
+    name or else `default_timeout`, is answered with an error result. A step
+    so takes as long as its slowest tool, at most its timeout; the thread of
+    a timed out synchronous tool is only released when the tool returns.
+    """
+
+    def __init__(
+        self,
+        tools: Sequence[BaseTool],
+        *,
+        timeouts: Optional[Mapping[str, float]] = None,
+        default_timeout: Optional[float] = None,
+        executor: Optional[Executor] = None,
+        **kwargs: Any,
+    ) -> None:
+        if executor is not None:
+            tools = [_in_executor(t, executor) for t in tools]
+        super().__init__(list(tools), **kwargs)
+        self.timeouts = dict(timeouts or {})
+        self.default_timeout = default_timeout
+
+    async def _arun_one(
+        self,
+        call: ToolCall,
+        input_type: Literal["list", "dict", "tool_calls"],
+        config: RunnableConfig,
+    ) -> ToolMessage | Command:
+        timeout = self.timeouts.get(call["name"], self.default_timeout)
+        try:
+            return await asyncio.wait_for(
+                super()._arun_one(call, input_type, config), timeout
+            )
+        except asyncio.TimeoutError:
+            logger.warning("Tool %s timed out after %ss", call["name"], timeout)
+            TOOL_TIMEOUTS.labels(tool=call["name"]).inc()
+            return ToolMessage(
+                content=f"Error: {call['name']} did not finish within {timeout:g} "
+                "seconds. Continue the interview without its result.",
+                name=call["name"],
+                tool_call_id=call["id"],
+                status="error",
+            )
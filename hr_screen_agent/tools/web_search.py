@@ -1,23 +1,36 @@
+import functools
 import os
-from typing import Annotated
+from typing import TYPE_CHECKING, Annotated
 
-from google.genai import Client
-from google.genai.types import GoogleSearch, Tool
 from langchain_core.runnables import RunnableConfig
 from langchain_core.tools import InjectedToolArg, tool
 
 from hr_screen_agent.configuration import Configuration
+from hr_screen_agent.budget import hard_budget_reached
+from hr_screen_agent.llm import Priority, get_governor
+from hr_screen_agent.telemetry.usage import get_usage_ledger
 
-# Used for Google Search API
-genai_client = Client(api_key=os.getenv("GOOGLE_API_KEY"))
-google_search_tool = Tool(google_search=GoogleSearch())
+if TYPE_CHECKING:
+    from google.genai import Client
+
+
+@functools.cache
+def get_genai_client() -> "Client":
+    """Return the client used for the Google Search API, built on first use.
+
+    `google.genai` takes about half a second to import, and most interviews
+    never search, so it is not imported when a worker starts.
+    """
+    from google.genai import Client
+
+    return Client(api_key=os.getenv("GOOGLE_API_KEY"))
 
 
 @tool(
     "web_search",
     description="Perform a web search using the native Google Search API",
 )
-def web_search(
+async def web_search(
     query: Annotated[str, "The search query to perform"],
     config: Annotated[RunnableConfig, InjectedToolArg],
 ) -> str:
@@ -26,12 +39,32 @@ def web_search(
     Executes a web search using the native Google Search API tool in combination with Gemini 2.0 Flash.
     """
     configurable = Configuration.from_runnable_config(config)
-    response = genai_client.models.generate_content(
+    thread_id = config.get("configurable", {}).get("thread_id")
+    if hard_budget_reached(thread_id, configurable):
+        return "Web search is unavailable: this interview has used its token budget."
+
+    from google.genai.types import GoogleSearch, Tool
+
+    genai_client = get_genai_client()
+    response = await get_governor().call(
+        Priority.TOOL,
+        "web_search",
+        lambda: genai_client.aio.models.generate_content(
+            model=configurable.web_search_model,
+            contents=query,
+            config={
+                "tools": [Tool(google_search=GoogleSearch())],
+                "temperature": 0,
+            },
+        ),
+    )
+    usage = response.usage_metadata
+    get_usage_ledger().record_call(
+        thread_id,
+        "web_search",
+        node="tools",
         model=configurable.web_search_model,
-        contents=query,
-        config={
-            "tools": [google_search_tool],
-            "temperature": 0,
-        },
+        input_tokens=(usage and usage.prompt_token_count) or 0,
+        output_tokens=(usage and usage.candidates_token_count) or 0,
     )
     return response.text or "No results found."
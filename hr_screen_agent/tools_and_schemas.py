@@ -21,3 +21,62 @@ class JailbreakOutput(BaseModel):
     is_safe: bool = Field(
         description="Indicates whether the action is safe to proceed with (True) or should be blocked (False)."
     )
+
+
+class RelevanceVerdict(BaseModel):
+    """Schema for relevance guardrail verdicts, without the reasoning."""
+
+    is_relevant: bool = Field(
+        description="Indicates whether the action is relevant to the query (True) or not (False)."
+    )
+
+
+class JailbreakVerdict(BaseModel):
+    """Schema for jailbreak guardrail verdicts, without the reasoning."""
+
+    is_safe: bool = Field(
+        description="Indicates whether the action is safe to proceed with (True) or should be blocked (False)."
+    )
+
+
+class FitProfile(BaseModel):
+    """Schema for the pre-interview analysis of the candidate against the job description."""
+
+    fit_summary: str = Field(
+        description="One or two sentences on how well the candidate fits the role."
+    )
+    matched_skills: list[str] = Field(
+        description="Requirements of the job description the documents show, each with its evidence."
+    )
+    missing_skills: list[str] = Field(
+        description="Requirements of the job description the documents do not show."
+    )
+    experience_claims: list[str] = Field(
+        description="Claims from the resume to verify in the interview: roles, years, scope and achievements."
+    )
+    gaps: list[str] = Field(
+        description="Employment gaps, short tenures, career changes or inconsistencies to ask about."
+    )
+    logistics_questions: list[str] = Field(
+        description="Logistics to clarify: salary expectations, availability, notice period, location and work authorization."
+    )
+
+
+class InterviewPlan(BaseModel):
+    """Schema for the interview plan of a role, shared by all its candidates."""
+
+    company_overview: str = Field(
+        description="Two or three sentences on the company and the team the role is in, from the job description."
+    )
+    qualification_questions: list[str] = Field(
+        description="Questions that verify the key requirements of the role against a candidate's resume."
+    )
+    motivation_questions: list[str] = Field(
+        description="Questions on why a candidate wants this role and company, and why they are looking."
+    )
+    logistics_questions: list[str] = Field(
+        description="Questions on salary range, availability, notice period, location and work authorization for this role."
+    )
+    communication_signals: list[str] = Field(
+        description="What to listen for in a candidate's communication and professionalism for this role."
+    )
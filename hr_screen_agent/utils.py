@@ -1,6 +1,7 @@
 import operator
 from datetime import datetime, timezone
 from textwrap import dedent
+from typing import Sequence
 
 
 def current_time_context() -> str:
@@ -78,3 +79,14 @@ def override_reducer(current_value, new_value):
         if isinstance(result, list):
             return remove_duplicates(result)
         return result
+
+
+def percentile(values: Sequence[float], q: float) -> float:
+    """Return the `q`-th percentile (0-100) of `values` using linear interpolation."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * q / 100
+    lower = int(rank)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (rank - lower)
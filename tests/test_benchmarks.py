@@ -0,0 +1,65 @@
+"""Smoke tests of the benchmarks, against the local fake models."""
+
+import json
+import os
+from pathlib import Path
+
+import pytest
+
+from benchmarks import load_test, replay
+
+SAMPLE_TRANSCRIPT = replay.SAMPLE_TRANSCRIPTS / "sample-interview.jsonl"
+# Fast enough for a test, the fakes still sleep and yield to the event loop
+LATENCY = "constant:0.01"
+
+
+@pytest.fixture(autouse=True)
+def environ():
+    """Restore the variables the benchmarks set to configure the agent."""
+    saved = dict(os.environ)
+    yield
+    os.environ.clear()
+    os.environ.update(saved)
+
+
+def test_load_test(tmp_path: Path) -> None:
+    report_path = tmp_path / "load.json"
+    load_test.main(
+        [
+            "--sessions=2",
+            "--turns=2",
+            "--ramp-up=0",
+            "--time-scale=0",
+            f"--llm-latency={LATENCY}",
+            f"--guardrail-latency={LATENCY}",
+            f"--web-search-latency={LATENCY}",
+            f"--stt-latency={LATENCY}",
+            f"--tts-latency={LATENCY}",
+            f"--json={report_path}",
+        ]
+    )
+
+    report = json.loads(report_path.read_text())
+    assert report["sessions"] == 2
+    assert report["end_of_speech_to_first_audio"]["count"] > 0
+    assert report["join_to_greeting"]["count"] == 2
+    assert report["gemini_queue_delay"]["agent"]["calls"] > 0
+
+
+def test_replay(tmp_path: Path) -> None:
+    report_path = tmp_path / "replay.json"
+    replay.main(
+        [
+            str(SAMPLE_TRANSCRIPT),
+            "--max-turns=3",
+            f"--llm-latency={LATENCY}",
+            f"--fast-llm-latency={LATENCY}",
+            f"--json={report_path}",
+        ]
+    )
+
+    report = json.loads(report_path.read_text())
+    assert report["transcripts"] == 1
+    assert report["turns"] == 3
+    assert len(report["per_turn"]) == 3
+    assert report["totals"]["model_calls"] > 0
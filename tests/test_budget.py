@@ -0,0 +1,120 @@
+"""Token accounting per interview, with compaction at the soft budget."""
+
+from typing import Any, Iterator
+
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
+from langchain_core.messages.utils import count_tokens_approximately
+from langchain_core.runnables import RunnableConfig
+
+from hr_screen_agent.budget import (
+    COMPACT_MIN_TOKENS,
+    hard_budget_reached,
+    soft_budget_reached,
+    track_usage,
+    usage_snapshot,
+)
+from hr_screen_agent.configuration import Configuration
+from hr_screen_agent.telemetry.usage import UsageLedger, get_usage_ledger
+
+THREAD_ID = "test-budget"
+
+LARGE = "word " * (COMPACT_MIN_TOKENS * 2)
+
+
+@pytest.fixture
+def ledger() -> Iterator[UsageLedger]:
+    yield get_usage_ledger()
+    get_usage_ledger().forget(THREAD_ID)
+
+
+def config(**configurable: Any) -> RunnableConfig:
+    return {
+        "configurable": {
+            "thread_id": THREAD_ID,
+            "candidate_name": "Jane Doe",
+            "company_name": "Tech Innovators Inc.",
+            "job_role": "Software Engineer",
+            **configurable,
+        }
+    }
+
+
+def tool_turn(call_id: str, content: str) -> list:
+    call = {"name": "read_input_file", "args": {}, "id": call_id}
+    return [
+        AIMessage(content="", tool_calls=[call]),
+        ToolMessage(content=content, name="read_input_file", tool_call_id=call_id),
+    ]
+
+
+def conversation() -> list:
+    return [
+        HumanMessage(content="Hello"),
+        *tool_turn("call-cv", LARGE),
+        *tool_turn("call-note", "short"),
+        AIMessage(content="Thanks, tell me about yourself."),
+        HumanMessage(content="I am an engineer."),
+        *tool_turn("call-job", LARGE),
+    ]
+
+
+def test_nothing_is_compacted_below_the_soft_budget(ledger: UsageLedger) -> None:
+    ledger.record_call(THREAD_ID, "agent", input_tokens=500)
+    update = track_usage({"messages": conversation()}, config(soft_token_budget=1000))
+    assert update == {}
+
+
+def test_older_tool_results_are_compacted_at_the_soft_budget(
+    ledger: UsageLedger,
+) -> None:
+    ledger.record_call(THREAD_ID, "agent", input_tokens=1000)
+    messages = conversation()
+
+    update = track_usage({"messages": messages}, config(soft_token_budget=1000))
+
+    compacted = update["llm_input_messages"]
+    assert len(compacted) == len(messages)
+    cv, note, job = (m for m in compacted if isinstance(m, ToolMessage))
+    assert cv.text().startswith("[Compacted to save tokens")
+    assert note.text() == "short"  # too small to compact
+    assert job.text() == LARGE  # the current turn's result
+    assert messages[2].text() == LARGE  # the state is left alone
+
+
+def test_tool_results_are_counted_once(ledger: UsageLedger) -> None:
+    messages = conversation()
+    track_usage({"messages": messages}, config())
+    track_usage({"messages": messages}, config())
+
+    # Only the results since the last model reply are new
+    assert ledger.usage(THREAD_ID)["context_by_tool"] == {
+        "read_input_file": count_tokens_approximately(messages[-1:])
+    }
+
+
+def test_usage_is_restored_from_the_checkpoint(ledger: UsageLedger) -> None:
+    ledger.record_call(THREAD_ID, "agent", input_tokens=700, output_tokens=300)
+    snapshot = usage_snapshot(config())
+    ledger.forget(THREAD_ID)
+
+    track_usage({"messages": [HumanMessage(content="Hi")], **snapshot}, config())
+
+    assert ledger.total_tokens(THREAD_ID) == 1000
+
+
+def test_budgets_are_off_when_unset(ledger: UsageLedger) -> None:
+    ledger.record_call(THREAD_ID, "agent", input_tokens=10**6)
+    configuration = Configuration.from_runnable_config(config())
+    assert not soft_budget_reached(THREAD_ID, configuration)
+    assert not hard_budget_reached(THREAD_ID, configuration)
+
+
+def test_hard_budget(ledger: UsageLedger) -> None:
+    configuration = Configuration.from_runnable_config(config(hard_token_budget=1000))
+    ledger.record_call(THREAD_ID, "agent", input_tokens=600, output_tokens=399)
+    assert not hard_budget_reached(THREAD_ID, configuration)
+
+    ledger.record_call(THREAD_ID, "guardrail", input_tokens=1)
+    assert hard_budget_reached(THREAD_ID, configuration)
+    assert not hard_budget_reached("another-interview", configuration)
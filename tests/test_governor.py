@@ -0,0 +1,126 @@
+"""Priority, backoff and event-loop handling of the Gemini governor."""
+
+import asyncio
+
+import pytest
+
+from hr_screen_agent.llm.governor import GeminiGovernor, Priority, TokenBucket
+
+pytestmark = pytest.mark.anyio
+
+
+async def _answer() -> str:
+    return "ok"
+
+
+def test_governor_survives_a_new_event_loop() -> None:
+    # One request per second: the second call waits on a timer for the next
+    governor = GeminiGovernor(TokenBucket(requests_per_minute=60, max_concurrency=1))
+
+    async def call() -> str:
+        return await governor.call(Priority.AGENT, "test", _answer)
+
+    async def first_loop() -> None:
+        assert await call() == "ok"
+        waiting = asyncio.create_task(call())
+        await asyncio.sleep(0.01)
+        assert not waiting.done()  # the loop stops with the timer pending
+
+    asyncio.run(first_loop())
+    # The timer of the stopped loop never fires, a new one has to be set
+    assert asyncio.run(asyncio.wait_for(call(), 3)) == "ok"
+
+
+class _APIError(Exception):
+    def __init__(self, code: int) -> None:
+        super().__init__(f"status {code}")
+        self.code = code
+
+
+def _governor(max_attempts: int = 4) -> GeminiGovernor:
+    return GeminiGovernor(
+        TokenBucket(requests_per_minute=6000, max_concurrency=1),
+        max_attempts=max_attempts,
+        base_backoff=0.01,
+    )
+
+
+async def test_queued_calls_are_served_by_priority() -> None:
+    governor = _governor()
+    served: list[str] = []
+
+    async def call(priority: Priority) -> None:
+        async with governor.slot(priority, "test"):
+            served.append(priority.name)
+
+    async with governor.slot(Priority.AGENT, "test"):
+        waiting = [
+            asyncio.create_task(call(priority))
+            for priority in (Priority.BACKGROUND, Priority.GUARDRAIL, Priority.AGENT)
+        ]
+        await asyncio.sleep(0.01)
+        assert served == []
+    await asyncio.gather(*waiting)
+
+    assert served == ["AGENT", "GUARDRAIL", "BACKGROUND"]
+
+
+def test_lower_priorities_leave_a_reserve() -> None:
+    bucket = TokenBucket(requests_per_minute=60, max_concurrency=4)
+    assert bucket.try_acquire(Priority.BACKGROUND) > 0
+    assert bucket.try_acquire(Priority.AGENT) == 0
+
+
+async def test_retryable_errors_are_retried() -> None:
+    governor = _governor()
+    attempts = 0
+
+    async def flaky() -> str:
+        nonlocal attempts
+        attempts += 1
+        if attempts < 3:
+            raise _APIError(503)
+        return "ok"
+
+    assert await governor.call(Priority.AGENT, "test", flaky) == "ok"
+    assert attempts == 3
+    assert governor.bucket.inflight == 0
+
+
+async def test_other_errors_are_raised_at_once() -> None:
+    governor = _governor()
+    attempts = 0
+
+    async def invalid() -> str:
+        nonlocal attempts
+        attempts += 1
+        raise _APIError(400)
+
+    with pytest.raises(_APIError):
+        await governor.call(Priority.AGENT, "test", invalid)
+    assert attempts == 1
+
+
+async def test_retries_stop_after_max_attempts() -> None:
+    governor = _governor(max_attempts=2)
+    attempts = 0
+
+    async def unavailable() -> str:
+        nonlocal attempts
+        attempts += 1
+        raise _APIError(503)
+
+    with pytest.raises(_APIError):
+        await governor.call(Priority.AGENT, "test", unavailable)
+    assert attempts == 2
+
+
+async def test_quota_errors_pause_every_caller() -> None:
+    governor = _governor()
+
+    async def quota() -> str:
+        raise _APIError(429)
+
+    with pytest.raises(_APIError):
+        await governor.call(Priority.AGENT, "test", quota)
+    assert governor.bucket.cooldown_until > 0
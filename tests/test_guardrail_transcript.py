@@ -0,0 +1,83 @@
+"""The incremental, token-capped transcript the guardrails read."""
+
+from langchain_core.messages import (
+    AIMessage,
+    HumanMessage,
+    SystemMessage,
+    ToolMessage,
+)
+
+from hr_screen_agent.hooks.guardrail import update_guardrail_transcript
+from hr_screen_agent.profile import FIT_PROFILE_TOOL
+
+
+def interview() -> list:
+    think = {"name": "think", "args": {"thought": "Plan"}, "id": "call-think"}
+    verdict = {"name": "relevance_guardrail_check", "args": {}, "id": "call-check"}
+    profile = {"name": FIT_PROFILE_TOOL, "args": {}, "id": "call-profile"}
+    return [
+        SystemMessage(content="You are an interviewer."),
+        AIMessage(content="", tool_calls=[profile]),
+        ToolMessage(content="A long fit profile", tool_call_id="call-profile"),
+        AIMessage(content="Hello, are you ready?"),
+        HumanMessage(content="Yes, let's start."),
+        AIMessage(content="", tool_calls=[verdict]),
+        ToolMessage(content="relevant", tool_call_id="call-check"),
+        AIMessage(content="Let me think.", tool_calls=[think]),
+        ToolMessage(content="A long think log", tool_call_id="call-think"),
+        AIMessage(content="Tell me about your last role."),
+        HumanMessage(content="I was a backend engineer."),
+    ]
+
+
+def test_only_speech_is_kept() -> None:
+    messages = interview()
+    transcript = update_guardrail_transcript(None, messages, 1000)
+
+    assert transcript["lines"] == [
+        "AI: Hello, are you ready?",
+        "Human: Yes, let's start.",
+        "AI: Let me think.",
+        "AI: Tell me about your last role.",
+        "Human: I was a backend engineer.",
+    ]
+    assert transcript["seen"] == len(messages)
+    assert len(transcript["tokens"]) == len(transcript["lines"])
+
+
+def test_only_new_messages_are_read() -> None:
+    messages = interview()
+    transcript = update_guardrail_transcript(None, messages[:5], 1000)
+    # Changes to messages already seen are not read again
+    messages[3] = AIMessage(content="Rewritten")
+
+    transcript = update_guardrail_transcript(transcript, messages, 1000)
+
+    assert transcript == update_guardrail_transcript(None, interview(), 1000)
+
+
+def test_oldest_lines_are_dropped_beyond_the_token_cap() -> None:
+    messages = interview()
+    full = update_guardrail_transcript(None, messages, 1000)
+    cap = sum(full["tokens"][-2:])
+
+    transcript = update_guardrail_transcript(None, messages, cap)
+
+    assert transcript["lines"] == full["lines"][-2:]
+    assert sum(transcript["tokens"]) <= cap
+
+
+def test_the_latest_line_is_always_kept() -> None:
+    messages = [HumanMessage(content="A very long answer " * 100)]
+    transcript = update_guardrail_transcript(None, messages, 1)
+    assert transcript["lines"] == [f"Human: {messages[0].text()}"]
+
+
+def test_a_replaced_history_is_read_again() -> None:
+    transcript = update_guardrail_transcript(None, interview(), 1000)
+    messages = [HumanMessage(content="Hi again")]
+
+    transcript = update_guardrail_transcript(transcript, messages, 1000)
+
+    assert transcript["seen"] == 1
+    assert transcript["lines"] == ["Human: Hi again"]
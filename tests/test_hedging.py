@@ -0,0 +1,136 @@
+"""Hedged agent model requests, against models with a scripted first-token delay."""
+
+import asyncio
+from typing import Any, AsyncIterator, Optional
+
+import pytest
+from langchain_core.callbacks import (
+    AsyncCallbackManagerForLLMRun,
+    CallbackManagerForLLMRun,
+)
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessageChunk, BaseMessage, HumanMessage
+from langchain_core.outputs import ChatGenerationChunk, ChatResult
+
+from hr_screen_agent.llm import HedgedChatModel
+from hr_screen_agent.llm.hedging import LatencyTracker
+
+pytestmark = pytest.mark.anyio
+
+MESSAGES = [HumanMessage(content="Hello")]
+
+
+class DelayedModel(BaseChatModel):
+    """Streams `reply` word by word after `delay` seconds, or fails."""
+
+    reply: str = ""
+    delay: float = 0.0
+    fail: bool = False
+    calls: int = 0
+
+    @property
+    def _llm_type(self) -> str:
+        return "delayed"
+
+    def _generate(
+        self,
+        messages: list[BaseMessage],
+        stop: Optional[list[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        raise NotImplementedError
+
+    async def _astream(
+        self,
+        messages: list[BaseMessage],
+        stop: Optional[list[str]] = None,
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> AsyncIterator[ChatGenerationChunk]:
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        if self.fail:
+            raise RuntimeError(f"{self.reply} failed")
+        for word in self.reply.split(" "):
+            yield ChatGenerationChunk(message=AIMessageChunk(content=word + " "))
+
+
+def hedged(
+    primary: DelayedModel, fallback: DelayedModel, **kwargs: Any
+) -> HedgedChatModel:
+    return HedgedChatModel(
+        primary=primary, fallback=fallback, initial_delay=0.05, **kwargs
+    )
+
+
+async def test_fast_requests_are_not_hedged() -> None:
+    primary = DelayedModel(reply="from the primary")
+    fallback = DelayedModel(reply="from the fallback")
+
+    message = await hedged(primary, fallback).ainvoke(MESSAGES)
+
+    assert message.text().strip() == "from the primary"
+    assert fallback.calls == 0
+
+
+async def test_slow_requests_are_hedged() -> None:
+    primary = DelayedModel(reply="from the primary", delay=1.0)
+    fallback = DelayedModel(reply="from the fallback")
+
+    message = await hedged(primary, fallback).ainvoke(MESSAGES)
+
+    assert message.text().strip() == "from the fallback"
+    assert (primary.calls, fallback.calls) == (1, 1)
+
+
+async def test_the_hedge_streams_the_whole_reply() -> None:
+    primary = DelayedModel(reply="from the primary", delay=1.0)
+    fallback = DelayedModel(reply="one two three")
+
+    chunks = [
+        chunk.text() async for chunk in hedged(primary, fallback).astream(MESSAGES)
+    ]
+
+    assert chunks == ["one ", "two ", "three "]
+
+
+async def test_a_failed_request_loses_to_the_other() -> None:
+    primary = DelayedModel(reply="from the primary", delay=0.1, fail=True)
+    fallback = DelayedModel(reply="from the fallback", delay=0.2)
+
+    message = await hedged(primary, fallback).ainvoke(MESSAGES)
+
+    assert message.text().strip() == "from the fallback"
+
+
+async def test_errors_are_raised_when_every_request_fails() -> None:
+    primary = DelayedModel(reply="primary", delay=0.1, fail=True)
+    fallback = DelayedModel(reply="fallback", fail=True)
+
+    with pytest.raises(RuntimeError):
+        await hedged(primary, fallback).ainvoke(MESSAGES)
+
+
+async def test_control_requests_are_never_hedged() -> None:
+    primary = DelayedModel(reply="from the primary", delay=0.2)
+    fallback = DelayedModel(reply="from the fallback")
+
+    message = await hedged(primary, fallback, control_fraction=1.0).ainvoke(MESSAGES)
+
+    assert message.text().strip() == "from the primary"
+    assert fallback.calls == 0
+
+
+def test_hedge_delay_follows_the_latency_percentile() -> None:
+    tracker = LatencyTracker(q=90, initial_delay=2.0, min_delay=0.2, min_samples=10)
+    for latency in range(1, 10):
+        tracker.record(latency / 10)
+    assert tracker.hedge_delay() == 2.0  # too few samples
+
+    tracker.record(1.0)
+    assert 0.8 <= tracker.hedge_delay() <= 1.0
+
+    tracker = LatencyTracker(q=90, initial_delay=2.0, min_delay=0.2, min_samples=1)
+    tracker.record(0.01)
+    assert tracker.hedge_delay() == 0.2
@@ -0,0 +1,100 @@
+"""The post-call summary queue: leases, retries and completion."""
+
+import asyncio
+from pathlib import Path
+
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage
+
+from hr_screen_agent.post_call.job_queue import SummaryQueue
+
+pytestmark = pytest.mark.anyio
+
+TRANSCRIPT = [
+    AIMessage(content="Hello, thanks for joining."),
+    HumanMessage(content="Happy to be here."),
+]
+
+
+async def test_jobs_are_claimed_oldest_first(tmp_path: Path) -> None:
+    async with SummaryQueue(tmp_path / "queue.db") as queue:
+        await queue.enqueue("thread-1", TRANSCRIPT, {"job_role": "Engineer"})
+        await queue.enqueue("thread-2", TRANSCRIPT)
+
+        job = await queue.claim()
+        assert job is not None
+        assert (job.thread_id, job.attempts) == ("thread-1", 1)
+        assert job.metadata == {"job_role": "Engineer"}
+        assert [m.text() for m in job.messages()] == [m.text() for m in TRANSCRIPT]
+
+        other = await queue.claim()
+        assert other is not None and other.thread_id == "thread-2"
+        assert await queue.claim() is None  # both are leased
+        assert await queue.counts() == {
+            "queued": 0,
+            "running": 2,
+            "done": 0,
+            "failed": 0,
+        }
+
+
+async def test_completed_jobs_are_not_claimed_again(tmp_path: Path) -> None:
+    async with SummaryQueue(tmp_path / "queue.db", lease_seconds=0.01) as queue:
+        await queue.enqueue("thread-1", TRANSCRIPT)
+        job = await queue.claim()
+        assert job is not None
+        await queue.complete(job)
+
+        await asyncio.sleep(0.02)
+        assert await queue.claim() is None
+        assert (await queue.counts())["done"] == 1
+
+
+async def test_expired_leases_are_claimed_again(tmp_path: Path) -> None:
+    async with SummaryQueue(tmp_path / "queue.db", lease_seconds=0.01) as queue:
+        await queue.enqueue("thread-1", TRANSCRIPT)
+        assert await queue.claim() is not None  # its worker dies
+
+        await asyncio.sleep(0.02)
+        job = await queue.claim()
+        assert job is not None
+        assert (job.thread_id, job.attempts) == ("thread-1", 2)
+
+
+async def test_failed_jobs_are_retried_up_to_max_attempts(tmp_path: Path) -> None:
+    async with SummaryQueue(tmp_path / "queue.db", max_attempts=2) as queue:
+        await queue.enqueue("thread-1", TRANSCRIPT)
+
+        job = await queue.claim()
+        assert job is not None
+        assert await queue.fail(job, "quota exceeded")
+
+        job = await queue.claim()
+        assert job is not None and job.attempts == 2
+        assert not await queue.fail(job, "quota exceeded")
+
+        assert await queue.claim() is None
+        assert (await queue.counts())["failed"] == 1
+
+
+async def test_enqueueing_a_thread_again_resets_its_job(tmp_path: Path) -> None:
+    async with SummaryQueue(tmp_path / "queue.db", max_attempts=1) as queue:
+        await queue.enqueue("thread-1", TRANSCRIPT)
+        job = await queue.claim()
+        assert job is not None
+        assert not await queue.fail(job, "quota exceeded")
+
+        await queue.enqueue("thread-1", TRANSCRIPT[:1])
+        job = await queue.claim()
+        assert job is not None
+        assert job.attempts == 1
+        assert len(job.messages()) == 1
+
+
+async def test_jobs_survive_a_restart(tmp_path: Path) -> None:
+    async with SummaryQueue(tmp_path / "queue.db") as queue:
+        await queue.enqueue("thread-1", TRANSCRIPT)
+
+    async with SummaryQueue(tmp_path / "queue.db") as queue:
+        job = await queue.claim()
+        assert job is not None and job.thread_id == "thread-1"
@@ -0,0 +1,138 @@
+"""Interview phase transitions, worked out from the state, the clock and the budget."""
+
+from datetime import datetime, timedelta, timezone
+from typing import Any, Iterator, Optional
+
+import pytest
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage, ToolMessage
+from langchain_core.runnables import RunnableConfig
+
+from hr_screen_agent.phases import InterviewPhase, advance_phase
+from hr_screen_agent.telemetry.usage import UsageLedger, get_usage_ledger
+
+THREAD_ID = "test-phases"
+
+
+@pytest.fixture
+def ledger() -> Iterator[UsageLedger]:
+    yield get_usage_ledger()
+    get_usage_ledger().forget(THREAD_ID)
+
+
+def config(**configurable: Any) -> RunnableConfig:
+    return {
+        "configurable": {
+            "thread_id": THREAD_ID,
+            "candidate_name": "Jane Doe",
+            "company_name": "Tech Innovators Inc.",
+            "job_role": "Software Engineer",
+            "interview_duration_minutes": 15,
+            "warning_threshold_minutes": 5,
+            **configurable,
+        }
+    }
+
+
+def state(
+    phase: Optional[InterviewPhase] = None,
+    *,
+    minutes_ago: Optional[float] = None,
+    turns: int = 0,
+    messages: tuple[BaseMessage, ...] = (),
+    **values: Any,
+) -> dict[str, Any]:
+    start_time = (
+        datetime.now(timezone.utc) - timedelta(minutes=minutes_ago)
+        if minutes_ago is not None
+        else None
+    )
+    return {
+        "messages": [
+            *messages,
+            *(HumanMessage(content=f"Answer {i}") for i in range(turns)),
+        ],
+        "phase": phase.value if phase else None,
+        "phase_turn": 0,
+        "start_time": start_time,
+        **values,
+    }
+
+
+def phase(update: dict[str, Any]) -> InterviewPhase:
+    return InterviewPhase(update["phase"])
+
+
+def test_preparation_waits_for_the_timer() -> None:
+    update = advance_phase(state(turns=1), config())
+    assert update == {"phase": "preparation", "phase_turn": 0}
+
+
+def test_preparation_ends_once_the_documents_are_read() -> None:
+    read = ToolMessage(content="CV", name="read_input_file", tool_call_id="call-1")
+    update = advance_phase(state(minutes_ago=0, messages=(read,)), config())
+    assert phase(update) is InterviewPhase.INTRODUCTION
+
+
+def test_preparation_ends_when_the_candidate_answers() -> None:
+    update = advance_phase(state(minutes_ago=0, turns=1), config())
+    assert update == {"phase": "introduction", "phase_turn": 1}
+
+
+def test_introduction_lasts_two_candidate_turns() -> None:
+    introduction = InterviewPhase.INTRODUCTION
+    update = advance_phase(state(introduction, minutes_ago=1, turns=1), config())
+    assert phase(update) is InterviewPhase.INTRODUCTION
+
+    update = advance_phase(state(introduction, minutes_ago=1, turns=2), config())
+    assert update == {"phase": "questioning", "phase_turn": 2}
+
+
+def test_questioning_wraps_up_near_the_end() -> None:
+    questioning = InterviewPhase.QUESTIONING
+    update = advance_phase(state(questioning, minutes_ago=9, turns=5), config())
+    assert phase(update) is InterviewPhase.QUESTIONING
+
+    update = advance_phase(state(questioning, minutes_ago=11, turns=5), config())
+    assert phase(update) is InterviewPhase.WRAP_UP
+
+
+def test_wrap_up_ends_when_the_time_is_up() -> None:
+    update = advance_phase(
+        state(InterviewPhase.WRAP_UP, minutes_ago=16, turns=8), config()
+    )
+    assert phase(update) is InterviewPhase.SUMMARY
+
+
+def test_a_written_summary_ends_any_phase() -> None:
+    update = advance_phase(
+        state(InterviewPhase.INTRODUCTION, minutes_ago=1, interview_summary="Done"),
+        config(),
+    )
+    assert phase(update) is InterviewPhase.SUMMARY
+
+
+def test_late_interviews_skip_the_phases_they_ran_out_of_time_for() -> None:
+    update = advance_phase(state(minutes_ago=20, turns=1), config())
+    assert update == {"phase": "summary", "phase_turn": 1}
+
+
+def test_phases_never_go_back() -> None:
+    update = advance_phase(
+        state(InterviewPhase.WRAP_UP, minutes_ago=1, turns=1), config()
+    )
+    assert phase(update) is InterviewPhase.WRAP_UP
+
+
+def test_the_hard_budget_wraps_up(ledger: UsageLedger) -> None:
+    questioning = state(
+        InterviewPhase.QUESTIONING,
+        minutes_ago=3,
+        turns=4,
+        messages=(AIMessage(content="Hello"),),
+    )
+    update = advance_phase(questioning, config(hard_token_budget=1000))
+    assert phase(update) is InterviewPhase.QUESTIONING
+
+    ledger.record_call(THREAD_ID, "agent", input_tokens=900, output_tokens=100)
+    update = advance_phase(questioning, config(hard_token_budget=1000))
+    assert phase(update) is InterviewPhase.WRAP_UP
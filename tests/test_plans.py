@@ -0,0 +1,100 @@
+"""Interview plans, cached on disk per job description and role."""
+
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from benchmarks.fakes import FakeChatModel
+from hr_screen_agent import plans
+from hr_screen_agent.configuration import Configuration
+from hr_screen_agent.plans import InterviewPlanCache, prepare_interview_plan
+
+pytestmark = pytest.mark.anyio
+
+PLAN = {
+    "company_overview": "A small team building developer tools.",
+    "qualification_questions": ["Which Python frameworks have you used?"],
+    "motivation_questions": [],
+    "logistics_questions": ["What is your notice period?"],
+    "communication_signals": [],
+}
+
+
+def configuration(**values: Any) -> Configuration:
+    return Configuration(
+        **{
+            "candidate_name": "Jane Doe",
+            "company_name": "Tech Innovators Inc.",
+            "job_role": "Software Engineer",
+            **values,
+        }
+    )
+
+
+def test_plans_are_keyed_by_what_they_are_written_from(tmp_path: Path) -> None:
+    cache = InterviewPlanCache(tmp_path)
+
+    def key(description: str = "Job description", **values: Any) -> str:
+        return cache.key(configuration(**values), description)
+
+    assert key() == key()
+    # Every candidate for the role reads the same plan
+    assert key(candidate_name="John Smith") == key()
+    assert key("Edited job description") != key()
+    assert key(job_role="Data Engineer") != key()
+    assert key(interview_duration_minutes=30) != key()
+
+
+def test_plans_are_read_back(tmp_path: Path) -> None:
+    cache = InterviewPlanCache(tmp_path / "plans")
+    key = cache.key(configuration(), "Job description")
+    assert cache.get(key) is None
+
+    cache.put(key, PLAN, configuration())
+
+    assert cache.get(key) == PLAN
+    assert [p.name for p in (tmp_path / "plans").iterdir()] == [f"{key}.json"]
+
+
+def test_unreadable_plans_are_missing(tmp_path: Path) -> None:
+    cache = InterviewPlanCache(tmp_path)
+    cache.path("truncated").write_text('{"plan": ')
+    cache.path("old").write_text("{}")
+
+    assert cache.get("truncated") is None
+    assert cache.get("old") is None
+
+
+async def test_a_plan_is_written_once_per_role(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(plans, "read_job_description", lambda _: "Job description")
+    config = configuration(interview_plan_cache=str(tmp_path))
+
+    plan = await prepare_interview_plan(FakeChatModel(), config)
+    assert set(plan) == set(PLAN)
+
+    # Read from the cache, the model is not called again
+    failing = FakeChatModel(error_rate=1.0)
+    assert await prepare_interview_plan(failing, config) == plan
+    assert len(list(tmp_path.iterdir())) == 1
+
+
+async def test_no_plan_without_a_job_description(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(plans, "read_job_description", lambda _: "")
+    config = configuration(interview_plan_cache=str(tmp_path))
+
+    assert await prepare_interview_plan(FakeChatModel(), config) == {}
+
+
+async def test_failed_plans_are_not_cached(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(plans, "read_job_description", lambda _: "Job description")
+    config = configuration(interview_plan_cache=str(tmp_path))
+
+    assert await prepare_interview_plan(FakeChatModel(error_rate=1.0), config) == {}
+    assert list(tmp_path.iterdir()) == []
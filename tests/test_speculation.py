@@ -0,0 +1,187 @@
+"""Speculative replies on checkpoint forks, against a scripted graph."""
+
+import asyncio
+
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
+from langgraph.checkpoint.memory import InMemorySaver
+from langgraph.graph import END, START, MessagesState, StateGraph
+from livekit.agents.llm.chat_context import ChatContext
+
+from voice_agent.llm_adapter import LLMAdapter
+from voice_agent.speculation import Speculation, normalize_transcript
+
+pytestmark = pytest.mark.anyio
+
+THREAD = {"configurable": {"thread_id": "interview"}}
+
+
+def agent(state: MessagesState) -> dict:
+    """Reply to the last candidate turn, calling a tool when asked to."""
+    last = state["messages"][-1]
+    if isinstance(last, ToolMessage):
+        return {"messages": [AIMessage(content="The tool is done.")]}
+    if "tool" in last.text():
+        call = {"name": "lookup", "args": {}, "id": f"call-{len(state['messages'])}"}
+        return {"messages": [AIMessage(content="", tool_calls=[call])]}
+    return {"messages": [AIMessage(content=f"You said: {last.text()}")]}
+
+
+def tools(state: MessagesState) -> dict:
+    calls = state["messages"][-1].tool_calls
+    return {
+        "messages": [
+            ToolMessage(content="found", name=c["name"], tool_call_id=c["id"])
+            for c in calls
+        ]
+    }
+
+
+def build_graph():
+    builder = StateGraph(MessagesState)
+    builder.add_node("agent", agent)
+    builder.add_node("tools", tools)
+    builder.add_edge(START, "agent")
+    builder.add_conditional_edges(
+        "agent", lambda s: "tools" if s["messages"][-1].tool_calls else END
+    )
+    builder.add_edge("tools", "agent")
+    return builder.compile(checkpointer=InMemorySaver())
+
+
+async def started_graph():
+    graph = build_graph()
+    await graph.ainvoke({"messages": [HumanMessage(content="Hello")]}, THREAD)
+    return graph
+
+
+async def texts(graph) -> list[str]:
+    snapshot = await graph.aget_state(THREAD)
+    return [m.text() for m in snapshot.values["messages"]]
+
+
+async def replayed(speculation: Speculation) -> list[str]:
+    return [m.text() async for m in speculation.messages()]
+
+
+def test_normalize_transcript() -> None:
+    assert normalize_transcript("I'm  fine, thanks!") == "i'm fine thanks"
+    assert normalize_transcript("I'm fine thanks") == normalize_transcript(
+        "i'm FINE. Thanks"
+    )
+    assert normalize_transcript("I'm fine") != normalize_transcript("I'm fine thanks")
+
+
+async def test_commit_makes_the_fork_the_thread() -> None:
+    graph = await started_graph()
+    speculation = Speculation(graph, graph.checkpointer, THREAD, "I'm fine.")
+
+    assert await replayed(speculation) == ["You said: I'm fine."]
+    assert await texts(graph) == ["Hello", "You said: Hello"]  # not yet committed
+    assert await speculation.commit()
+    assert await texts(graph) == [
+        "Hello",
+        "You said: Hello",
+        "I'm fine.",
+        "You said: I'm fine.",
+    ]
+    assert not speculation.paused
+    fork = {"configurable": {"thread_id": speculation._fork_id}}
+    assert await graph.checkpointer.aget_tuple(fork) is None
+
+
+async def test_discard_leaves_the_thread_untouched() -> None:
+    graph = await started_graph()
+    before = await texts(graph)
+    speculation = Speculation(graph, graph.checkpointer, THREAD, "I'm fine")
+    await speculation.discard()
+
+    assert await texts(graph) == before
+    fork = {"configurable": {"thread_id": speculation._fork_id}}
+    assert await graph.checkpointer.aget_tuple(fork) is None
+
+
+async def test_stale_fork_is_not_committed() -> None:
+    graph = await started_graph()
+    speculation = Speculation(graph, graph.checkpointer, THREAD, "I'm fine")
+    await replayed(speculation)
+    # The thread moves on between the fork and the commit
+    await graph.aupdate_state(
+        THREAD, {"messages": [AIMessage(content="Are you there?")]}, as_node="agent"
+    )
+
+    assert not await speculation.is_current()
+    assert not await speculation.commit()
+    assert await texts(graph) == ["Hello", "You said: Hello", "Are you there?"]
+
+
+async def test_fork_stops_before_tools() -> None:
+    graph = await started_graph()
+    speculation = Speculation(graph, graph.checkpointer, THREAD, "Use the tool")
+    await replayed(speculation)
+
+    assert speculation.paused
+    assert await speculation.commit()
+    # The tool only runs once the thread continues from the committed fork
+    snapshot = await graph.aget_state(THREAD)
+    assert snapshot.next == ("tools",)
+    assert not any(isinstance(m, ToolMessage) for m in snapshot.values["messages"])
+
+
+async def reply(adapter: LLMAdapter, chat_ctx: ChatContext) -> str:
+    parts = []
+    async with adapter.chat(chat_ctx=chat_ctx) as stream:
+        async for chunk in stream:
+            parts.append(chunk.delta.content)
+    return " ".join(parts)
+
+
+def chat_context(*turns: tuple[str, str]) -> ChatContext:
+    chat_ctx = ChatContext.empty()
+    for role, content in turns:
+        chat_ctx.add_message(role=role, content=content)
+    return chat_ctx
+
+
+async def test_adapter_runs_tools_after_commit() -> None:
+    graph = await started_graph()
+    adapter = LLMAdapter(graph, config=THREAD)
+    adapter.speculate("Use the tool")
+    chat_ctx = chat_context(
+        ("user", "Hello"), ("assistant", "You said: Hello"), ("user", "Use the tool")
+    )
+
+    assert await reply(adapter, chat_ctx) == "The tool is done."
+    messages = (await graph.aget_state(THREAD)).values["messages"]
+    assert [type(m).__name__ for m in messages[2:]] == [
+        "HumanMessage",
+        "AIMessage",
+        "ToolMessage",
+        "AIMessage",
+    ]
+
+
+async def test_adapter_answers_on_the_thread_when_the_fork_is_stale() -> None:
+    graph = await started_graph()
+    adapter = LLMAdapter(graph, config=THREAD)
+    adapter.speculate("I'm fine")
+    await adapter._speculation._task  # the fork has answered
+    # E.g. the cancelled previous run answered its interrupted tool calls
+    await graph.aupdate_state(
+        THREAD, {"messages": [AIMessage(content="Are you there?")]}, as_node="agent"
+    )
+    chat_ctx = chat_context(
+        ("user", "Hello"),
+        ("assistant", "Are you there?"),
+        ("user", "I'm fine"),
+    )
+
+    assert await reply(adapter, chat_ctx) == "You said: I'm fine"
+    assert await texts(graph) == [
+        "Hello",
+        "You said: Hello",
+        "Are you there?",
+        "I'm fine",
+        "You said: I'm fine",
+    ]
+    await asyncio.gather(*adapter._background)
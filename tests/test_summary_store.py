@@ -0,0 +1,98 @@
+"""The SQLite summary store: upserts by thread, filters and full-text search."""
+
+from pathlib import Path
+from typing import AsyncIterator
+
+import pytest
+
+from hr_screen_agent.summaries import SummaryStore, parse_recommendation
+
+pytestmark = pytest.mark.anyio
+
+
+def summary(text: str, recommendation: str) -> str:
+    return f"## Candidate Assessment\n{text}\n\n## Overall Recommendation\n{recommendation}"
+
+
+@pytest.fixture
+async def store(tmp_path: Path) -> AsyncIterator[SummaryStore]:
+    async with SummaryStore(tmp_path / "summaries.db") as store:
+        await store.save(
+            "thread-1",
+            summary("Strong Kubernetes and Go experience.", "Proceed"),
+            candidate_name="Jane Doe",
+            job_role="Software Engineer",
+        )
+        await store.save(
+            "thread-2",
+            summary("Little experience with distributed systems.", "Reject"),
+            candidate_name="John Smith",
+            job_role="Software Engineer",
+        )
+        await store.save(
+            "thread-3",
+            summary("Ran the Kubernetes migration of the data team.", "Hold"),
+            candidate_name="Ana Lopez",
+            job_role="Data Engineer",
+        )
+        yield store
+
+
+def test_parse_recommendation() -> None:
+    assert parse_recommendation(summary("Good fit.", "Proceed to next round")) == (
+        "Proceed"
+    )
+    assert parse_recommendation("Recommendation: reject") == "Reject"
+    # The overall recommendation wins over earlier mentions
+    text = "Recommendation on salary: hold off.\nOverall Recommendation: Proceed"
+    assert parse_recommendation(text) == "Proceed"
+    assert parse_recommendation("No verdict here.") is None
+
+
+async def test_saving_a_thread_again_replaces_its_summary(
+    store: SummaryStore,
+) -> None:
+    await store.save(
+        "thread-2",
+        summary("Rust and Kubernetes, on second thought.", "Hold"),
+        candidate_name="John Smith",
+        job_role="Software Engineer",
+    )
+
+    record = await store.get("thread-2")
+    assert record is not None
+    assert record.recommendation == "Hold"
+    assert await store.counts() == {"Proceed": 1, "Hold": 2}
+    # The full-text index follows the update
+    assert await store.search("distributed") == []
+    found = await store.search("rust")
+    assert [r.thread_id for r in found] == ["thread-2"]
+
+
+async def test_full_text_search(store: SummaryStore) -> None:
+    found = await store.search("kubernetes")
+    assert {r.thread_id for r in found} == {"thread-1", "thread-3"}
+    assert all("[Kubernetes]" in (r.snippet or "") for r in found)
+
+    found = await store.search("kubernetes", job_role="software engineer")
+    assert [r.thread_id for r in found] == ["thread-1"]
+
+    found = await store.search("candidate_name: ana")
+    assert [r.thread_id for r in found] == ["thread-3"]
+
+
+async def test_filters_without_a_query(store: SummaryStore) -> None:
+    found = await store.search(job_role="Software Engineer")
+    assert [r.thread_id for r in found] == ["thread-2", "thread-1"]  # newest first
+    assert all(r.snippet is None for r in found)
+
+    found = await store.search(recommendation="reject")
+    assert [r.thread_id for r in found] == ["thread-2"]
+
+    assert await store.search(since=found[0].created_at + 3600) == []
+    assert len(await store.search(limit=2)) == 2
+
+
+async def test_counts_by_role(store: SummaryStore) -> None:
+    assert await store.counts("data engineer") == {"Hold": 1}
+    assert await store.get("missing") is None
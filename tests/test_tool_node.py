@@ -0,0 +1,113 @@
+"""Per-tool timeouts and the bounded executor of the concurrent tool node."""
+
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Iterator
+
+import pytest
+from langchain_core.messages import AIMessage, ToolMessage
+from langchain_core.tools import tool
+
+from hr_screen_agent.tools.tool_node import ConcurrentToolNode, parse_tool_timeouts
+
+pytestmark = pytest.mark.anyio
+
+
+@tool
+async def wait(seconds: float) -> str:
+    """Wait for some seconds."""
+    await asyncio.sleep(seconds)
+    return f"waited {seconds:g}s"
+
+
+@tool
+def read_file(name: str) -> str:
+    """Read a file, synchronously."""
+    time.sleep(0.05)
+    return f"{name} read in {threading.current_thread().name}"
+
+
+@pytest.fixture
+def executor() -> Iterator[ThreadPoolExecutor]:
+    executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="tool")
+    yield executor
+    executor.shutdown(wait=True)
+
+
+def calls(*calls: tuple[str, dict[str, Any]]) -> dict[str, Any]:
+    tool_calls = [
+        {"name": name, "args": args, "id": f"call-{i}"}
+        for i, (name, args) in enumerate(calls)
+    ]
+    return {"messages": [AIMessage(content="", tool_calls=tool_calls)]}
+
+
+async def results(node: ConcurrentToolNode, state: dict[str, Any]) -> list[ToolMessage]:
+    return (await node.ainvoke(state))["messages"]
+
+
+async def test_tool_calls_run_concurrently_in_order() -> None:
+    node = ConcurrentToolNode([wait])
+    started = time.perf_counter()
+    messages = await results(
+        node, calls(("wait", {"seconds": 0.2}), ("wait", {"seconds": 0.1}))
+    )
+
+    assert time.perf_counter() - started < 0.3
+    assert [m.text() for m in messages] == ["waited 0.2s", "waited 0.1s"]
+    assert [m.tool_call_id for m in messages] == ["call-0", "call-1"]
+
+
+async def test_slow_tools_are_answered_with_an_error() -> None:
+    node = ConcurrentToolNode([wait], timeouts={"wait": 0.05}, default_timeout=5)
+    started = time.perf_counter()
+    messages = await results(
+        node, calls(("wait", {"seconds": 5}), ("wait", {"seconds": 0}))
+    )
+
+    assert time.perf_counter() - started < 1
+    slow, fast = messages
+    assert slow.status == "error"
+    assert slow.tool_call_id == "call-0"
+    assert "did not finish within 0.05 seconds" in slow.text()
+    assert (fast.status, fast.text()) == ("success", "waited 0s")
+
+
+async def test_the_default_timeout_applies_to_other_tools() -> None:
+    node = ConcurrentToolNode([wait], timeouts={"web_search": 5}, default_timeout=0.05)
+    (message,) = await results(node, calls(("wait", {"seconds": 5})))
+    assert message.status == "error"
+
+
+async def test_synchronous_tools_run_in_the_executor(
+    executor: ThreadPoolExecutor,
+) -> None:
+    node = ConcurrentToolNode([read_file], executor=executor)
+    messages = await results(
+        node, calls(("read_file", {"name": "cv.pdf"}), ("read_file", {"name": "jd.md"}))
+    )
+
+    assert [m.text().split(" read in ")[0] for m in messages] == ["cv.pdf", "jd.md"]
+    assert all(" read in tool_" in m.text() for m in messages)
+
+
+async def test_timed_out_synchronous_tools_release_the_step(
+    executor: ThreadPoolExecutor,
+) -> None:
+    node = ConcurrentToolNode(
+        [read_file], timeouts={"read_file": 0.01}, executor=executor
+    )
+    (message,) = await results(node, calls(("read_file", {"name": "cv.pdf"})))
+    assert message.status == "error"
+
+
+def test_parse_tool_timeouts() -> None:
+    assert parse_tool_timeouts("web_search=15, read_input_file = 2.5,") == {
+        "web_search": 15.0,
+        "read_input_file": 2.5,
+    }
+    assert parse_tool_timeouts("") == {}
+    with pytest.raises(ValueError):
+        parse_tool_timeouts("web_search")
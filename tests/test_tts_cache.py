@@ -0,0 +1,101 @@
+"""The audio cache of fixed phrases, against a TTS engine stand-in."""
+
+import os
+from contextlib import asynccontextmanager
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, AsyncIterator
+
+import pytest
+from livekit import rtc
+
+from voice_agent.tts_cache import TTSCache
+
+pytestmark = pytest.mark.anyio
+
+FILLERS = ["One moment, please.", "Let me check that."]
+
+
+class Engine:
+    """Synthesizes a second of silence per phrase, and counts the calls."""
+
+    sample_rate = 24000
+    num_channels = 1
+
+    def __init__(self, voice: str = "interviewer") -> None:
+        self._opts = SimpleNamespace(voice=voice)
+        self.synthesized: list[str] = []
+
+    @asynccontextmanager
+    async def synthesize(self, text: str) -> AsyncIterator[AsyncIterator[Any]]:
+        self.synthesized.append(text)
+
+        async def events() -> AsyncIterator[Any]:
+            for _ in range(10):
+                frame = rtc.AudioFrame.create(self.sample_rate, 1, 2400)
+                yield SimpleNamespace(frame=frame)
+
+        yield events()
+
+
+def duration(frames: list[rtc.AudioFrame]) -> float:
+    return sum(f.samples_per_channel for f in frames) / Engine.sample_rate
+
+
+async def test_phrases_are_synthesized_once(tmp_path: Path) -> None:
+    cache, engine = TTSCache(tmp_path, FILLERS), Engine()
+
+    first = await cache.synthesize(engine, "One moment, please.")
+    again = await cache.synthesize(engine, " One moment, please. ")
+
+    assert engine.synthesized == ["One moment, please."]
+    assert duration(first) == duration(again) == 1.0
+    assert all(f.samples_per_channel == 2400 for f in again)  # 100 ms frames
+
+
+async def test_other_text_is_never_cached(tmp_path: Path) -> None:
+    cache, engine = TTSCache(tmp_path, FILLERS), Engine()
+
+    await cache.synthesize(engine, "Welcome, Jane.")
+    await cache.synthesize(engine, "Welcome, Jane.")
+
+    assert engine.synthesized == ["Welcome, Jane."] * 2
+    assert list(tmp_path.iterdir()) == []
+
+
+async def test_changing_the_voice_synthesizes_again(tmp_path: Path) -> None:
+    cache = TTSCache(tmp_path, FILLERS)
+    await cache.warm(Engine(), FILLERS)
+
+    engine = Engine(voice="narrator")
+    assert await cache.get(engine, FILLERS[0]) is None
+    await cache.warm(engine, FILLERS)
+    assert engine.synthesized == FILLERS
+
+
+async def test_least_recently_used_clips_are_evicted(tmp_path: Path) -> None:
+    phrases = ["First.", "Second.", "Third."]
+    cache, engine = TTSCache(tmp_path, phrases, max_entries=2), Engine()
+    await cache.warm(engine, phrases[:2])
+    for age, text in enumerate(reversed(phrases[:2]), start=1):
+        path = cache.path(engine, text)
+        os.utime(path, (path.stat().st_atime, path.stat().st_mtime - 60 * age))
+
+    # Playing the oldest clip makes the other one the least recently used
+    assert await cache.get(engine, "First.") is not None
+    await cache.synthesize(engine, "Third.")
+
+    assert await cache.get(engine, "Second.") is None
+    assert await cache.get(engine, "First.") is not None
+    assert await cache.get(engine, "Third.") is not None
+    assert len(list(tmp_path.glob("*.wav"))) == 2
+
+
+async def test_unreadable_clips_are_synthesized_again(tmp_path: Path) -> None:
+    cache, engine = TTSCache(tmp_path, FILLERS), Engine()
+    cache.path(engine, FILLERS[0]).write_bytes(b"not a wav file")
+
+    await cache.synthesize(engine, FILLERS[0])
+
+    assert engine.synthesized == FILLERS[:1]
+    assert await cache.get(engine, FILLERS[0]) is not None
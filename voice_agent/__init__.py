@@ -1,3 +1,5 @@
 from .agent import VoiceAgent
+from .transcript import TranscriptRecorder
+from .tts_cache import TTSCache
 
-__all__ = ["VoiceAgent"]
+__all__ = ["TTSCache", "TranscriptRecorder", "VoiceAgent"]
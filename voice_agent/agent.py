@@ -1,43 +1,172 @@
+import asyncio
+import logging
+import time
+from typing import AsyncIterable, Optional, Sequence
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.runnables import RunnableConfig
 from langgraph.pregel.protocol import PregelProtocol
-from livekit.agents import Agent
+from livekit import rtc
+from livekit.agents import (
+    Agent,
+    AgentStateChangedEvent,
+    ModelSettings,
+    UserInputTranscribedEvent,
+    UserStateChangedEvent,
+    stt,
+    tts,
+    vad,
+)
+from livekit.agents.types import NOT_GIVEN, NotGivenOr
+from livekit.agents.utils import is_given
 from livekit.plugins import (
     assemblyai,
     cartesia,
     silero,
 )
 
+from hr_screen_agent.telemetry import SessionTracer
+from hr_screen_agent.telemetry.metrics import GREETING_DELAY
+
+from .greeting import OPENING_INPUT, PrerenderedGreeting
 from .llm_adapter import LLMAdapter
+from .resume import ResumedGreeting, ResumePoint, load_resume_point
+from .speculation import normalize_transcript
+from .transcript import TranscriptRecorder
+from .tts_cache import TTSCache
+
+logger = logging.getLogger("vocalize-hr-screen-agent")
+
+# How long an interim transcript must stay unchanged, while the candidate is
+# silent, before a reply is generated speculatively
+SPECULATION_STABLE_DELAY = 0.2
+
+# Played from the TTS cache while a slow tool call, such as a web search, runs
+FILLER_PHRASES = (
+    "Let me just check that.",
+    "One moment, please.",
+    "Give me a second to look into that.",
+)
 
 
 class VoiceAgent(Agent):
-    def __init__(self, agent: PregelProtocol, thread_id: str) -> None:
-        super().__init__(
-            instructions="",
-            llm=LLMAdapter(
-                graph=agent, config={"configurable": {"thread_id": thread_id}}
-            ),
+    def __init__(
+        self,
+        agent: PregelProtocol,
+        thread_id: str,
+        *,
+        stt: NotGivenOr[stt.STT | None] = NOT_GIVEN,
+        tts: NotGivenOr[tts.TTS | None] = NOT_GIVEN,
+        vad: NotGivenOr[vad.VAD | None] = NOT_GIVEN,
+        speculative_replies: bool = False,
+        tts_cache: Optional[TTSCache] = None,
+        filler_delay: Optional[float] = None,
+        transcript_dir: Optional[str] = None,
+        callbacks: Sequence[BaseCallbackHandler] = (),
+    ) -> None:
+        if not is_given(stt):
             # AssemblyAI's advanced turn detection
-            stt=assemblyai.STT(
+            stt = assemblyai.STT(
                 end_of_turn_confidence_threshold=0.7,
                 min_end_of_turn_silence_when_confident=160,
                 max_turn_silence=2400,
-            ),
-            tts=cartesia.TTS(
+            )
+        if not is_given(tts):
+            tts = cartesia.TTS(
                 # model="sonic-2",
                 # voice="f786b574-daa5-4673-aa0c-cbe3e8534c02",  # Katie
                 language="en",
                 speed="normal",
-            ),
-            vad=silero.VAD.load(),  # Voice Activity Detection for interruptions
+            )
+        if not is_given(vad):
+            vad = silero.VAD.load()  # Voice Activity Detection for interruptions
+
+        self.tracer = SessionTracer(thread_id)
+        self.recorder = (
+            TranscriptRecorder(transcript_dir, thread_id) if transcript_dir else None
+        )
+        self._graph = agent
+        self._graph_config: RunnableConfig = {
+            "configurable": {"thread_id": thread_id},
+            "callbacks": [self.tracer, *callbacks],
+        }
+        self.adapter = LLMAdapter(
+            graph=agent,
+            config=self._graph_config,
+            tracer=self.tracer,
+            fillers=FILLER_PHRASES if filler_delay is not None else (),
+            filler_delay=filler_delay or 0.0,
+            recorder=self.recorder,
+        )
+        self.tts_cache = tts_cache
+        self.greeting: Optional[PrerenderedGreeting | ResumedGreeting] = None
+        self._warm_task: Optional[asyncio.Task] = None
+        self.speculative_replies = speculative_replies
+        self._interim_key = ""
+        self._speculation_timer: asyncio.TimerHandle | None = None
+
+        super().__init__(
+            instructions="",
+            llm=self.adapter,
+            stt=stt,
+            tts=tts,
+            vad=vad,
             turn_detection="stt",  # Use AssemblyAI's STT-based turn detection
             allow_interruptions=True,
         )
 
     async def on_enter(self):
-        self.session.generate_reply(
-            user_input="Hello",
+        self.session.on("user_state_changed", self._on_user_state_changed)
+        self.session.on("agent_state_changed", self._on_agent_state_changed)
+        if self.speculative_replies:
+            self.session.on("user_input_transcribed", self._on_user_input_transcribed)
+        if self.tts_cache and self.tts and self.adapter.fillers:
+            self._warm_task = asyncio.create_task(self._warm_fillers())
+
+        if self.greeting is not None:
+            await self.greeting.play(self.session)
+        else:
+            self.session.generate_reply(
+                user_input=OPENING_INPUT,
+            )
+
+    def prerender_greeting(self, room: Optional[rtc.Room] = None) -> None:
+        """Start generating and synthesizing the opening turn right away.
+
+        Call this as soon as the job is dispatched, before the session
+        starts. The greeting then plays as soon as the candidate's audio
+        track in `room` is subscribed.
+        """
+        if self.recorder is not None:
+            # The greeting answers the opening input without a LiveKit turn
+            self.recorder.user(OPENING_INPUT)
+        self.greeting = PrerenderedGreeting(
+            self._graph,
+            self._graph_config,
+            self.tts or None,
+            room,
+            self.recorder,
         )
 
+    async def resume(self, room: Optional[rtc.Room] = None) -> Optional[ResumePoint]:
+        """Continue the interview checkpointed on this thread, if there is one.
+
+        A job restarted after a crash, or dispatched again to the same room,
+        gets the same thread. Call this before the session starts: the
+        interview then continues where it stopped, with its phase, documents
+        and timer, instead of starting over. Returns None for a new interview.
+        """
+        started = time.perf_counter()
+        point = await load_resume_point(self._graph, self._graph_config)
+        if point is None:
+            return None
+        logger.info(
+            f"Resuming interview in phase {point.phase} after {point.turns} turns "
+            f"(checkpoint loaded in {(time.perf_counter() - started) * 1000:.0f}ms)"
+        )
+        self.greeting = ResumedGreeting(point, room, self.recorder)
+        return point
+
     async def llm_node(self, chat_ctx, tools, model_settings=None):
         async def process_stream():
             async with self.llm.chat(chat_ctx=chat_ctx, tools=tools) as stream:  # type: ignore
@@ -46,3 +175,86 @@ class VoiceAgent(Agent):
                         yield chunk
 
         return process_stream()
+
+    async def tts_node(
+        self, text: AsyncIterable[str], model_settings: ModelSettings
+    ) -> AsyncIterable[rtc.AudioFrame]:
+        if self.tts_cache is None or self.tts is None:
+            async for frame in Agent.default.tts_node(self, text, model_settings):
+                yield frame
+            return
+
+        # The LLM adapter sends every graph message, and every filler, as one
+        # chunk, so each chunk is a complete utterance that can be cached
+        async for utterance in text:
+            if not self.tts_cache.cacheable(utterance):
+                async for frame in Agent.default.tts_node(
+                    self, _single(utterance), model_settings
+                ):
+                    yield frame
+                continue
+            cached = await self.tts_cache.get(self.tts, utterance)
+            if cached is not None:
+                for frame in cached:
+                    yield frame
+                continue
+
+            frames: list[rtc.AudioFrame] = []
+            async for frame in Agent.default.tts_node(
+                self, _single(utterance), model_settings
+            ):
+                frames.append(frame)
+                yield frame
+            # Not reached when the candidate interrupted, so clips are complete
+            await self.tts_cache.put(self.tts, utterance, frames)
+
+    async def _warm_fillers(self) -> None:
+        try:
+            await self.tts_cache.warm(self.tts, self.adapter.fillers)  # type: ignore[union-attr]
+        except Exception:
+            logger.exception("Failed to synthesize the filler phrases")
+
+    def _on_user_state_changed(self, ev: UserStateChangedEvent) -> None:
+        if ev.old_state == "speaking" and ev.new_state != "speaking":
+            self.tracer.mark_end_of_speech()
+
+    def _on_agent_state_changed(self, ev: AgentStateChangedEvent) -> None:
+        if ev.new_state == "speaking":
+            self.tracer.mark_first_audio()
+            greeting = self.greeting
+            if greeting is not None and greeting.joined_at is not None:
+                # Only the first time the agent speaks
+                self.greeting = None
+                GREETING_DELAY.labels(source=greeting.source).observe(
+                    time.perf_counter() - greeting.joined_at
+                )
+
+    def _on_user_input_transcribed(self, ev: UserInputTranscribedEvent) -> None:
+        key = normalize_transcript(ev.transcript)
+        if ev.is_final or not key:
+            self._interim_key = ""
+            self._cancel_speculation_timer()
+            return
+        if key == self._interim_key:
+            return
+
+        # The candidate said more, wait for the new transcript to settle
+        self._interim_key = key
+        self._cancel_speculation_timer()
+        self._speculation_timer = asyncio.get_running_loop().call_later(
+            SPECULATION_STABLE_DELAY, self._speculate, ev.transcript
+        )
+
+    def _speculate(self, transcript: str) -> None:
+        self._speculation_timer = None
+        if self.session.user_state != "speaking":
+            self.adapter.speculate(transcript)
+
+    def _cancel_speculation_timer(self) -> None:
+        if self._speculation_timer is not None:
+            self._speculation_timer.cancel()
+            self._speculation_timer = None
+
+
+async def _single(text: str) -> AsyncIterable[str]:
+    yield text
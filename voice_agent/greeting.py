@@ -0,0 +1,167 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from datetime import datetime, timezone
+from typing import AsyncIterator, Optional
+
+from langchain_core.messages import AIMessage, HumanMessage
+from langchain_core.runnables import RunnableConfig
+from langgraph.pregel.protocol import PregelProtocol
+from livekit import rtc
+from livekit.agents import AgentSession, tts
+from livekit.agents.types import NOT_GIVEN
+
+from .llm_adapter import answer_interrupted_tool_calls
+from .transcript import TranscriptRecorder
+
+logger = logging.getLogger("vocalize-hr-screen-agent")
+
+# Stands in for the candidate's first turn, which starts the interview
+OPENING_INPUT = "Hello"
+
+# Result of the tool calls a failed pre-render left unanswered
+FAILED_TOOL_RESULT = "Cancelled: this tool call failed before the candidate joined."
+
+
+class PrerenderedGreeting:
+    """The opening turn, generated and synthesized before the candidate joins.
+
+    Rendering starts as soon as the greeting is created: the graph answers the
+    opening input on the session's thread, so its checkpoint holds the turn
+    as if it had happened live, and the reply is synthesized in full. `play`
+    then only has to wait for the candidate's audio track. The interview
+    timer, started by the opening turn's preparation, is restarted when the
+    candidate joins, so a slow join does not eat into the interview.
+    """
+
+    def __init__(
+        self,
+        graph: PregelProtocol,
+        config: RunnableConfig,
+        tts: tts.TTS | None,
+        room: rtc.Room | None = None,
+        recorder: TranscriptRecorder | None = None,
+    ) -> None:
+        self._graph = graph
+        self._config = config
+        self._tts = tts
+        self._room = room
+        self._recorder = recorder
+        # When the candidate's audio was subscribed, and whether the greeting
+        # played was pre-rendered or generated live
+        self.joined_at: Optional[float] = None
+        self.source: Optional[str] = None
+        self._task = asyncio.create_task(self._render())
+
+    async def _render(self) -> tuple[str, list[rtc.AudioFrame]]:
+        parts: list[str] = []
+        async for output in self._graph.astream(
+            {"messages": [HumanMessage(content=OPENING_INPUT)]},
+            self._config,
+            stream_mode="updates",
+        ):
+            updates = next(iter(output.values()))
+            messages = updates.get("messages") if updates else None
+            message = messages[-1] if messages else None
+            if isinstance(message, AIMessage) and (content := message.text()):
+                parts.append(content)
+        text = " ".join(parts)
+
+        frames: list[rtc.AudioFrame] = []
+        if self._tts is not None and text:
+            try:
+                async with self._tts.synthesize(text) as stream:
+                    frames = [ev.frame async for ev in stream]
+            except Exception:
+                # The turn is checkpointed, so it is spoken with live synthesis
+                logger.exception("Failed to synthesize the greeting")
+                frames = []
+        return text, frames
+
+    async def rendered(self) -> tuple[str, list[rtc.AudioFrame]]:
+        """Wait for the greeting's text and audio."""
+        return await self._task
+
+    async def play(self, session: AgentSession) -> None:
+        """Speak the greeting as soon as the candidate can hear it.
+
+        Falls back to generating the opening turn live if rendering failed.
+        """
+        try:
+            text, frames = await self.rendered()
+        except Exception:
+            logger.exception("Failed to pre-render the greeting")
+            text, frames = "", []
+
+        if self._room is not None:
+            await _candidate_audio(self._room)
+        self.joined_at = time.perf_counter()
+
+        if not text:
+            self.source = "live"
+            if await self._opening_checkpointed():
+                # Answer the opening input the failed render already added
+                await answer_interrupted_tool_calls(
+                    self._graph, self._config, FAILED_TOOL_RESULT
+                )
+                session.generate_reply()
+            else:
+                session.generate_reply(user_input=OPENING_INPUT)
+            return
+        self.source = "prerendered"
+        if self._recorder is not None:
+            self._recorder.agent(text)
+        session.say(text, audio=_replay(frames) if frames else NOT_GIVEN)
+        await self._restart_timer()
+
+    async def _opening_checkpointed(self) -> bool:
+        """Whether the thread already holds the opening input."""
+        try:
+            snapshot = await self._graph.aget_state(self._config)
+        except Exception:
+            logger.exception("Failed to load the checkpoint of the greeting")
+            return False
+        messages = snapshot.values.get("messages", [])
+        return any(isinstance(m, HumanMessage) for m in messages)
+
+    async def _restart_timer(self) -> None:
+        """Start the interview clock now, if the opening turn started the timer."""
+        snapshot = await self._graph.aget_state(self._config)
+        if snapshot.values.get("start_time") is not None:
+            # As the agent's finished reply, so the thread has nothing to run
+            await self._graph.aupdate_state(
+                self._config,
+                {"start_time": datetime.now(timezone.utc)},
+                as_node="agent",
+            )
+
+
+async def _candidate_audio(room: rtc.Room) -> None:
+    """Wait until an audio track of a remote participant is subscribed."""
+    for participant in room.remote_participants.values():
+        for publication in participant.track_publications.values():
+            if publication.kind == rtc.TrackKind.KIND_AUDIO and publication.subscribed:
+                return
+
+    subscribed = asyncio.Event()
+
+    def on_track_subscribed(
+        track: rtc.Track,
+        publication: rtc.RemoteTrackPublication,
+        participant: rtc.RemoteParticipant,
+    ) -> None:
+        if track.kind == rtc.TrackKind.KIND_AUDIO:
+            subscribed.set()
+
+    room.on("track_subscribed", on_track_subscribed)
+    try:
+        await subscribed.wait()
+    finally:
+        room.off("track_subscribed", on_track_subscribed)
+
+
+async def _replay(frames: list[rtc.AudioFrame]) -> AsyncIterator[rtc.AudioFrame]:
+    for frame in frames:
+        yield frame
@@ -1,11 +1,14 @@
 from __future__ import annotations
 
-from typing import Any
+import asyncio
+import random
+from typing import Any, AsyncIterator, Sequence
 
 from langchain_core.messages import (
     AIMessage,
     HumanMessage,
     SystemMessage,
+    ToolMessage,
 )
 from langchain_core.runnables import RunnableConfig
 from langgraph.pregel.protocol import PregelProtocol
@@ -20,6 +23,16 @@ from livekit.agents.types import (
     NotGivenOr,
 )
 
+from hr_screen_agent.telemetry import SessionTracer
+from hr_screen_agent.telemetry.metrics import FILLERS_PLAYED, GRAPH_RUNS_CANCELLED
+
+from .speculation import Speculation, graph_checkpointer
+from .transcript import TranscriptRecorder
+
+INTERRUPTED_TOOL_RESULT = (
+    "Cancelled: the candidate interrupted before this tool call finished."
+)
+
 
 class LLMAdapter(llm.LLM):
     def __init__(
@@ -27,10 +40,62 @@ class LLMAdapter(llm.LLM):
         graph: PregelProtocol,
         *,
         config: RunnableConfig | None = None,
+        tracer: SessionTracer | None = None,
+        fillers: Sequence[str] = (),
+        filler_delay: float = 1.0,
+        recorder: TranscriptRecorder | None = None,
     ) -> None:
         super().__init__()
         self._graph = graph
         self._config = config
+        self._tracer = tracer
+        self.fillers = fillers
+        self._filler_delay = filler_delay
+        self._recorder = recorder
+        self._active: LangGraphStream | None = None
+        self._speculation: Speculation | None = None
+        # LiveKit message id -> graph message id, for turns answered speculatively
+        self._message_ids: dict[str, str] = {}
+        self._background: set[asyncio.Task] = set()
+
+    def speculate(self, transcript: str) -> None:
+        """Start answering a likely final transcript on a fork of the thread.
+
+        The fork is committed if the next turn's transcript matches, and
+        discarded otherwise.
+        """
+        checkpointer = graph_checkpointer(self._graph)
+        if checkpointer is None or not self._config or not transcript.strip():
+            return
+        if self._active is not None and not self._active.done:
+            return  # the thread is about to change under the fork
+        if self._speculation is not None:
+            if self._speculation.matches(transcript):
+                return
+            self._discard(self._speculation)
+        self._speculation = Speculation(
+            self._graph, checkpointer, self._config, transcript
+        )
+
+    def _take_speculation(self, chat_ctx: ChatContext) -> Speculation | None:
+        speculation, self._speculation = self._speculation, None
+        if speculation is None:
+            return None
+        last = chat_ctx.items[-1] if chat_ctx.items else None
+        if (
+            isinstance(last, ChatMessage)
+            and last.role == "user"
+            and speculation.matches(last.text_content or "")
+        ):
+            self._message_ids[last.id] = speculation.message_id
+            return speculation
+        self._discard(speculation)
+        return None
+
+    def _discard(self, speculation: Speculation) -> None:
+        task = asyncio.create_task(speculation.discard())
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
 
     def chat(
         self,
@@ -43,14 +108,26 @@ class LLMAdapter(llm.LLM):
         tool_choice: NotGivenOr[ToolChoice] = NOT_GIVEN,
         extra_kwargs: NotGivenOr[dict[str, Any]] = NOT_GIVEN,
     ) -> LangGraphStream:
-        return LangGraphStream(
+        if self._recorder is not None:
+            for item in _new_user_messages(chat_ctx):
+                self._recorder.user(item.text_content or "", item.id)
+        # A new turn supersedes the previous one, e.g. when the candidate barged in
+        self._active = LangGraphStream(
             self,
             chat_ctx=chat_ctx,
             tools=tools or [],
             graph=self._graph,
             conn_options=conn_options,
             config=self._config,
+            tracer=self._tracer,
+            previous=self._active,
+            speculation=self._take_speculation(chat_ctx),
+            message_ids=self._message_ids,
+            fillers=self.fillers,
+            filler_delay=self._filler_delay,
+            recorder=self._recorder,
         )
+        return self._active
 
 
 class LangGraphStream(llm.LLMStream):
@@ -63,6 +140,13 @@ class LangGraphStream(llm.LLMStream):
         conn_options: APIConnectOptions,
         graph: PregelProtocol,
         config: RunnableConfig | None = None,
+        tracer: SessionTracer | None = None,
+        previous: LangGraphStream | None = None,
+        speculation: Speculation | None = None,
+        message_ids: dict[str, str] | None = None,
+        fillers: Sequence[str] = (),
+        filler_delay: float = 1.0,
+        recorder: TranscriptRecorder | None = None,
     ):
         super().__init__(
             llm,
@@ -72,23 +156,127 @@ class LangGraphStream(llm.LLMStream):
         )
         self._graph = graph
         self._config = config
+        self._tracer = tracer
+        self._previous = previous
+        self._speculation = speculation
+        self._message_ids = message_ids or {}
+        self._fillers = fillers
+        self._filler_delay = filler_delay
+        self._filler_timer: asyncio.TimerHandle | None = None
+        self._filler_sent = False
+        self._recorder = recorder
+        self._reply: list[str] = []
+        self.cancelled = False
+
+    @property
+    def done(self) -> bool:
+        """Whether the run and its cleanup have finished."""
+        return self._task.done()
 
     async def _run(self) -> None:
-        state = self._chat_ctx_to_state()
+        if self._previous is not None:
+            # Cancel the abandoned run instead of queueing behind it
+            await self._previous.aclose()
+            self._previous = None
+
+        if self._speculation is not None:
+            messages = self._speculative_messages(self._speculation)
+        else:
+            messages = self._graph_messages(self._chat_ctx_to_state())
+
+        try:
+            async for message in messages:
+                self._cancel_filler()
+                if isinstance(message, AIMessage) and message.tool_calls:
+                    self._schedule_filler()
+                chat_chunk = _to_chat_chunk(message)
+                if chat_chunk:
+                    if self._tracer:
+                        self._tracer.mark_first_token()
+                    self._reply.append(chat_chunk.delta.content or "")  # type: ignore[union-attr]
+                    self._event_ch.send_nowait(chat_chunk)
+        except asyncio.CancelledError:
+            self.cancelled = True
+            GRAPH_RUNS_CANCELLED.inc()
+            raise
+        finally:
+            self._cancel_filler()
+            await asyncio.shield(self._finish())
+
+    def _schedule_filler(self) -> None:
+        """Play a filler phrase if the requested tools take longer than the delay."""
+        if self._fillers and not self._filler_sent:
+            self._filler_timer = asyncio.get_running_loop().call_later(
+                self._filler_delay, self._send_filler
+            )
 
+    def _send_filler(self) -> None:
+        self._filler_timer = None
+        self._filler_sent = True  # at most once per turn
+        FILLERS_PLAYED.inc()
+        self._event_ch.send_nowait(
+            llm.ChatChunk(
+                id=utils.shortuuid("LC_"),
+                delta=llm.ChoiceDelta(
+                    role="assistant",
+                    # separated from the reply that follows in the transcript
+                    content=f"{random.choice(self._fillers)} ",
+                ),
+            )
+        )
+
+    def _cancel_filler(self) -> None:
+        if self._filler_timer is not None:
+            self._filler_timer.cancel()
+            self._filler_timer = None
+
+    async def _speculative_messages(
+        self, speculation: Speculation
+    ) -> AsyncIterator[Any]:
+        """Replay a confirmed speculative run, then run its tools on the thread.
+
+        A fork of a thread that moved on, e.g. when the cancelled previous run
+        answered its tool calls, could not be committed. Nothing of it is
+        replayed then: the turn is answered on the thread instead, so the
+        candidate never hears a reply the thread does not record.
+        """
+        if not await speculation.is_current():
+            self._speculation = None
+            await speculation.discard(outcome="stale")
+            async for message in self._graph_messages(self._chat_ctx_to_state()):
+                yield message
+            return
+
+        async for message in speculation.messages():
+            yield message
+        committed = await speculation.commit()
+        self._speculation = None
+        if committed and speculation.paused:
+            # The fork stopped before its tools, so the thread continues from there
+            async for message in self._graph_messages(None):
+                yield message
+
+    async def _graph_messages(self, state: dict[str, Any] | None) -> AsyncIterator[Any]:
         async for output in self._graph.astream(
             state,
             self._config,
             stream_mode="updates",
         ):
             updates = next(iter(output.values()))
-            if not updates:
-                continue
-            last_message = updates["messages"][-1]
+            # The pre-model hook may only update the interview phase
+            if updates and updates.get("messages"):
+                yield updates["messages"][-1]
 
-            chat_chunk = _to_chat_chunk(last_message)
-            if chat_chunk:
-                self._event_ch.send_nowait(chat_chunk)
+    async def _finish(self) -> None:
+        if self._recorder is not None:
+            self._recorder.agent(" ".join(self._reply), cancelled=self.cancelled)
+        speculation, self._speculation = self._speculation, None
+        if speculation is not None:
+            await speculation.commit()
+        if self.cancelled and self._config:
+            await answer_interrupted_tool_calls(
+                self._graph, self._config, INTERRUPTED_TOOL_RESULT
+            )
 
     def _chat_ctx_to_state(self) -> dict[str, Any]:
         """Convert chat context to langgraph input"""
@@ -98,19 +286,74 @@ class LangGraphStream(llm.LLMStream):
             # only support chat messages, ignoring tool calls
             if isinstance(item, ChatMessage):
                 content = item.text_content
+                message_id = self._message_ids.get(item.id, item.id)
                 if content:
                     if item.role == "assistant":
-                        messages.append(AIMessage(content=content, id=item.id))
+                        messages.append(AIMessage(content=content, id=message_id))
                     elif item.role == "user":
-                        messages.append(HumanMessage(content=content, id=item.id))
+                        messages.append(HumanMessage(content=content, id=message_id))
                     elif item.role in ["system", "developer"]:
-                        messages.append(SystemMessage(content=content, id=item.id))
+                        messages.append(SystemMessage(content=content, id=message_id))
+
+        if graph_checkpointer(self._graph) is not None:
+            # The checkpoint already holds the earlier turns, and LiveKit's
+            # copies of the agent's replies have other ids, so they would be
+            # appended again. Only send what came after the last reply.
+            last_reply = max(
+                (i for i, m in enumerate(messages) if isinstance(m, AIMessage)),
+                default=-1,
+            )
+            messages = messages[last_reply + 1 :]
 
         return {
             "messages": messages,
         }
 
 
+async def answer_interrupted_tool_calls(
+    graph: PregelProtocol, config: RunnableConfig, content: str
+) -> None:
+    """Close tool calls that an interrupted run left without a result.
+
+    LangGraph only checkpoints completed steps, so a cancelled run, or a job
+    that died, leaves the thread at its last completed step. If that step
+    was the model asking for tools, every call needs a result before the
+    model can be called again.
+    """
+    snapshot = await graph.aget_state(config)
+    messages = snapshot.values.get("messages", [])
+    last_ai = next((m for m in reversed(messages) if isinstance(m, AIMessage)), None)
+    if last_ai is None or not last_ai.tool_calls:
+        return
+
+    answered = {m.tool_call_id for m in messages if isinstance(m, ToolMessage)}
+    results = [
+        ToolMessage(
+            content=content,
+            name=tool_call["name"],
+            tool_call_id=tool_call["id"],
+            status="error",
+        )
+        for tool_call in last_ai.tool_calls
+        if tool_call["id"] not in answered
+    ]
+    if results:
+        await graph.aupdate_state(config, {"messages": results}, as_node="tools")
+
+
+def _new_user_messages(chat_ctx: ChatContext) -> list[ChatMessage]:
+    """The candidate messages that came after the agent's last reply."""
+    messages: list[ChatMessage] = []
+    for item in reversed(chat_ctx.items):
+        if not isinstance(item, ChatMessage):
+            continue
+        if item.role == "assistant":
+            break
+        if item.role == "user" and item.text_content:
+            messages.append(item)
+    return messages[::-1]
+
+
 def _to_chat_chunk(msg: Any) -> llm.ChatChunk | None:
     message_id = utils.shortuuid("LC_")
 
@@ -0,0 +1,188 @@
+import asyncio
+import os
+import threading
+import time
+from typing import Any, Optional
+
+import psutil
+from prometheus_client import REGISTRY, CollectorRegistry, multiprocess
+
+from hr_screen_agent.telemetry.metrics import (
+    EVENT_LOOP_LAG,
+    SESSION_COST,
+    WORKER_LOAD,
+)
+
+
+class LoopLagMonitor:
+    """Reports how late the event loop of a job process runs its callbacks.
+
+    Noise cancellation, VAD and sync tools share the job's loop with the
+    audio pipeline. The largest lag of the last `window` seconds is published
+    on `EVENT_LOOP_LAG`, which the worker's `WorkerLoadModel` reads across
+    all job processes.
+    """
+
+    def __init__(self, interval: float = 0.05, window: float = 5.0) -> None:
+        self.interval = interval
+        self.window = window
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        EVENT_LOOP_LAG.set(0)
+
+    async def _run(self) -> None:
+        peak = 0.0
+        published = time.perf_counter()
+        while True:
+            started = time.perf_counter()
+            await asyncio.sleep(self.interval)
+            now = time.perf_counter()
+            peak = max(peak, now - started - self.interval)
+            if now - published >= self.window:
+                EVENT_LOOP_LAG.set(peak)
+                peak, published = 0.0, now
+
+
+class WorkerLoadModel:
+    """Load function of the LiveKit worker, from the measured cost of a session.
+
+    The default load function reports the machine's CPU usage, so a worker
+    keeps accepting interviews until they are already slow. This model
+    samples the CPU and memory of the worker's process tree and the event
+    loop lag of its job processes, and learns the cost of one session from
+    them: an exponential moving average of the usage above the idle baseline,
+    divided by the number of running jobs. `session_cpu` and
+    `session_memory_mb` are the estimates used until it has measured one.
+
+    The reported load is the largest of, for CPU and memory, the share of
+    the capacity in use once one more session is accepted, and for the loop
+    lag, the share of `max_loop_lag` reached. With LiveKit's `load_threshold`
+    the worker is marked full, and new interviews are routed to other
+    workers, before a new session would push it past its capacity.
+
+    Pass the instance as `load_fnc` of `WorkerOptions`; LiveKit calls it from
+    a thread every half second.
+    """
+
+    def __init__(
+        self,
+        *,
+        cpu_capacity: Optional[float] = None,
+        memory_limit_mb: Optional[float] = None,
+        max_loop_lag: float = 0.1,
+        session_cpu: float = 0.25,
+        session_memory_mb: float = 250.0,
+        smoothing: float = 0.05,
+    ) -> None:
+        self.cpu_capacity = cpu_capacity or float(psutil.cpu_count() or 1)
+        self.memory_limit = (
+            memory_limit_mb * 1024 * 1024
+            if memory_limit_mb
+            else psutil.virtual_memory().total * 0.8
+        )
+        self.max_loop_lag = max_loop_lag
+        self.smoothing = smoothing
+        self.session_cpu = session_cpu
+        self.session_memory = session_memory_mb * 1024 * 1024
+        self.idle_cpu: Optional[float] = None
+        self.idle_memory: Optional[float] = None
+        self._processes: dict[int, psutil.Process] = {}
+        self._lock = threading.Lock()
+
+    def __call__(self, worker: Any) -> float:
+        with self._lock:
+            active_jobs = len(worker.active_jobs)
+            # The first CPU sample of a process is always 0
+            primed = bool(self._processes)
+            cpu, memory = self._sample_processes()
+            if primed:
+                self._calibrate(active_jobs, cpu, memory)
+            return self.load(cpu, memory, _loop_lag())
+
+    def load(self, cpu: float, memory: float, loop_lag: float) -> float:
+        """Load in [0, 1] for the given usage, counting one more session."""
+        loads = {
+            "cpu": (cpu + self.session_cpu) / self.cpu_capacity,
+            "memory": (memory + self.session_memory) / self.memory_limit,
+            "loop_lag": loop_lag / self.max_loop_lag,
+        }
+        total = min(1.0, max(loads.values()))
+        for resource, value in loads.items():
+            WORKER_LOAD.labels(resource=resource).set(value)
+        WORKER_LOAD.labels(resource="total").set(total)
+        return total
+
+    def capacity(self, load_threshold: float) -> int:
+        """Sessions the worker can run below `load_threshold`, as calibrated."""
+        by_cpu = (
+            load_threshold * self.cpu_capacity - (self.idle_cpu or 0.0)
+        ) / self.session_cpu
+        by_memory = (
+            load_threshold * self.memory_limit - (self.idle_memory or 0.0)
+        ) / self.session_memory
+        return max(0, int(min(by_cpu, by_memory)))
+
+    def _calibrate(self, active_jobs: int, cpu: float, memory: float) -> None:
+        def average(current: Optional[float], sample: float) -> float:
+            if current is None:
+                return sample
+            return current + self.smoothing * (sample - current)
+
+        if active_jobs == 0:
+            self.idle_cpu = average(self.idle_cpu, cpu)
+            self.idle_memory = average(self.idle_memory, memory)
+        elif self.idle_cpu is not None and self.idle_memory is not None:
+            self.session_cpu = average(
+                self.session_cpu, max(0.0, cpu - self.idle_cpu) / active_jobs
+            )
+            self.session_memory = average(
+                self.session_memory, max(0.0, memory - self.idle_memory) / active_jobs
+            )
+        SESSION_COST.labels(resource="cpu").set(self.session_cpu)
+        SESSION_COST.labels(resource="memory").set(self.session_memory)
+
+    def _sample_processes(self) -> tuple[float, float]:
+        """CPU (in cores) and RSS (in bytes) of this process and its children."""
+        root = psutil.Process()
+        try:
+            current = [root, *root.children(recursive=True)]
+        except psutil.Error:
+            current = [root]
+
+        cpu = memory = 0.0
+        alive: dict[int, psutil.Process] = {}
+        for process in current:
+            # Keep the same objects, cpu_percent measures since the last call
+            process = self._processes.get(process.pid, process)
+            try:
+                cpu += process.cpu_percent() / 100
+                memory += process.memory_info().rss
+            except psutil.Error:
+                continue
+            alive[process.pid] = process
+
+        for pid in self._processes.keys() - alive.keys():
+            if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+                # Drop the loop lag of job processes that exited
+                multiprocess.mark_process_dead(pid)
+        self._processes = alive
+        return cpu, memory
+
+
+def _loop_lag() -> float:
+    """Largest recent event-loop lag across the job processes."""
+    registry = REGISTRY
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    return registry.get_sample_value("hr_screen_event_loop_lag_seconds") or 0.0
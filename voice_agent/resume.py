@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional
+
+from langchain_core.messages import AIMessage, HumanMessage
+from langchain_core.runnables import RunnableConfig
+from langgraph.pregel.protocol import PregelProtocol
+from livekit import rtc
+from livekit.agents import AgentSession
+
+from .greeting import _candidate_audio
+from .llm_adapter import answer_interrupted_tool_calls
+from .transcript import TranscriptRecorder
+
+RESTARTED_TOOL_RESULT = (
+    "Cancelled: the session restarted before this tool call finished. "
+    "Call the tool again if its result is still needed."
+)
+
+# Said before repeating the last question of a resumed interview
+RESUME_APOLOGY = "Sorry about that, we were disconnected for a moment."
+
+
+@dataclass
+class ResumePoint:
+    """Where an interview continues after its job restarted.
+
+    `last_reply` is the agent's last complete reply, usually the question
+    the candidate was about to answer. It is None when the turn in progress
+    was not finished, e.g. the candidate had answered but the agent had not
+    replied yet, and the graph has to continue it.
+    """
+
+    phase: Optional[str]
+    start_time: Optional[datetime]
+    turns: int
+    last_reply: Optional[str]
+
+
+async def load_resume_point(
+    graph: PregelProtocol, config: RunnableConfig
+) -> Optional[ResumePoint]:
+    """Reattach to the interview checkpointed on the thread of `config`.
+
+    Returns None for a new interview. Tool calls that the previous job left
+    without a result are closed, so the model can be called again.
+    """
+    snapshot = await graph.aget_state(config)
+    messages = snapshot.values.get("messages") or []
+    if not messages:
+        return None
+
+    await answer_interrupted_tool_calls(graph, config, RESTARTED_TOOL_RESULT)
+    last = messages[-1]
+    finished = isinstance(last, AIMessage) and not last.tool_calls and last.text()
+    return ResumePoint(
+        phase=snapshot.values.get("phase"),
+        start_time=snapshot.values.get("start_time"),
+        turns=sum(isinstance(m, HumanMessage) for m in messages),
+        last_reply=last.text() if finished else None,
+    )
+
+
+class ResumedGreeting:
+    """The first turn of a resumed interview, played like a greeting.
+
+    Nothing is regenerated when the previous job had finished its reply: the
+    agent apologizes and repeats it, which costs one TTS request. An
+    unfinished turn is continued by the graph from the checkpoint.
+    """
+
+    source = "resumed"
+
+    def __init__(
+        self,
+        point: ResumePoint,
+        room: rtc.Room | None = None,
+        recorder: TranscriptRecorder | None = None,
+    ) -> None:
+        self.point = point
+        self._room = room
+        self._recorder = recorder
+        self.joined_at: Optional[float] = None
+
+    async def play(self, session: AgentSession) -> None:
+        if self._room is not None:
+            await _candidate_audio(self._room)
+        self.joined_at = time.perf_counter()
+
+        if self.point.last_reply is None:
+            # No new input: the graph continues from the checkpoint
+            session.generate_reply()
+            return
+
+        text = self.point.last_reply
+        if self.point.turns > 1:
+            # The candidate had already heard more than the greeting
+            text = f"{RESUME_APOLOGY} {text}"
+        if self._recorder is not None:
+            self._recorder.agent(text)
+        session.say(text)
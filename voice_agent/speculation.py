@@ -0,0 +1,162 @@
+from __future__ import annotations
+
+import asyncio
+import re
+import time
+import uuid
+from typing import AsyncIterator
+
+from langchain_core.messages import BaseMessage, HumanMessage
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import BaseCheckpointSaver
+from langgraph.pregel.protocol import PregelProtocol
+
+from hr_screen_agent.telemetry.metrics import SPECULATION_LEAD, SPECULATIONS
+
+
+def normalize_transcript(text: str) -> str:
+    """Normalize a transcript so interim and formatted final transcripts compare equal."""
+    return " ".join(re.sub(r"[^\w\s']", " ", text.lower()).split())
+
+
+def _checkpoint_config(thread_id: str) -> RunnableConfig:
+    return {"configurable": {"thread_id": thread_id, "checkpoint_ns": ""}}
+
+
+async def _copy_latest_checkpoint(
+    checkpointer: BaseCheckpointSaver, source: str, target: str
+) -> None:
+    saved = await checkpointer.aget_tuple(_checkpoint_config(source))
+    if saved is None:
+        return
+    await checkpointer.aput(
+        _checkpoint_config(target),
+        saved.checkpoint,
+        saved.metadata,
+        saved.checkpoint["channel_versions"],
+    )
+
+
+class Speculation:
+    """A graph run started on a likely transcript, before the turn is final.
+
+    The run works on a scratch fork of the thread's latest checkpoint, so the
+    real thread is untouched until the final transcript matches and the fork
+    is committed. Otherwise the fork is cancelled and deleted. The run stops
+    before the tools node: tools such as `end_call` or `start_timer` act
+    outside the thread, so they only run on the real thread once the turn is
+    confirmed (see `paused`).
+    """
+
+    def __init__(
+        self,
+        graph: PregelProtocol,
+        checkpointer: BaseCheckpointSaver,
+        config: RunnableConfig,
+        transcript: str,
+    ) -> None:
+        self.transcript = transcript
+        self.key = normalize_transcript(transcript)
+        self.message_id = str(uuid.uuid4())
+        self.started = time.perf_counter()
+        self._graph = graph
+        self._checkpointer = checkpointer
+        self._thread_id = config["configurable"]["thread_id"]
+        self._fork_id = f"{self._thread_id}__spec__{self.message_id}"
+        self._config: RunnableConfig = {
+            **config,
+            "configurable": {**config["configurable"], "thread_id": self._fork_id},
+        }
+        self._base_checkpoint_id: str | None = None
+        # Set once the fork is taken, or the run ended without taking it
+        self._forked = asyncio.Event()
+        # Whether the run stopped with tool calls the committed thread has to run
+        self.paused = False
+        self._messages: asyncio.Queue[BaseMessage | None] = asyncio.Queue()
+        self._task = asyncio.create_task(self._run())
+
+    def matches(self, transcript: str) -> bool:
+        return normalize_transcript(transcript) == self.key
+
+    async def _run(self) -> None:
+        try:
+            saved = await self._checkpointer.aget_tuple(
+                _checkpoint_config(self._thread_id)
+            )
+            self._base_checkpoint_id = saved.checkpoint["id"] if saved else None
+            await _copy_latest_checkpoint(
+                self._checkpointer, self._thread_id, self._fork_id
+            )
+            self._forked.set()
+            async for output in self._graph.astream(
+                {
+                    "messages": [
+                        HumanMessage(content=self.transcript, id=self.message_id)
+                    ]
+                },
+                self._config,
+                stream_mode="updates",
+                interrupt_before=["tools"],
+            ):
+                updates = next(iter(output.values()))
+                if updates and updates.get("messages"):
+                    self._messages.put_nowait(updates["messages"][-1])
+            snapshot = await self._graph.aget_state(self._config)
+            self.paused = "tools" in snapshot.next
+        finally:
+            self._forked.set()
+            self._messages.put_nowait(None)
+
+    async def messages(self) -> AsyncIterator[BaseMessage]:
+        """Yield the last message of every graph update, including those already produced."""
+        SPECULATION_LEAD.observe(time.perf_counter() - self.started)
+        while (message := await self._messages.get()) is not None:
+            yield message
+        await self._task  # surface errors of the run
+
+    async def is_current(self) -> bool:
+        """Whether the thread is still at the checkpoint the fork was taken from."""
+        await self._forked.wait()
+        current = await self._checkpointer.aget_tuple(
+            _checkpoint_config(self._thread_id)
+        )
+        current_id = current.checkpoint["id"] if current else None
+        return current_id == self._base_checkpoint_id
+
+    async def commit(self) -> bool:
+        """Make the fork's latest checkpoint the thread's latest checkpoint.
+
+        A run that is still going is cancelled first. LangGraph only
+        checkpoints completed steps, so the fork is consistent either way.
+        """
+        await self._cancel()
+        try:
+            if not await self.is_current():
+                # The thread moved on since the fork was taken
+                SPECULATIONS.labels(outcome="stale").inc()
+                return False
+            await _copy_latest_checkpoint(
+                self._checkpointer, self._fork_id, self._thread_id
+            )
+            SPECULATIONS.labels(outcome="committed").inc()
+            return True
+        finally:
+            await self._checkpointer.adelete_thread(self._fork_id)
+
+    async def discard(self, outcome: str = "discarded") -> None:
+        await self._cancel()
+        await self._checkpointer.adelete_thread(self._fork_id)
+        SPECULATIONS.labels(outcome=outcome).inc()
+
+    async def _cancel(self) -> None:
+        if not self._task.done():
+            self._task.cancel()
+        await asyncio.wait({self._task})
+        if not self._task.cancelled():
+            self._task.exception()  # mark as retrieved
+
+
+def graph_checkpointer(graph: PregelProtocol) -> BaseCheckpointSaver | None:
+    """Return the checkpointer of a compiled graph, if it has one."""
+    checkpointer = getattr(graph, "checkpointer", None)
+    return checkpointer if isinstance(checkpointer, BaseCheckpointSaver) else None
@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import queue
+import threading
+import time
+from pathlib import Path
+from typing import Any, Iterator, Optional
+
+
+class TranscriptRecorder:
+    """Append-only JSONL log of one session's turns.
+
+    Every candidate turn is written as a `user` record with its wall-clock
+    time and its offset from the start of the session, and every reply as an
+    `agent` record. Records are appended one line at a time by a background
+    thread and flushed immediately, so recording never blocks the event loop,
+    the log survives a crashed job and it can be replayed with
+    `benchmarks.replay`.
+    """
+
+    def __init__(self, directory: str | os.PathLike[str], thread_id: str) -> None:
+        self.thread_id = thread_id
+        self.path = Path(directory) / f"{thread_id}.jsonl"
+        self._started = time.time()
+        self._lines: queue.SimpleQueue[Optional[str]] = queue.SimpleQueue()
+        self._writer: Optional[threading.Thread] = None
+        self._recorded: set[str] = set()
+
+    def user(self, content: str, message_id: Optional[str] = None) -> None:
+        """Record a candidate turn, once per LiveKit message id."""
+        if message_id is not None:
+            if message_id in self._recorded:
+                return
+            self._recorded.add(message_id)
+        self._write({"type": "user", "content": content})
+
+    def agent(self, content: str, *, cancelled: bool = False) -> None:
+        """Record the agent's reply to the last turn."""
+        self._write({"type": "agent", "content": content, "cancelled": cancelled})
+
+    def _write(self, record: dict[str, Any]) -> None:
+        now = time.time()
+        if self._writer is None:
+            self._lines.put(
+                json.dumps({"type": "session", "thread_id": self.thread_id, "at": now})
+            )
+            self._writer = threading.Thread(
+                target=self._write_lines, name="transcript", daemon=True
+            )
+            self._writer.start()
+        record = {**record, "at": now, "offset": now - self._started}
+        self._lines.put(json.dumps(record))
+
+    def _write_lines(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, "a", encoding="utf-8", buffering=1) as f:
+            while (line := self._lines.get()) is not None:
+                f.write(line + "\n")
+
+    async def close(self) -> None:
+        """Write the records still queued and close the log."""
+        writer, self._writer = self._writer, None
+        if writer is not None:
+            self._lines.put(None)
+            await asyncio.to_thread(writer.join)
+
+
+def read_transcript(path: str | os.PathLike[str]) -> Iterator[dict[str, Any]]:
+    """Yield the records of a recorded transcript, skipping a torn last line."""
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                continue
@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import os
+import wave
+from pathlib import Path
+from typing import Any, Iterable
+
+from livekit import rtc
+from livekit.agents import tts
+from livekit.agents.utils.audio import AudioByteStream
+
+from hr_screen_agent.telemetry.metrics import TTS_CACHE_LOOKUPS
+
+# Cached clips are played back in frames of this length, so an interruption
+# stops the audio as quickly as with live synthesis
+FRAME_MS = 100
+
+
+def _voice_options(engine: tts.TTS) -> dict[str, Any]:
+    """The settings of `engine` that change how a phrase sounds."""
+    opts = getattr(engine, "_opts", None)
+    return {
+        "engine": type(engine).__module__,
+        "model": getattr(opts, "model", None),
+        "voice": getattr(opts, "voice", None),
+        "speed": getattr(opts, "speed", None),
+        "language": getattr(opts, "language", None),
+        "emotion": getattr(opts, "emotion", None),
+        "sample_rate": engine.sample_rate,
+        "num_channels": engine.num_channels,
+    }
+
+
+class TTSCache:
+    """Local cache of synthesized audio for the fixed phrases the agent repeats.
+
+    Only `phrases`, such as the fillers, are cached. They are the same for
+    every candidate, so the folder, which the worker's job processes share,
+    never holds audio of what was said in an interview. Clips are stored as
+    WAV files keyed by the text and the voice settings (model, voice,
+    speed, ...) of the TTS engine, so changing the voice never plays stale
+    audio. The least recently used clips are removed beyond `max_entries`.
+    Files are read and written in the default executor, so disk I/O never
+    blocks the event loop.
+    """
+
+    def __init__(
+        self,
+        directory: str | os.PathLike[str],
+        phrases: Iterable[str],
+        *,
+        max_entries: int = 512,
+    ) -> None:
+        self.directory = Path(directory)
+        self.phrases = frozenset(text.strip() for text in phrases)
+        self.max_entries = max_entries
+
+    def cacheable(self, text: str) -> bool:
+        return text.strip() in self.phrases
+
+    def path(self, engine: tts.TTS, text: str) -> Path:
+        key = json.dumps(
+            {"text": text.strip(), **_voice_options(engine)},
+            sort_keys=True,
+            default=str,
+        )
+        digest = hashlib.sha256(key.encode()).hexdigest()
+        return self.directory / f"{digest}.wav"
+
+    async def get(self, engine: tts.TTS, text: str) -> list[rtc.AudioFrame] | None:
+        """Return the cached audio for `text`, or None if it was never synthesized."""
+        if not self.cacheable(text):
+            return None
+        clip = await asyncio.to_thread(_read_clip, self.path(engine, text))
+        if clip is None:
+            TTS_CACHE_LOOKUPS.labels(result="miss").inc()
+            return None
+
+        TTS_CACHE_LOOKUPS.labels(result="hit").inc()
+        sample_rate, num_channels, data = clip
+        stream = AudioByteStream(
+            sample_rate,
+            num_channels,
+            samples_per_channel=sample_rate * FRAME_MS // 1000,
+        )
+        return stream.push(data) + stream.flush()
+
+    async def put(
+        self, engine: tts.TTS, text: str, frames: list[rtc.AudioFrame]
+    ) -> None:
+        if not frames or not self.cacheable(text):
+            return
+        audio = rtc.combine_audio_frames(frames)
+        await asyncio.to_thread(self._write_clip, self.path(engine, text), audio)
+
+    def _write_clip(self, path: Path, audio: rtc.AudioFrame) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Write to a temporary file first, other job processes may be reading
+        tmp = path.with_suffix(f".{os.getpid()}.tmp")
+        with wave.open(str(tmp), "wb") as f:
+            f.setnchannels(audio.num_channels)
+            f.setsampwidth(2)
+            f.setframerate(audio.sample_rate)
+            f.writeframes(audio.data.tobytes())
+        os.replace(tmp, path)
+        self._evict()
+
+    async def synthesize(self, engine: tts.TTS, text: str) -> list[rtc.AudioFrame]:
+        """Return the audio for `text`, synthesizing and caching it on a miss."""
+        frames = await self.get(engine, text)
+        if frames is None:
+            async with engine.synthesize(text) as stream:
+                frames = [ev.frame async for ev in stream]
+            await self.put(engine, text, frames)
+        return frames
+
+    async def warm(self, engine: tts.TTS, phrases: Iterable[str]) -> None:
+        """Synthesize the phrases that are not cached yet."""
+        for text in phrases:
+            await self.synthesize(engine, text)
+
+    def _evict(self) -> None:
+        clips = list(self.directory.glob("*.wav"))
+        if len(clips) <= self.max_entries:
+            return
+        clips.sort(key=_mtime)
+        for path in clips[: len(clips) - self.max_entries]:
+            path.unlink(missing_ok=True)
+
+
+def _read_clip(path: Path) -> tuple[int, int, bytes] | None:
+    """Read a cached clip and mark it as recently used."""
+    try:
+        with wave.open(str(path), "rb") as f:
+            clip = f.getframerate(), f.getnchannels(), f.readframes(f.getnframes())
+        os.utime(path)
+    except (FileNotFoundError, wave.Error, EOFError):
+        return None
+    return clip
+
+
+def _mtime(path: Path) -> float:
+    try:
+        return path.stat().st_mtime
+    except FileNotFoundError:  # evicted by another job process
+        return 0.0